@@ -0,0 +1,117 @@
+"""
+Latency benchmark of the serialization of the hot listings, `TodosResponse`
+(GET /todos) and `ListFilesResponse` (GET /objects), at several page sizes.
+
+Each page is returned by three endpoints of a bare application, so that only
+the serialization is measured (no database nor bucket):
+
+- model: the page as dictionaries, validated against the `response_model`
+  and encoded by FastAPI's default `JSONResponse`;
+- orjson: the same, encoded by `ORJSONResponse` (the default response class
+  of the application);
+- bytes: the page encoded by `database.serializers` / `storage.serializers`,
+  returned as it is (no validation), as the application does.
+
+Usage:
+
+    TESTING=true python -m benchmarks.bench_serialization --sizes 10 100 1000 10000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from benchmarks.common import measure_async
+from database import schemas as todoSchemas, serializers
+from storage import schemas as storageSchemas, serializers as storageSerializers
+
+
+def build_app(size):
+    """
+    Build the application serving a page of `size` todo items and files.
+    """
+    rows = [(i, f"Todo number {i} ✓", i % 100) for i in range(1, size + 1)]
+    todos = {"total": size, "next_cursor": None,
+             "todos": [{"id": id_, "label": label, "quantity": quantity}
+                       for id_, label, quantity in rows]}
+    files = [{"name": f"folder/file-{i}.txt", "path": f"s3://bench/folder/file-{i}.txt"}
+             for i in range(size)]
+    app = FastAPI()
+
+    for name, response_class in (("model", JSONResponse), ("orjson", ORJSONResponse)):
+        @app.get(f"/{name}/todos", response_model=todoSchemas.TodosResponse,
+                 response_class=response_class)
+        def get_todos():
+            return todos
+
+        @app.get(f"/{name}/objects", response_model=storageSchemas.ListFilesResponse,
+                 response_class=response_class)
+        def get_objects():
+            return {"files": files, "next_cursor": None}
+
+    @app.get("/bytes/todos", response_model=todoSchemas.TodosResponse)
+    def get_todos_bytes():
+        return Response(serializers.dump_todos_response(size, rows),
+                        media_type="application/json")
+
+    @app.get("/bytes/objects", response_model=storageSchemas.ListFilesResponse)
+    def get_objects_bytes():
+        return Response(storageSerializers.dump_list_files_response(files),
+                        media_type="application/json")
+
+    return app
+
+
+async def load(app, path, requests):
+    """
+    Request a path over and over.
+
+    Returns:
+        Tuple[List[float], bytes]: The latency of each request, in
+        milliseconds, and the last body.
+    """
+    body = None
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def get():
+            nonlocal body
+            response = await client.get(path)
+            response.raise_for_status()
+            body = response.content
+
+        timings = await measure_async(get, requests)
+    return timings, body
+
+
+def main():
+    """
+    Run the benchmark and print the median latency of each setup, per page size.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    setups = ("model", "orjson", "bytes")
+    print(f"{'response':>17} {'size':>6} " + " ".join(f"{s + ' (ms)':>12}" for s in setups)
+          + f" {'speedup':>8}")
+    for size in args.sizes:
+        app = build_app(size)
+        for resource, response in (("todos", "TodosResponse"),
+                                   ("objects", "ListFilesResponse")):
+            medians, bodies = {}, set()
+            for setup in setups:
+                requests = max(10, args.requests * 100 // max(size, 100))
+                timings, body = asyncio.run(load(app, f"/{setup}/{resource}", requests))
+                medians[setup] = statistics.median(timings)
+                bodies.add(json.dumps(json.loads(body), sort_keys=True))
+            assert len(bodies) == 1, "the setups must send equal documents"
+            print(f"{response:>17} {size:>6} "
+                  + " ".join(f"{medians[s]:>12.3f}" for s in setups)
+                  + f" {medians['model'] / medians['bytes']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Cold start benchmark of the API process, checked against a budget.
+
+Two measures are taken, each in fresh interpreters:
+
+- the import time of `main`, from `python -X importtime -c "import main"`,
+  with the modules taking the longest to import;
+- the time to the first 200: from the launch of `uvicorn main:app` until
+  `GET /` answers, which includes the startup of the application (storage
+  backend and client).
+
+The median of `--runs` launches is compared with `--import-budget` and
+`--first-200-budget` (in milliseconds), and the script exits with status 1
+when a budget is exceeded, or when `import main` loads the client library of
+a storage backend.
+
+The database is not touched (TESTING=true skips the creation of the tables);
+the storage backend is set by `--bucket-type` (default LOCAL, in a temporary
+directory; S3 and GCS need their credentials, as in production).
+
+Usage:
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --bucket-type S3 --first-200-budget 4000
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_MODULES = ("boto3", "botocore.config", "google.cloud.storage")
+
+
+def get_env(bucket_type, local_root):
+    """
+    Return the environment of the measured processes.
+    """
+    return {**os.environ, "TESTING": "true", "OBJECT_BUCKET_TYPE": bucket_type,
+            "OBJECT_BUCKET": os.getenv("OBJECT_BUCKET", "bench"),
+            "OBJECT_LOCAL_ROOT": local_root}
+
+
+def measure_imports(env):
+    """
+    Import `main` in a new interpreter, with `-X importtime`.
+
+    Returns:
+        Tuple[float, Dict[str, float]]: The cumulative import time of `main`,
+        and the self import time of every module, in milliseconds.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            env=env, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    return modules["main"][1], {name: times[0] for name, times in modules.items()}
+
+
+def measure_first_200(env, timeout=60):
+    """
+    Launch `uvicorn main:app` and poll `GET /` until it answers with a 200.
+
+    Returns:
+        float: The time from the launch to the first 200, in milliseconds.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    url = f"http://127.0.0.1:{port}/"
+    start = time.perf_counter()
+    server = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--log-level", "warning"], env=env)
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise TimeoutError(f"no 200 from {url} after {timeout} s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    """
+    Run the benchmark, print the report and check the budgets.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bucket-type", choices=["S3", "GCS", "LOCAL"], default="LOCAL")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--import-budget", type=float, default=2000, help="milliseconds")
+    parser.add_argument("--first-200-budget", type=float, default=3000, help="milliseconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as local_root:
+        os.makedirs(os.path.join(local_root, "bench"))
+        env = get_env(args.bucket_type, local_root)
+        imports = [measure_imports(env) for _ in range(args.runs)]
+        first_200 = [measure_first_200(env) for _ in range(args.runs)]
+
+    import_time = statistics.median(total for total, _ in imports)
+    first_200_time = statistics.median(first_200)
+    modules = imports[-1][1]
+    print("slowest imports of `import main` (self time, last run):")
+    for name, self_ms in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_ms:>8.1f} ms  {name}")
+
+    failures = [f"`import main` loads {name}" for name in BACKEND_MODULES if name in modules]
+    for label, value, budget in (("import main", import_time, args.import_budget),
+                                 ("first 200", first_200_time, args.first_200_budget)):
+        within = value <= budget
+        print(f"{label:>12}: {value:>8.1f} ms (budget {budget:.0f} ms) "
+              f"{'ok' if within else 'OVER BUDGET'}")
+        if not within:
+            failures.append(f"{label} over budget")
+    if failures:
+        sys.exit("; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
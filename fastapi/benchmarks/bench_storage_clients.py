@@ -0,0 +1,93 @@
+"""
+Latency benchmark of `list_objects`/`get_object` with a new S3 client per call
+(the previous behaviour) versus the shared client of `storage.clients`.
+
+The S3 API is served by a local moto server, so the numbers measure the client
+overhead (credential resolution, service model loading, connection setup)
+rather than network latency.
+
+Usage:
+
+    python -m benchmarks.bench_storage_clients --iterations 200
+"""
+import argparse
+import logging
+import os
+import statistics
+import time
+from moto.server import ThreadedMotoServer
+from storage import actions
+
+BUCKET_NAME = "bench-bucket"
+
+
+def measure(operation, iterations, fresh_client):
+    """
+    Time `iterations` calls of `operation`.
+
+    Args:
+        operation (callable): The storage action to call.
+        iterations (int): The number of calls.
+        fresh_client (bool): Whether to drop the shared client before each call.
+
+    Returns:
+        list: The latency of each call, in milliseconds.
+    """
+    latencies = []
+    for _ in range(iterations):
+        if fresh_client:
+            actions.reset_backend()
+        start = time.perf_counter()
+        operation()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name, latencies):
+    """
+    Print the mean, median and 99th percentile of `latencies`.
+    """
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(f"{name:<32} mean={statistics.mean(latencies):7.2f}ms "
+          f"p50={statistics.median(latencies):7.2f}ms p99={p99:7.2f}ms")
+
+
+def main():
+    """
+    Start a moto server, seed a bucket and compare both client strategies.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--port", type=int, default=5055)
+    args = parser.parse_args()
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = ThreadedMotoServer(port=args.port, verbose=False)
+    server.start()
+    os.environ.update({
+        "AWS_ENDPOINT_URL": f"http://127.0.0.1:{args.port}",
+        "AWS_ACCESS_KEY_ID": "bench",
+        "AWS_SECRET_ACCESS_KEY": "bench",
+        "AWS_DEFAULT_REGION": "us-east-1",
+        "OBJECT_BUCKET": BUCKET_NAME,
+        "OBJECT_BUCKET_TYPE": "S3",
+    })
+    try:
+        actions.get_s3_client().create_bucket(Bucket=BUCKET_NAME)
+        for index in range(20):
+            actions.put_object(f"file-{index}.txt", b"x" * 4096)
+
+        operations = {
+            "list_objects": actions.list_objects,
+            "get_object": lambda: actions.get_object("file-0.txt"),
+        }
+        for name, operation in operations.items():
+            for fresh_client, label in ((True, "client per call"), (False, "shared client")):
+                measure(operation, 5, fresh_client)
+                report(f"{name} ({label})", measure(operation, args.iterations, fresh_client))
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Throughput benchmark of concurrent downloads through GET /objects/{file_name},
+comparing storage calls made on the event loop (the previous behaviour) with
+the storage thread pool of `storage.aio`.
+
+The local filesystem backend is used with an artificial per-request latency
+standing for the round trip to S3/GCS, so no network or cloud account is needed.
+
+Usage:
+
+    TESTING=true python -m benchmarks.bench_storage_concurrency --latency 0.02 --requests 64
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import httpx
+from fastapi.responses import StreamingResponse
+from main import app
+from storage import actions
+
+
+@app.get("/bench/blocking/{file_name}")
+async def blocking_get_object(file_name: str):
+    """
+    Download endpoint calling the blocking storage API from the event loop.
+    """
+    info, chunks = actions.stream_object(name=file_name)
+    return StreamingResponse(chunks, media_type=info["content_type"])
+
+
+def add_latency(backend, latency):
+    """
+    Make every backend download wait `latency` seconds before returning,
+    like a request to a remote object store, and serve it like one (no local file).
+    """
+    stream_object = backend.stream_object
+
+    def slow_stream_object(name, chunk_size):
+        time.sleep(latency)
+        return stream_object(name, chunk_size)
+
+    backend.stream_object = slow_stream_object
+    actions.get_local_path = lambda name: None
+
+
+async def throughput(path, requests, concurrency):
+    """
+    Download `path` `requests` times with `concurrency` requests in flight.
+
+    Returns:
+        float: The number of completed requests per second.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def download():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(download() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    """
+    Seed a local bucket and compare both download paths at several concurrency levels.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", maxsplit=1)[0])
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--size", type=int, default=256 * 1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        os.environ.update({"OBJECT_BUCKET_TYPE": "LOCAL", "OBJECT_BUCKET": "bench",
+                           "OBJECT_LOCAL_ROOT": root})
+        actions.reset_backend()
+        actions.put_object("file.bin", os.urandom(args.size))
+        add_latency(actions.get_backend(), args.latency)
+
+        for concurrency in (1, 4, 16, 32):
+            blocking = asyncio.run(throughput(
+                "/bench/blocking/file.bin", args.requests, concurrency))
+            pooled = asyncio.run(throughput("/objects/file.bin", args.requests, concurrency))
+            print(f"concurrency={concurrency:<3} event loop: {blocking:7.1f} req/s   "
+                  f"storage pool: {pooled:7.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
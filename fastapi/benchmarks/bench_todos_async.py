@@ -0,0 +1,120 @@
+"""
+Throughput benchmark of GET /todos under concurrency, comparing the
+synchronous database layer (a `Session` used on the Starlette threadpool)
+with the asynchronous one ("DB_ASYNC=true", an `AsyncSession` on aiosqlite).
+
+The database latency is simulated: `todos` is replaced by a view over a copy
+of the table which calls a SQL function sleeping `--latency` milliseconds per
+query. The synchronous layer can then serve at most one request per thread of
+the threadpool (40) at a time, the asynchronous one one per pooled connection.
+With a short latency, both are bound by the CPU time of the in-process
+client and application instead.
+
+Usage:
+
+    TESTING=true python -m benchmarks.bench_todos_async --requests 400 --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import httpx
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from benchmarks.common import create_database, override_get_db
+from database import aio as dbAio
+from main import app
+
+
+def seed(path, rows):
+    """
+    Create the SQLite database, with `todos` as a view sleeping on every query.
+    """
+    engine = create_database(f"sqlite:///{path}", rows)
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE todos RENAME TO todo_data"))
+        connection.execute(text(
+            "CREATE VIEW todos AS WITH latency AS (SELECT bench_sleep() AS done) "
+            "SELECT id, label, quantity FROM todo_data, latency WHERE latency.done"))
+    engine.dispose()
+
+
+def add_latency(engine, seconds):
+    """
+    Register the `bench_sleep()` SQL function on every connection of a (sync) engine.
+    """
+    @event.listens_for(engine, "connect")
+    def register(dbapi_connection, _record):
+        dbapi_connection.create_function(
+            "bench_sleep", 0, lambda: time.sleep(seconds) or 1)
+
+
+async def load(requests, concurrency):
+    """
+    Send `requests` GET /todos requests, at most `concurrency` at a time.
+
+    Returns:
+        float: The throughput in requests per second.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.get("/todos?limit=10&include_total=false")
+                response.raise_for_status()
+
+        await one()
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    """
+    Run the benchmark and print the throughput of each layer.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=500, help="milliseconds per query")
+    parser.add_argument("--pool-size", type=int, default=200,
+                        help="connections of the asynchronous engine")
+    args = parser.parse_args()
+    latency = args.latency / 1000
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        engine = create_engine(f"sqlite:///{path}", poolclass=NullPool,
+                               connect_args={"check_same_thread": False})
+        add_latency(engine, latency)
+        seed(path, args.rows)
+        with override_get_db(sessionmaker(bind=engine)):
+            sync_rate = asyncio.run(load(args.requests, args.concurrency))
+
+        async_engine = dbAio.create_async_db_engine(f"sqlite+aiosqlite:///{path}", {
+            "pool_size": args.pool_size, "max_overflow": 0, "pool_timeout": 30,
+            "pool_recycle": -1, "pool_pre_ping": False, "echo": False})
+        add_latency(async_engine.sync_engine, latency)
+
+        async def run_async():
+            try:
+                return await load(args.requests, args.concurrency)
+            finally:
+                await async_engine.dispose()
+
+        with override_get_db(async_sessionmaker(bind=async_engine, expire_on_commit=False)):
+            async_rate = asyncio.run(run_async())
+        engine.dispose()
+
+    print(f"latency {args.latency:.0f} ms, concurrency {args.concurrency}")
+    print(f"sync  (threadpool) {sync_rate:>8.1f} req/s")
+    print(f"async (aiosqlite)  {async_rate:>8.1f} req/s  {async_rate / sync_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Latency benchmark of GET /todos with and without the page cache, on the
+website's access pattern: the same few pages listed over and over, with a
+todo created every `--write-every` reads (which invalidates every page).
+
+The shared cache is served by an in-process Redis stand-in (fakeredis), or by
+the server given with `--redis-url`.
+
+Usage:
+
+    TESTING=true python -m benchmarks.bench_todos_cache --rows 100000 --reads 2000
+    TESTING=true python -m benchmarks.bench_todos_cache --redis-url redis://localhost:6379/15
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import fakeredis
+import httpx
+from redis import asyncio as aioredis
+from sqlalchemy.orm import sessionmaker
+from benchmarks.common import create_database, measure_async, override_get_db, percentile
+from database import page_cache
+from main import app
+
+PAGES = 20
+PAGE_SIZE = 100
+
+
+async def load(reads, write_every):
+    """
+    Replay the access pattern.
+
+    Returns:
+        List[float]: The latency of each read, in milliseconds.
+    """
+    rng = random.Random(42)
+    timings = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def read():
+            page = rng.randrange(PAGES)
+            response = await client.get(f"/todos?skip={page * PAGE_SIZE}&limit={PAGE_SIZE}")
+            response.raise_for_status()
+
+        for done in range(0, reads, write_every):
+            if done:
+                response = await client.post("/todos", json={"label": "New", "quantity": 1})
+                response.raise_for_status()
+            timings += await measure_async(read, min(write_every, reads - done))
+    return timings
+
+
+def main():
+    """
+    Run the benchmark and print the latency percentiles and hit ratio of each setup.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--reads", type=int, default=2_000)
+    parser.add_argument("--write-every", type=int, default=50)
+    parser.add_argument("--redis-url", help="shared cache server (default: fakeredis)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_database(f"sqlite:///{os.path.join(directory, 'bench.db')}", args.rows,
+                                 connect_args={"check_same_thread": False})
+        setups = {
+            "off": lambda: page_cache.PageCache(ttl=0),
+            "local": lambda: page_cache.PageCache(ttl=60),
+            "shared": lambda: page_cache.PageCache(ttl=60, redis=(
+                aioredis.from_url(args.redis_url) if args.redis_url
+                else fakeredis.FakeAsyncRedis())),
+        }
+        print(f"{'cache':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'hit ratio':>10}")
+        with override_get_db(sessionmaker(bind=engine)):
+            for name, build in setups.items():
+                cache = page_cache._page_cache = build()  # pylint: disable=protected-access
+
+                async def run(cache=cache):
+                    try:
+                        return await load(args.reads, args.write_every)
+                    finally:
+                        await cache.close()
+
+                timings = asyncio.run(run())
+                print(f"{name:>8} {percentile(timings, 0.5):>9.2f} "
+                      f"{percentile(timings, 0.99):>9.2f} {cache.stats()['hit_ratio']:>10.2f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
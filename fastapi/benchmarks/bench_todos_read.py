@@ -0,0 +1,62 @@
+"""
+Latency benchmark of GET /todos, comparing the ORM read path (`crud.get_todos`
+returning `models.Todo` instances, validated by FastAPI into
+`schemas.TodosResponse`) with the ORM-free path (Core rows encoded straight
+to JSON by `database.serializers`).
+
+Both endpoints run in-process against the same SQLite database, so the
+difference is the CPU time spent building and validating objects.
+
+Usage:
+
+    TESTING=true python -m benchmarks.bench_todos_read --rows 10000 --repeat 20
+"""
+import argparse
+import statistics
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from benchmarks.common import create_database, measure, override_get_db
+from database import crud, schemas as todoSchemas
+from main import app, get_db
+
+LIMITS = (100, 1000, 10000)
+
+
+@app.get("/bench/orm-todos", response_model=todoSchemas.TodosResponse)
+def orm_get_todos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """
+    GET /todos as it was before the ORM-free read path.
+    """
+    total_count, todos = crud.get_todos(db=db, skip=skip, limit=limit)
+    return {"total": total_count, "todos": todos}
+
+
+def main():
+    """
+    Run the benchmark and print the median latency of each path per page size.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=max(LIMITS))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_database(rows=args.rows, connect_args={"check_same_thread": False},
+                             poolclass=StaticPool)
+    client = TestClient(app)
+
+    def median_latency(path):
+        return statistics.median(measure(lambda: client.get(path).raise_for_status(),
+                                         args.repeat))
+
+    with override_get_db(sessionmaker(bind=engine)):
+        print(f"{'limit':>8} {'orm (ms)':>10} {'core (ms)':>10} {'speedup':>8}")
+        for limit in LIMITS:
+            orm = median_latency(f"/bench/orm-todos?limit={limit}")
+            core = median_latency(f"/todos?limit={limit}")
+            print(f"{limit:>8} {orm:>10.2f} {core:>10.2f} {orm / core:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Helpers shared by the benchmarks of the todo endpoints:
+
+- `create_database` creates a database with the schema of the application
+  (and the version of the todos table, as seeded at startup), holding todo
+  items;
+- `override_get_db` serves the `get_db` dependency of the application from
+  the (synchronous or asynchronous) sessions of such a database;
+- `measure` and `measure_async` time repeated calls, e.g. requests, and
+  `percentile` summarizes the timings.
+"""
+import statistics
+import time
+from contextlib import contextmanager
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from database import models, versioning
+from database.database import Base
+from main import app, get_db
+
+
+def create_database(url="sqlite://", rows=0, **kwargs):
+    """
+    Create the schema of the application in a database, holding `rows` todo items.
+
+    Args:
+        url (str, optional): The database URL (default: an in-memory SQLite database).
+        rows (int, optional): The number of todo items to insert.
+        **kwargs: The other arguments of `create_engine`.
+
+    Returns:
+        Engine: The engine of the database.
+    """
+    engine = create_engine(url, **kwargs)
+    Base.metadata.create_all(engine)
+    versioning.ensure_version(engine)
+    if rows:
+        with engine.begin() as connection:
+            connection.execute(insert(models.Todo), [
+                {"label": f"Todo number {i}", "quantity": i % 100} for i in range(rows)])
+    return engine
+
+
+@contextmanager
+def override_get_db(session_factory):
+    """
+    Serve the `get_db` dependency of the application from a factory of
+    sessions, until the block exits.
+
+    Args:
+        session_factory (sessionmaker | async_sessionmaker): The factory of the sessions.
+    """
+    def bench_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def bench_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = (
+        bench_get_async_db if isinstance(session_factory, async_sessionmaker) else bench_get_db)
+    try:
+        yield
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def measure(call, repeat, warmup=1):
+    """
+    Time `repeat` calls of a function, after `warmup` untimed ones.
+
+    Returns:
+        List[float]: The duration of each call, in milliseconds.
+    """
+    for _ in range(warmup):
+        call()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def measure_async(call, repeat, warmup=0):
+    """
+    Time `repeat` awaits of a coroutine function, after `warmup` untimed ones.
+
+    Returns:
+        List[float]: The duration of each call, in milliseconds.
+    """
+    for _ in range(warmup):
+        await call()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def percentile(timings, fraction):
+    """
+    Return a percentile of the timings.
+    """
+    return statistics.quantiles(timings, n=100)[round(fraction * 100) - 1]
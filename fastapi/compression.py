@@ -0,0 +1,270 @@
+"""
+This module provides the compression of the API responses.
+
+The JSON listings (`GET /todos` with large pages, `GET /objects` on big
+buckets) are large and repetitive, and shrink several times once compressed.
+`CompressionMiddleware` compresses the responses with the best encoding
+accepted by the client (`Accept-Encoding`): zstd, brotli or gzip. Bodies are
+compressed as they are sent, so streamed responses (e.g. `GET /todos/export`)
+stay streamed.
+
+Responses are sent as they are when they are smaller than the minimum size,
+already encoded, or of a content type that is already compressed. Downloads
+that support byte ranges (`GET /objects/{file_name}`, which sends
+`Accept-Ranges`) are not compressed either, since ranges address the bytes of
+the stored object.
+"""
+import os
+import zlib
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+
+DEFAULT_MINIMUM_SIZE = 1024
+DEFAULT_ENCODINGS = "zstd,br,gzip"
+DEFAULT_LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+ENCODING_LEVEL_SETTINGS = {"gzip": "RESPONSE_COMPRESSION_GZIP_LEVEL",
+                           "br": "RESPONSE_COMPRESSION_BROTLI_LEVEL",
+                           "zstd": "RESPONSE_COMPRESSION_ZSTD_LEVEL"}
+LEVEL_RANGES = {"gzip": (1, 9), "br": (0, 11), "zstd": (1, 22)}
+COMPRESSED_CONTENT_TYPES = {
+    "application/octet-stream", "application/gzip", "application/x-gzip", "application/zip",
+    "application/zstd", "application/x-bzip2", "application/x-xz", "application/x-7z-compressed",
+    "application/x-rar-compressed", "application/pdf", "font/woff", "font/woff2",
+}
+COMPRESSED_CONTENT_TYPE_PREFIXES = ("image/", "audio/", "video/")
+UNCOMPRESSED_IMAGE_TYPES = {"image/svg+xml", "image/bmp"}
+
+
+def get_compression_settings():
+    """
+    Retrieve the response compression settings from environment variables.
+
+    Environment Variables:
+        - RESPONSE_COMPRESSION_MIN_SIZE: The size in bytes under which a
+          response is sent uncompressed (default 1024).
+        - RESPONSE_COMPRESSION_ENCODINGS: The encodings offered, by order of
+          preference (default "zstd,br,gzip", empty to disable compression).
+        - RESPONSE_COMPRESSION_GZIP_LEVEL: The gzip level, 1-9 (default 6).
+        - RESPONSE_COMPRESSION_BROTLI_LEVEL: The brotli quality, 0-11 (default 4).
+        - RESPONSE_COMPRESSION_ZSTD_LEVEL: The zstd level, 1-22 (default 3).
+
+    Returns:
+        dict: The 'minimum_size', 'encodings' and 'levels' arguments of
+        `CompressionMiddleware`.
+
+    Raises:
+        ValueError: If an encoding is unknown, or a level out of its range.
+    """
+    encodings = [encoding.strip() for encoding in
+                 os.getenv("RESPONSE_COMPRESSION_ENCODINGS", DEFAULT_ENCODINGS).split(",")
+                 if encoding.strip()]
+    for encoding in encodings:
+        if encoding not in DEFAULT_LEVELS:
+            raise ValueError(f"Unknown response encoding: {encoding}")
+    levels = {}
+    for encoding, setting in ENCODING_LEVEL_SETTINGS.items():
+        level = int(os.getenv(setting, str(DEFAULT_LEVELS[encoding])))
+        low, high = LEVEL_RANGES[encoding]
+        if not low <= level <= high:
+            raise ValueError(f"{setting} must be between {low} and {high}, got {level}")
+        levels[encoding] = level
+    return {
+        "minimum_size": int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE",
+                                      str(DEFAULT_MINIMUM_SIZE))),
+        "encodings": encodings,
+        "levels": levels,
+    }
+
+
+def negotiate(accept_encoding, encodings):
+    """
+    Choose the encoding of a response.
+
+    Args:
+        accept_encoding (str): The `Accept-Encoding` header of the request.
+        encodings (List[str]): The encodings offered, by order of preference.
+
+    Returns:
+        str: The accepted encoding with the highest quality value (ties go
+        to the preferred one), or None if the client accepts none of them.
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(headers):
+    """
+    Tell whether a response may be compressed, from its headers.
+
+    Args:
+        headers (Headers): The headers of the response.
+
+    Returns:
+        bool: False if the response is already encoded, supports byte ranges,
+        or has an already compressed content type.
+    """
+    if "content-encoding" in headers or "accept-ranges" in headers \
+            or "content-range" in headers:
+        return False
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in COMPRESSED_CONTENT_TYPES:
+        return False
+    return not content_type.startswith(COMPRESSED_CONTENT_TYPE_PREFIXES) \
+        or content_type in UNCOMPRESSED_IMAGE_TYPES
+
+
+class _Encoder:
+    """
+    Streaming compressor of one response body.
+    """
+
+    def __init__(self, encoding, level):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        """Compresses a chunk, flushed so that the client can decode it at once."""
+        if self.encoding == "gzip":
+            return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + \
+            self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data=b""):
+        """Compresses the last chunk and ends the stream."""
+        if self.encoding == "gzip":
+            return self._compressor.compress(data) + self._compressor.flush()
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.finish()
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class CompressionMiddleware:  # pylint: disable=too-few-public-methods
+    """
+    ASGI middleware compressing the responses with zstd, brotli or gzip.
+
+    Args:
+        app (ASGIApp): The application to wrap.
+        minimum_size (int, optional): The size in bytes under which a response
+                                      sent in one piece is not compressed.
+        encodings (List[str], optional): The encodings offered, by order of
+                                         preference ("zstd", "br", "gzip").
+        levels (dict, optional): The compression level of each encoding.
+    """
+
+    def __init__(self, app, minimum_size=DEFAULT_MINIMUM_SIZE, encodings=None, levels=None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = DEFAULT_ENCODINGS.split(",") if encodings is None else encodings
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = negotiate(request_headers.get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(
+            self, encoding, send, request_headers.get("if-none-match", "")))
+
+
+class _CompressingSend:  # pylint: disable=too-few-public-methods
+    """
+    The `send` callable of one response going through `CompressionMiddleware`.
+
+    The start of the response is held until the first body chunk tells
+    whether it is worth compressing.
+    """
+
+    def __init__(self, middleware, encoding, send, if_none_match):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.if_none_match = if_none_match
+        self.start = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            compressible = is_compressible(headers)
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+            if message["status"] == 304 and compressible \
+                    and f"W/{headers.get('etag')}" in self.if_none_match:
+                # The client revalidates a compressed copy, sent with the weak ETag.
+                _weaken_etag(headers)
+            self.passthrough = not compressible or message["status"] < 200 \
+                or message["status"] in (204, 304)
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.encoder is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.encoder = _Encoder(self.encoding, self.middleware.levels[self.encoding])
+            headers["Content-Encoding"] = self.encoding
+            _weaken_etag(headers)
+            if more_body:
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                await self.send(self.start)
+            else:
+                body = self.encoder.finish(body)
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+        body = self.encoder.compress(body) if more_body else self.encoder.finish(body)
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+
+def _weaken_etag(headers):
+    """Turns a strong ETag into a weak one: the compressed body differs from
+    the one the strong ETag identifies, but `If-None-Match` still matches it
+    (weak comparison)."""
+    etag = headers.get("etag")
+    if etag is not None and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
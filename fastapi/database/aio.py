@@ -0,0 +1,195 @@
+"""
+This module provides the asynchronous database layer.
+
+With "DB_ASYNC=true", requests get an `AsyncSession` on an engine using the
+`aiomysql` driver: queries are awaited on the event loop, so the number of
+requests waiting on the database is bounded by the connection pool instead
+of the 40 threads of the Starlette threadpool. Otherwise, requests get a
+regular `Session` and queries run on the threadpool.
+
+The `crud` functions are written once, for a synchronous `Session`: `run`
+calls them through `AsyncSession.run_sync` (on the event loop, with the
+asynchronous driver) or on the threadpool.
+"""
+import os
+import threading
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from . import crud, versioning
+from .database import ASYNC_DB_URL, get_engine_settings, get_replica_settings, get_replica_urls
+from .pool import TimedAsyncAdaptedQueuePool, pool_stats
+from .routing import ReplicaSet, RoutingSession
+
+_engine = None
+_replica_engines = []
+_sessionmaker = None
+_lock = threading.Lock()
+
+
+def is_enabled():
+    """Retrieves whether the asynchronous database layer is enabled.
+
+    This function accesses the environment variable "DB_ASYNC" ("true" or "false").
+
+    Returns:
+        bool: True to use the asynchronous engine (default False).
+    """
+    return os.getenv("DB_ASYNC", "false").lower() == "true"
+
+
+def create_async_db_engine(url, settings=None):
+    """Creates an asynchronous engine whose pool records its statistics.
+
+    Args:
+        url (str): The database URL, with an asynchronous driver 
+                   (e.g. `mysql+aiomysql://`).
+        settings (dict, optional): The engine settings 
+                                   (defaults to `get_engine_settings()`).
+
+    Returns:
+        AsyncEngine: The SQLAlchemy asynchronous engine.
+    """
+    return create_async_engine(url, poolclass=TimedAsyncAdaptedQueuePool,
+                               **(settings or get_engine_settings()))
+
+
+def get_engine():
+    """Returns the asynchronous engine, building it on first use.
+
+    The driver is only imported then, so `aiomysql` is not needed when the 
+    asynchronous layer is disabled. The engines of the read replicas are 
+    built at the same time, and sessions route their queries like the 
+    synchronous ones (see `database.routing`).
+
+    Returns:
+        AsyncEngine: The shared asynchronous engine.
+    """
+    global _engine, _replica_engines, _sessionmaker  # pylint: disable=global-statement
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                settings = get_replica_settings()
+                _replica_engines = [create_async_db_engine(url)
+                                    for url in get_replica_urls("aiomysql")]
+                replicas = ReplicaSet([engine.sync_engine for engine in _replica_engines],
+                                      eject_seconds=settings["eject_seconds"])
+                engine = create_async_db_engine(ASYNC_DB_URL)
+                _sessionmaker = async_sessionmaker(
+                    bind=engine, autoflush=False, expire_on_commit=False,
+                    sync_session_class=RoutingSession, replicas=replicas,
+                    read_your_writes=settings["read_your_writes"])
+                _engine = engine
+    return _engine
+
+
+def get_sessionmaker():
+    """Returns the factory of asynchronous sessions.
+
+    Returns:
+        async_sessionmaker: The factory bound to `get_engine()`.
+    """
+    get_engine()
+    return _sessionmaker
+
+
+async def dispose():
+    """Closes the connections of the asynchronous engines, if they were built."""
+    global _engine, _replica_engines  # pylint: disable=global-statement
+    with _lock:
+        engine, _engine = _engine, None
+        replica_engines, _replica_engines = _replica_engines, []
+    for engine in filter(None, [engine, *replica_engines]):
+        await engine.dispose()
+
+
+def get_pool_stats():
+    """Returns the statistics of the asynchronous connection pool.
+
+    Returns:
+        dict: The statistics of `pool.pool_stats()`, or None if the 
+        asynchronous engine was not built.
+    """
+    engine = _engine
+    return pool_stats(engine.sync_engine) if engine is not None else None
+
+
+async def run(db, func, *args, **kwargs):
+    """Runs a function taking a synchronous `Session` as first argument 
+    (e.g. a `crud` function) on a session of either kind.
+
+    Args:
+        db (Session | AsyncSession): The session of the request.
+        func (callable): The function, called as `func(session, *args, **kwargs)`.
+        *args: Positional arguments of the function.
+        **kwargs: Keyword arguments of the function.
+
+    Returns:
+        The result of the function.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(func, *args, **kwargs)
+    return await run_in_threadpool(func, db, *args, **kwargs)
+
+
+async def get_todo_rows(db, **kwargs):
+    """
+    Async version of `crud.get_todo_rows`.
+    """
+    return await run(db, crud.get_todo_rows, **kwargs)
+
+
+async def get_todo_row(db, **kwargs):
+    """
+    Async version of `crud.get_todo_row`.
+    """
+    return await run(db, crud.get_todo_row, **kwargs)
+
+
+async def get_todos_version(db):
+    """
+    Async version of `versioning.get_version`.
+    """
+    return await run(db, versioning.get_version)
+
+
+async def get_todos_page(db, **kwargs):
+    """
+    Async version of `crud.get_todos_page`.
+    """
+    return await run(db, crud.get_todos_page, **kwargs)
+
+
+async def count_todos(db, **kwargs):
+    """
+    Async version of `crud.count_todos`.
+    """
+    return await run(db, crud.count_todos, **kwargs)
+
+
+async def create_todo(db, **kwargs):
+    """
+    Async version of `crud.create_todo`.
+    """
+    return await run(db, crud.create_todo, **kwargs)
+
+
+async def create_todos(db, **kwargs):
+    """
+    Async version of `crud.create_todos`.
+    """
+    return await run(db, crud.create_todos, **kwargs)
+
+
+async def delete_todo(db, **kwargs):
+    """
+    Async version of `crud.delete_todo`.
+    """
+    return await run(db, crud.delete_todo, **kwargs)
+
+
+async def delete_todos(db, **kwargs):
+    """
+    Async version of `crud.delete_todos`.
+    """
+    return await run(db, crud.delete_todos, **kwargs)
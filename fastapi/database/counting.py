@@ -0,0 +1,157 @@
+"""
+This module provides the strategies used to count the todo items.
+
+An exact `COUNT(*)` scans the whole table, which costs more than fetching a
+page on large tables. The strategy is selected with the "TODO_COUNT_STRATEGY"
+environment variable:
+
+- "exact" (default): `SELECT count(*) FROM todos` on every call.
+- "cached": the exact count, kept in memory for "TODO_COUNT_CACHE_TTL"
+  seconds (default 5) and invalidated by `create_todo` and `delete_todo`.
+  Other processes see the writes once the TTL expires.
+- "counter": a row of the `row_counts` table, updated in the same transaction
+  as each insert and delete. The row is seeded with an exact count when it is
+  missing; delete it to re-seed after writing with another strategy.
+- "estimate": the row estimate of `information_schema.TABLES` (MySQL only,
+  other databases fall back to an exact count). It may be off by a few
+  percent, but costs nothing.
+"""
+import os
+import threading
+import time
+from sqlalchemy import func, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import models
+
+STRATEGIES = ("exact", "cached", "counter", "estimate")
+DEFAULT_CACHE_TTL = 5
+
+_cached = None
+_cached_generation = 0
+_cached_lock = threading.Lock()
+
+
+def get_strategy():
+    """Retrieves the count strategy from the environment variables.
+
+    This function accesses the environment variable "TODO_COUNT_STRATEGY".
+
+    Returns:
+        str: One of `STRATEGIES`, "exact" by default.
+
+    Raises:
+        ValueError: If the strategy is unknown.
+    """
+    strategy = os.getenv("TODO_COUNT_STRATEGY", "exact")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown count strategy: {strategy}")
+    return strategy
+
+
+def get_cache_ttl():
+    """Retrieves the lifetime of the cached count from the environment variables.
+
+    This function accesses the environment variable "TODO_COUNT_CACHE_TTL".
+
+    Returns:
+        float: The number of seconds the count is kept in memory.
+    """
+    return float(os.getenv("TODO_COUNT_CACHE_TTL", str(DEFAULT_CACHE_TTL)))
+
+
+def count_todos(db: Session, strategy: str = None):
+    """Counts the todo items with the configured strategy.
+
+    Args:
+        db (Session): The SQLAlchemy database session used for querying.
+        strategy (str, optional): Overrides the "TODO_COUNT_STRATEGY" setting.
+
+    Returns:
+        int: The (possibly approximate, see the module docstring) number of todo items.
+    """
+    strategy = strategy or get_strategy()
+    if strategy == "cached":
+        return _cached_count(db)
+    if strategy == "counter":
+        return _counter_count(db)
+    if strategy == "estimate":
+        return _estimated_count(db)
+    return exact_count(db)
+
+
+def exact_count(db: Session):
+    """Counts the todo items with `SELECT count(*) FROM todos`.
+
+    Args:
+        db (Session): The SQLAlchemy database session used for querying.
+
+    Returns:
+        int: The number of todo items.
+    """
+    return db.scalar(select(func.count()).select_from(models.Todo))
+
+
+def record_change(db: Session, delta: int):
+    """Records inserted (`delta` > 0) or deleted (`delta` < 0) todo items.
+
+    Must be called before the transaction of the change is committed: with the
+    "counter" strategy, the counter row is updated in that transaction.
+
+    Args:
+        db (Session): The SQLAlchemy database session of the change.
+        delta (int): The number of rows added, negative for deleted rows.
+    """
+    if get_strategy() == "counter":
+        db.execute(update(models.RowCount)
+                   .where(models.RowCount.table_name == models.Todo.__tablename__)
+                   .values(count=models.RowCount.count + delta))
+
+
+def invalidate():
+    """Drops the cached count, once a change has been committed."""
+    global _cached, _cached_generation  # pylint: disable=global-statement
+    with _cached_lock:
+        _cached = None
+        _cached_generation += 1
+
+
+def _cached_count(db):
+    """Returns the exact count, served from memory for `get_cache_ttl()` seconds."""
+    global _cached  # pylint: disable=global-statement
+    with _cached_lock:
+        cached, generation = _cached, _cached_generation
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    count = exact_count(db)
+    with _cached_lock:
+        if generation == _cached_generation:
+            _cached = (time.monotonic() + get_cache_ttl(), count)
+    return count
+
+
+def _counter_count(db):
+    """Reads the counter row, seeding it with an exact count when it is missing."""
+    count = db.scalar(select(models.RowCount.count)
+                      .where(models.RowCount.table_name == models.Todo.__tablename__))
+    if count is not None:
+        return count
+    count = exact_count(db)
+    try:
+        db.add(models.RowCount(table_name=models.Todo.__tablename__, count=count))
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+    return count
+
+
+def _estimated_count(db):
+    """Reads the row estimate of the table from `information_schema` (MySQL only)."""
+    if db.get_bind().dialect.name != "mysql":
+        return exact_count(db)
+    count = db.scalar(text(
+        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+    ), {"table_name": models.Todo.__tablename__})
+    return int(count) if count is not None else exact_count(db)
@@ -2,36 +2,287 @@
 This module contains the database operations for interacting with 
 todo items in the application.
 """
+import itertools
+import os
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.orm import Session
 
-from . import models, schemas
+from . import counting, models, schemas, versioning
+from .pagination import InvalidCursor, decode_cursor, encode_cursor, parse_sort
+from .routing import uses_primary
 
+TODO_COLUMNS = (models.Todo.id, models.Todo.label, models.Todo.quantity)
+DEFAULT_BULK_CHUNK_SIZE = 5000
+DEFAULT_EXPORT_BATCH_SIZE = 5000
 
-def get_todos(db: Session, skip: int = 0, limit: int = 100):
+
+def get_todos(db: Session, skip: int = 0, limit: int = 100, include_total: bool = True):
     """Fetches a list of todo items from the database.
 
     Queries the database to retrieve todo items with optional 
     pagination controls for skipping and limiting the number 
     of results.
 
+    The total is computed with the configured count strategy 
+    (see `count_todos`), or skipped entirely with `include_total=False`.
+
     Args:
         db (Session): The SQLAlchemy database session used for querying.
         skip (int, optional): The number of todo items to skip in the result set. 
                               Defaults to 0.
         limit (int, optional): The maximum number of todo items to return. 
                                Defaults to 100.
+        include_total (bool, optional): Whether to count the todo items. 
+                                        Defaults to True.
 
     Returns:
         tuple: A tuple containing:
-            - total_count (int): The total number of todo items in the database.
+            - total_count (int): The total number of todo items in the database, 
+                                 or None if `include_total` is False.
             - todos (List[models.Todo]): A list of todo items from the database 
                                          based on the applied pagination.
     """
     todos = db.query(models.Todo).offset(skip).limit(limit).all()
-    total_count = db.query(models.Todo).count()
+    total_count = count_todos(db) if include_total else None
     return total_count, todos
 
 
+def get_todo_rows(db: Session, skip: int = 0, limit: int = 100, include_total: bool = True,
+                  filters: schemas.TodoFilters = None):
+    """Fetches a list of todo items as plain rows, without the ORM.
+
+    Same as `get_todos`, but only the `id`, `label` and `quantity` columns are 
+    selected, and returned as SQLAlchemy Core rows: no `models.Todo` instance 
+    is built nor tracked by the session. This is the read path of `GET /todos`, 
+    whose rows are serialized directly (see `database.serializers`).
+
+    With `filters`, the rows are read from the index of the filtered column, 
+    in its order, and the total is the exact number of matching todo items.
+
+    Args:
+        db (Session): The SQLAlchemy database session used for querying.
+        skip (int, optional): The number of todo items to skip in the result set. 
+                              Defaults to 0.
+        limit (int, optional): The maximum number of todo items to return. 
+                               Defaults to 100.
+        include_total (bool, optional): Whether to count the todo items. 
+                                        Defaults to True.
+        filters (schemas.TodoFilters, optional): Only list the matching todo items.
+
+    Returns:
+        tuple: A tuple containing:
+            - total_count (int): The total number of (matching) todo items in 
+                                 the database, or None if `include_total` is False.
+            - rows (List[Row]): The `(id, label, quantity)` rows of the page.
+    """
+    conditions = _filter_conditions(db, filters)
+    rows = db.execute(select(*TODO_COLUMNS).where(*conditions).offset(skip).limit(limit)).all()
+    total_count = count_todos(db, filters=filters) if include_total else None
+    return total_count, rows
+
+
+def get_todo_row(db: Session, todo_id: int):
+    """Fetches one todo item as a plain row, without the ORM.
+
+    Args:
+        db (Session): The SQLAlchemy database session used for querying.
+        todo_id (int): The unique identifier of the todo item.
+
+    Returns:
+        Row: The `(id, label, quantity)` row of the todo item, or None if 
+             no todo item has this ID.
+    """
+    return db.execute(select(*TODO_COLUMNS).where(models.Todo.id == todo_id)).first()
+
+
+def get_export_batch_size():
+    """Retrieves the number of rows fetched at once by `iter_todo_rows`.
+
+    This function accesses the environment variable "TODO_EXPORT_BATCH_SIZE".
+
+    Returns:
+        int: The number of rows per batch (at least 1).
+    """
+    return max(int(os.getenv("TODO_EXPORT_BATCH_SIZE", str(DEFAULT_EXPORT_BATCH_SIZE))), 1)
+
+
+def iter_todo_rows(db: Session, batch_size: int = None):
+    """Iterates over every todo item, in ID order, batch by batch.
+
+    The rows are read from a server-side cursor (`stream_results`): the 
+    database sends them as they are fetched, instead of the driver buffering 
+    the whole result, so memory use only depends on `batch_size`. Only the 
+    `id`, `label` and `quantity` columns are read, on the connection of the 
+    session: the ORM result processing of `Session.execute` would take as 
+    long as the fetch itself.
+
+    The connection stays busy until the iteration ends: the session must not 
+    run other queries meanwhile.
+
+    Args:
+        db (Session): The SQLAlchemy database session used for querying.
+        batch_size (int, optional): The number of rows per batch 
+                                    (defaults to `get_export_batch_size()`).
+
+    Yields:
+        List[Row]: The `(id, label, quantity)` rows of each batch.
+    """
+    batch_size = batch_size or get_export_batch_size()
+    table = models.Todo.__table__
+    statement = select(table.c.id, table.c.label, table.c.quantity).order_by(
+        table.c.id).execution_options(stream_results=True, yield_per=batch_size)
+    result = db.connection(bind_arguments={"clause": statement}).execute(statement)
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def count_todos(db: Session, filters: schemas.TodoFilters = None):
+    """Counts the todo items in the database.
+
+    The strategy is selected by the "TODO_COUNT_STRATEGY" environment variable: 
+    "exact" (default), "cached", "counter" or "estimate", see `database.counting`. 
+    The todo items matching `filters` are always counted exactly, on the index 
+    of the filtered column.
+
+    Args:
+        db (Session): The SQLAlchemy database session used for querying.
+        filters (schemas.TodoFilters, optional): Only count the matching todo items.
+
+    Returns:
+        int: The total number of (matching) todo items.
+    """
+    conditions = _filter_conditions(db, filters)
+    if conditions:
+        return db.scalar(select(func.count()).select_from(models.Todo).where(*conditions))
+    return counting.count_todos(db)
+
+
+def _filter_conditions(db, filters):
+    """Builds the `WHERE` conditions of the todo filters.
+
+    The label prefix is matched with `LIKE 'prefix%'` (a range of the label 
+    index), and the search with `MATCH ... AGAINST` on MySQL (the FULLTEXT 
+    index) or, on other databases, with `LIKE '%text%'`, which scans the table.
+    """
+    if filters is None:
+        return []
+    conditions = []
+    if filters.label_prefix is not None:
+        prefix = filters.label_prefix.replace("/", "//").replace("%", "/%").replace("_", "/_")
+        conditions.append(models.Todo.label.like(f"{prefix}%", escape="/"))
+    if filters.search is not None:
+        if db.get_bind().dialect.name == "mysql":
+            conditions.append(match(models.Todo.label, against=filters.search).in_boolean_mode())
+        else:
+            conditions.append(models.Todo.label.contains(filters.search, autoescape=True))
+    if filters.min_quantity is not None:
+        conditions.append(models.Todo.quantity >= filters.min_quantity)
+    if filters.max_quantity is not None:
+        conditions.append(models.Todo.quantity <= filters.max_quantity)
+    return conditions
+
+
+def _default_sort(filters):
+    """Sorts a filtered listing by the filtered column, so that its index serves 
+    both the filter and the order."""
+    if filters is not None and filters.label_prefix is not None:
+        return "label"
+    if filters is not None and (filters.min_quantity is not None
+                                or filters.max_quantity is not None):
+        return "quantity"
+    return "id"
+
+
+def get_todos_page(db: Session, limit: int = 100, cursor: str = None,
+                   after_id: int = None, order_by: str = None,
+                   filters: schemas.TodoFilters = None):
+    """Fetches one page of todo items using keyset (cursor) pagination.
+
+    Instead of skipping rows with an offset, the page starts right after the 
+    last item of the previous page (`WHERE id > :last ORDER BY id LIMIT :n`), 
+    so the database seeks in the index of the sort column and the cost of a 
+    page does not depend on its depth. When sorting by `label` or `quantity`, 
+    the ID breaks ties between equal values (`ORDER BY label, id`). NULL values 
+    sort first, as in MySQL, and last in descending order.
+
+    With `filters`, only the matching todo items are listed; the default sort 
+    column is then the filtered one, whose index serves both the filter and 
+    the order (a label prefix sorts by label, a quantity range by quantity).
+
+    Like `get_todo_rows`, only the `id`, `label` and `quantity` columns are 
+    selected, as plain rows.
+
+    Args:
+        db (Session): The SQLAlchemy database session used for querying.
+        limit (int, optional): The maximum number of todo items to return 
+                               (at least 1). Defaults to 100.
+        cursor (str, optional): The `next_cursor` returned with the previous page.
+        after_id (int, optional): Start after this ID, when sorting by ID 
+                                  (a readable alternative to `cursor`).
+        order_by (str, optional): The sort column, "id" (default), "label" or 
+                                  "quantity", prefixed with "-" for a descending 
+                                  order. Must match the sort of `cursor`.
+        filters (schemas.TodoFilters, optional): Only list the matching todo items.
+
+    Returns:
+        tuple: A tuple containing:
+            - rows (List[Row]): The `(id, label, quantity)` rows of the page.
+            - next_cursor (str): The cursor of the next page, or None if this 
+                                 is the last page.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed, does not match `order_by`, 
+                       or is combined with `after_id`.
+    """
+    order_by = order_by or ("id" if after_id is not None else _default_sort(filters))
+    name, descending = parse_sort(order_by)
+    column = getattr(models.Todo, name)
+
+    query = select(*TODO_COLUMNS).where(*_filter_conditions(db, filters))
+    if cursor is not None:
+        if after_id is not None:
+            raise InvalidCursor("Use either cursor or after_id")
+        cursor_order_by, value, last_id = decode_cursor(cursor)
+        if cursor_order_by != order_by:
+            raise InvalidCursor(f"The cursor does not sort by {order_by}")
+        query = query.where(_after(column, value, last_id, descending))
+    elif after_id is not None:
+        if order_by != "id":
+            raise InvalidCursor("after_id requires sorting by id")
+        query = query.where(models.Todo.id > after_id)
+
+    order = [column, models.Todo.id] if name != "id" else [models.Todo.id]
+    query = query.order_by(*(c.desc() if descending else c for c in order))
+    rows = db.execute(query.limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(order_by, getattr(last, name), last.id)
+    return rows, next_cursor
+
+
+def _after(column, value, last_id, descending=False):
+    """Builds the condition selecting the rows sorted after `(value, last_id)`."""
+    if descending:
+        if column is models.Todo.id:
+            return models.Todo.id < last_id
+        if value is None:
+            return and_(column.is_(None), models.Todo.id < last_id)
+        return or_(column < value, and_(column == value, models.Todo.id < last_id),
+                   column.is_(None))
+    if column is models.Todo.id:
+        return models.Todo.id > last_id
+    if value is None:
+        return or_(column.is_not(None), and_(column.is_(None), models.Todo.id > last_id))
+    return or_(column > value, and_(column == value, models.Todo.id > last_id))
+
+
+@uses_primary
 def create_todo(db: Session, todo: schemas.TodoCreate):
     """Creates a new todo item in the database.
 
@@ -50,11 +301,60 @@ def create_todo(db: Session, todo: schemas.TodoCreate):
     """
     db_todo = models.Todo(**todo.model_dump())
     db.add(db_todo)
+    counting.record_change(db, 1)
+    versioning.record_change(db)
     db.commit()
+    counting.invalidate()
     db.refresh(db_todo)
     return db_todo
 
 
+def get_bulk_chunk_size():
+    """Retrieves the number of rows inserted per transaction by bulk operations.
+
+    This function accesses the environment variable "TODO_BULK_CHUNK_SIZE".
+
+    Returns:
+        int: The number of rows per chunk (at least 1).
+    """
+    return max(int(os.getenv("TODO_BULK_CHUNK_SIZE", str(DEFAULT_BULK_CHUNK_SIZE))), 1)
+
+
+@uses_primary
+def create_todos(db: Session, todos, chunk_size: int = None):
+    """Creates many todo items in the database, chunk by chunk.
+
+    Each chunk is sent as one executemany `INSERT` (rendered by SQLAlchemy as 
+    multi-row `INSERT ... VALUES (...), (...)` statements) and committed once, 
+    instead of one `INSERT`, commit and `SELECT` per item as with `create_todo`. 
+    Chunks committed before a failure stay in the database.
+
+    Args:
+        db (Session): The SQLAlchemy database session used for the transactions.
+        todos (Iterable[dict]): The `label` and `quantity` of each todo item, 
+                                already validated (e.g. `TodoCreate.model_dump()`). 
+                                It is consumed lazily, one chunk at a time.
+        chunk_size (int, optional): The number of items per transaction 
+                                    (defaults to `get_bulk_chunk_size()`).
+
+    Returns:
+        int: The number of todo items created.
+    """
+    chunk_size = chunk_size or get_bulk_chunk_size()
+    statement = insert(models.Todo.__table__)
+    todos = iter(todos)
+    created = 0
+    while chunk := list(itertools.islice(todos, chunk_size)):
+        db.execute(statement, chunk)
+        counting.record_change(db, len(chunk))
+        versioning.record_change(db)
+        db.commit()
+        counting.invalidate()
+        created += len(chunk)
+    return created
+
+
+@uses_primary
 def delete_todo(db: Session, todo_id: int):
     """Deletes a specific todo item from the database.
 
@@ -73,5 +373,98 @@ def delete_todo(db: Session, todo_id: int):
     """
     db_todo = db.query(models.Todo).filter(models.Todo.id == todo_id).one()
     db.delete(db_todo)
+    counting.record_change(db, -1)
+    versioning.record_change(db)
     db.commit()
+    counting.invalidate()
     return db_todo
+
+
+@uses_primary
+def delete_todos(db: Session, ids=None, min_id: int = None, max_id: int = None,
+                 label: str = None, quantity: int = None, chunk_size: int = None):
+    """Deletes every todo item matching the given criteria, without loading them.
+
+    The criteria are combined with AND, and at least one must be given. Rows 
+    are deleted with `DELETE ... WHERE` statements, so no row is selected nor 
+    loaded in the session first:
+
+    - a list of `ids` is deleted `chunk_size` IDs at a time (`WHERE id IN (...)`);
+    - an ID range is deleted in keyset chunks: the next `chunk_size` 
+      matching IDs are selected (`ORDER BY id LIMIT chunk_size`, after the 
+      last chunk), then deleted (`WHERE id BETWEEN ...`), so sparse IDs cost 
+      no empty statement;
+    - filters on `label`/`quantity` alone run as a single statement, using 
+      the index of the column.
+
+    Each statement is committed on its own, so that a huge deletion does not 
+    hold its locks until the end; statements committed before a failure 
+    stay applied.
+
+    Args:
+        db (Session): The SQLAlchemy database session used for the transactions.
+        ids (Iterable[int], optional): The IDs of the todo items to delete.
+        min_id (int, optional): The lowest ID to delete (inclusive).
+        max_id (int, optional): The highest ID to delete (inclusive).
+        label (str, optional): Only delete the todo items with this label.
+        quantity (int, optional): Only delete the todo items with this quantity.
+        chunk_size (int, optional): The number of IDs per statement 
+                                    (defaults to `get_bulk_chunk_size()`).
+
+    Returns:
+        int: The number of todo items deleted.
+
+    Raises:
+        ValueError: If no criterion is given.
+    """
+    filters = []
+    if label is not None:
+        filters.append(models.Todo.label == label)
+    if quantity is not None:
+        filters.append(models.Todo.quantity == quantity)
+    if ids is None and min_id is None and max_id is None and not filters:
+        raise ValueError("At least one deletion criterion is required")
+    chunk_size = chunk_size or get_bulk_chunk_size()
+
+    if ids is not None:
+        ids = sorted(set(ids))
+        windows = [[models.Todo.id.in_(ids[start:start + chunk_size])]
+                   for start in range(0, len(ids), chunk_size)]
+        if min_id is not None:
+            filters.append(models.Todo.id >= min_id)
+        if max_id is not None:
+            filters.append(models.Todo.id <= max_id)
+    elif min_id is not None or max_id is not None:
+        windows = _id_chunks(db, min_id, max_id, filters, chunk_size)
+    else:
+        windows = [[]]
+
+    deleted = 0
+    for window in windows:
+        result = db.execute(delete(models.Todo.__table__).where(*window, *filters))
+        counting.record_change(db, -result.rowcount)
+        if result.rowcount:
+            versioning.record_change(db)
+        db.commit()
+        counting.invalidate()
+        deleted += result.rowcount
+    return deleted
+
+
+def _id_chunks(db, min_id, max_id, filters, chunk_size):
+    """Yields the conditions selecting the next `chunk_size` matching IDs of 
+    the range, after the IDs of the previous chunk (keyset)."""
+    query = select(models.Todo.id).where(*filters).order_by(models.Todo.id).limit(chunk_size)
+    if min_id is not None:
+        query = query.where(models.Todo.id >= min_id)
+    if max_id is not None:
+        query = query.where(models.Todo.id <= max_id)
+    last = None
+    while True:
+        ids = db.scalars(query if last is None else query.where(models.Todo.id > last)).all()
+        if not ids:
+            return
+        last = ids[-1]
+        yield [models.Todo.id.between(ids[0], last)]
+        if len(ids) < chunk_size:
+            return
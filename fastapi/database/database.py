@@ -1,12 +1,23 @@
 """
 This module establishes a connection to a MySQL database using SQLAlchemy.
+
+The engine and its connection pool are configured from environment
+variables, see `get_engine_settings()`. Read replicas are configured with
+"MYSQL_REPLICA_HOSTS", see `get_replica_settings()` and `database.routing`.
+
+The engines are built on first use (see `get_engine()`), not when the module
+is imported, so that importing the application neither loads the MySQL
+driver nor needs a database.
 """
 import os
+import threading
 from urllib.parse import quote
 from sqlalchemy import create_engine
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from .pool import TimedQueuePool
+from .routing import DEFAULT_EJECT_SECONDS, DEFAULT_LAG_BUDGET, ReplicaSet, RoutingSession
 
 load_dotenv()
 MYSQL_USER = os.getenv("MYSQL_USER", "DEFAULT_USER")
@@ -16,9 +27,156 @@ MYSQL_PORT = os.getenv("MYSQL_PORT", "3306")
 MYSQL_DB = os.getenv("MYSQL_DB", "DEFAULT_DB")
 DB_URL = f"mysql+pymysql://{MYSQL_USER}:{
     MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}"
+ASYNC_DB_URL = DB_URL.replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+MYSQL_REPLICA_HOSTS = os.getenv("MYSQL_REPLICA_HOSTS", "")
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 30
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 1800
+
+
+def _getenv_bool(name, default):
+    """Reads a "true"/"false" environment variable."""
+    return os.getenv(name, str(default)).lower() == "true"
+
+
+def get_engine_settings():
+    """Retrieves the engine and connection pool settings from environment variables.
+
+    Environment Variables:
+        - DB_POOL_SIZE: The number of connections kept open (default 10).
+        - DB_MAX_OVERFLOW: The number of extra connections opened under load 
+          (default 30, so that the 40 threads of the Starlette threadpool never 
+          wait for a connection).
+        - DB_POOL_TIMEOUT: The number of seconds to wait for a connection 
+          before failing (default 30).
+        - DB_POOL_RECYCLE: The age in seconds after which a connection is 
+          replaced, below the MySQL `wait_timeout` (default 1800, -1 disables).
+        - DB_POOL_PRE_PING: Whether to test connections when they are checked 
+          out, to survive database restarts (default true).
+        - DB_ECHO: Whether to log every SQL statement (default false).
+
+    Returns:
+        dict: The keyword arguments of `create_engine`.
+    """
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", str(DEFAULT_POOL_SIZE))),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", str(DEFAULT_MAX_OVERFLOW))),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", str(DEFAULT_POOL_TIMEOUT))),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", str(DEFAULT_POOL_RECYCLE))),
+        "pool_pre_ping": _getenv_bool("DB_POOL_PRE_PING", True),
+        "echo": _getenv_bool("DB_ECHO", False),
+    }
+
+
+def get_replica_urls(driver="pymysql"):
+    """Builds the URLs of the read replicas.
+
+    The replicas are listed in the environment variable "MYSQL_REPLICA_HOSTS" 
+    as comma-separated `host[:port]` entries, and share the credentials and 
+    database name of the primary.
+
+    Args:
+        driver (str, optional): The MySQL driver of the URLs (default "pymysql").
+
+    Returns:
+        List[str]: The database URL of each replica (none by default).
+    """
+    urls = []
+    for entry in filter(None, (entry.strip() for entry in MYSQL_REPLICA_HOSTS.split(","))):
+        host, _, port = entry.partition(":")
+        urls.append(f"mysql+{driver}://{MYSQL_USER}:{MYSQL_PASSWORD}@{host}:"
+                    f"{port or MYSQL_PORT}/{MYSQL_DB}")
+    return urls
+
+
+def get_replica_settings():
+    """Retrieves the routing settings of the read replicas from environment variables.
+
+    Environment Variables:
+        - DB_REPLICA_EJECT_SECONDS: How long a replica whose connections fail 
+          is skipped (default 30).
+        - DB_READ_YOUR_WRITES: Whether a client reads from the primary after 
+          its writes, and a session after its first write (default false).
+        - DB_REPLICA_LAG_BUDGET: How long in seconds a client reads from the 
+          primary after a write, with "DB_READ_YOUR_WRITES" (default 5).
+
+    Returns:
+        dict: The 'eject_seconds', 'read_your_writes' and 'lag_budget' settings.
+    """
+    return {
+        "eject_seconds": float(os.getenv("DB_REPLICA_EJECT_SECONDS",
+                                         str(DEFAULT_EJECT_SECONDS))),
+        "read_your_writes": _getenv_bool("DB_READ_YOUR_WRITES", False),
+        "lag_budget": float(os.getenv("DB_REPLICA_LAG_BUDGET", str(DEFAULT_LAG_BUDGET))),
+    }
+
+
+def create_db_engine(url, settings=None):
+    """Creates an engine whose pool records its statistics (see `database.pool`).
+
+    Args:
+        url (str): The database URL.
+        settings (dict, optional): The engine settings 
+                                   (defaults to `get_engine_settings()`).
+
+    Returns:
+        Engine: The SQLAlchemy engine.
+    """
+    return create_engine(url=url, poolclass=TimedQueuePool,
+                         **(settings or get_engine_settings()))
+
+
+_engine = None
+_replicas = None
+_sessionmaker = None
+_lock = threading.Lock()
+
+
+def get_engine():
+    """Returns the engine of the primary, building it on first use.
 
-engine = create_engine(url=DB_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    The engines of the read replicas and the factory of sessions are built 
+    at the same time; no connection is opened until a session needs one.
+
+    Returns:
+        Engine: The shared engine.
+    """
+    global _engine, _replicas, _sessionmaker  # pylint: disable=global-statement
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                settings = get_replica_settings()
+                _replicas = ReplicaSet([create_db_engine(url) for url in get_replica_urls()],
+                                       eject_seconds=settings["eject_seconds"])
+                engine = create_db_engine(DB_URL)
+                _sessionmaker = sessionmaker(
+                    class_=RoutingSession, autocommit=False, autoflush=False,
+                    bind=engine, replicas=_replicas,
+                    read_your_writes=settings["read_your_writes"])
+                _engine = engine
+    return _engine
+
+
+def get_replicas():
+    """Returns the read replicas of the primary.
+
+    Returns:
+        ReplicaSet: The replicas of `get_engine()`, empty when none is configured.
+    """
+    get_engine()
+    return _replicas
+
+
+def get_sessionmaker():
+    """Returns the factory of database sessions.
+
+    Returns:
+        sessionmaker: The factory of `RoutingSession`s bound to `get_engine()`.
+    """
+    get_engine()
+    return _sessionmaker
 
 
 class Base(DeclarativeBase): # pylint: disable=too-few-public-methods
@@ -1,7 +1,7 @@
 """
 This module defines the SQLAlchemy ORM models for the application.
 """
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import BigInteger, Column, Index, Integer, String
 from .database import Base
 
 
@@ -18,7 +18,8 @@ class Todo(Base): # pylint: disable=too-few-public-methods
                   automatically generated and unique for each item.
         label (str): A brief description or title of the to-do item, 
                      with a maximum length of 255 characters. This field 
-                     is indexed to facilitate quick searches.
+                     is indexed to facilitate quick searches, and has a 
+                     FULLTEXT index on MySQL for word searches.
         quantity (int): An integer representing the number of tasks or 
                         items associated with this to-do. This field is 
                         also indexed for efficient querying.
@@ -32,3 +33,60 @@ class Todo(Base): # pylint: disable=too-few-public-methods
     id = Column(Integer, primary_key=True, index=True)
     label = Column(String(255), index=True)
     quantity = Column(Integer, index=True)
+
+    __table_args__ = (
+        Index("ix_todos_label_fulltext", "label", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+
+class RowCount(Base): # pylint: disable=too-few-public-methods
+    """Holds the number of rows of a table, maintained by the application.
+
+    With the "counter" count strategy, `create_todo` and `delete_todo` update 
+    the row of the 'todos' table in the same transaction as the insert or 
+    delete, so reading the total is a primary key lookup instead of a full 
+    table scan.
+
+    Attributes:
+        table_name (str): The name of the counted table (primary key).
+        count (int): The number of rows of the table.
+    """
+    __tablename__ = "row_counts"
+
+    table_name = Column(String(64), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class TableVersion(Base): # pylint: disable=too-few-public-methods
+    """Holds the version of a table, changed by every write to the table.
+
+    The `crud` write functions increment the version of the 'todos' table in 
+    the same transaction as their insert or delete, so that the ETag of the 
+    todo listings can be computed with a primary key lookup (see 
+    `database.versioning`).
+
+    Attributes:
+        table_name (str): The name of the versioned table (primary key).
+        version (int): The version of the table, seeded with the time (in 
+                       milliseconds) the row was created.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False)
+
+
+def ensure_indexes(bind):
+    """Creates the indexes of the models that are missing from the database.
+
+    `Base.metadata.create_all` skips the tables that already exist, so the 
+    indexes added to a model afterwards (e.g. the FULLTEXT index of 
+    `Todo.label`) would never be created on an existing database. This 
+    function creates them, as a lightweight migration.
+
+    Args:
+        bind (Engine): The engine of the database.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
@@ -0,0 +1,238 @@
+"""
+This module provides the response cache of the todo listings.
+
+The website lists the same pages of todo items again and again, while they
+only change on writes. The JSON documents of `GET /todos` are cached per
+query string in an LRU in the memory of the process and, optionally, in a
+shared Redis (or Redis-compatible) server, so that the workers share the
+cached pages and see the writes made by each other.
+
+Every write bumps a generation counter (in Redis when it is shared), and the
+pages are stored under the generation they were read in: one increment
+invalidates every page, without listing or deleting them. A page read while
+a write was in progress is stored under the previous generation, so it can
+never be served after the write.
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+DEFAULT_TTL = 0
+DEFAULT_MAX_ENTRIES = 1024
+GENERATION_KEY = "todos:pages:generation"
+
+_page_cache = None
+_lock = threading.Lock()
+
+
+class PageCache:
+    """
+    LRU cache of response bodies, invalidated as a whole by a generation counter.
+
+    Attributes:
+        ttl (float): The number of seconds a page stays valid (0 disables the cache).
+        max_entries (int): The maximum number of pages kept in memory
+                           (least recently used evicted first).
+        hits (int): The number of lookups served from memory.
+        shared_hits (int): The number of lookups served by the shared server.
+        misses (int): The number of lookups that had to query the database.
+        errors (int): The number of failed calls to the shared server, handled
+                      as misses.
+    """
+
+    def __init__(self, ttl, max_entries=DEFAULT_MAX_ENTRIES, redis=None, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._redis = redis
+        self._redis_errors = ()
+        if redis is not None:
+            from redis.exceptions import RedisError  # pylint: disable=import-outside-toplevel
+            self._redis_errors = (RedisError, OSError)
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """
+        bool: Whether pages are cached at all.
+        """
+        return self.ttl > 0
+
+    @staticmethod
+    def key(query_params):
+        """
+        Build the cache key of a listing.
+
+        Args:
+            query_params (QueryParams): The query parameters of the request.
+
+        Returns:
+            str: The parameters, sorted, as a query string.
+        """
+        return urlencode(sorted(query_params.multi_items()))
+
+    async def get(self, key):
+        """
+        Look up a page.
+
+        Args:
+            key (str): The key built by `key()`.
+
+        Returns:
+            tuple: The cached body and the generation to pass to `set`. The
+            body is None on a miss.
+        """
+        generation = await self._current_generation()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation and entry[1] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2], generation
+            if entry is not None:
+                del self._entries[key]
+        if self._redis is not None and generation is not None:
+            try:
+                value = await self._redis.get(self._shared_key(generation, key))
+            except self._redis_errors:
+                value = None
+                self.errors += 1
+            if value is not None:
+                self._store(key, value, generation)
+                self.shared_hits += 1
+                return value, generation
+        self.misses += 1
+        return None, generation
+
+    async def set(self, key, value, generation):
+        """
+        Store a page read from the database.
+
+        Args:
+            key (str): The key built by `key()`.
+            value (bytes): The body of the response.
+            generation (int): The generation returned by `get` before the read.
+        """
+        if generation is None or (self._redis is None and generation != self._generation):
+            return
+        self._store(key, value, generation)
+        if self._redis is not None:
+            try:
+                await self._redis.set(self._shared_key(generation, key), value,
+                                      ex=max(math.ceil(self.ttl), 1))
+            except self._redis_errors:
+                self.errors += 1
+
+    async def invalidate(self):
+        """
+        Invalidate every cached page, after a write.
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+        if self._redis is not None:
+            try:
+                await self._redis.incr(GENERATION_KEY)
+            except self._redis_errors:
+                self.errors += 1
+
+    async def close(self):
+        """
+        Drop the pages kept in memory and close the connections to the shared server.
+        """
+        with self._lock:
+            self._entries.clear()
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: The 'hits' (from memory), 'shared_hits', 'misses', 'hit_ratio',
+            'errors' and current 'size' (in memory) of the cache.
+        """
+        with self._lock:
+            hits = self.hits + self.shared_hits
+            lookups = hits + self.misses
+            return {
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "errors": self.errors,
+                "size": len(self._entries),
+            }
+
+    async def _current_generation(self):
+        """Returns the current generation, or None if the shared server cannot be reached."""
+        if self._redis is None:
+            return self._generation
+        try:
+            return int(await self._redis.get(GENERATION_KEY) or 0)
+        except self._redis_errors:
+            self.errors += 1
+            return None
+
+    def _store(self, key, value, generation):
+        """Keeps a page in memory, evicting the least recently used ones."""
+        with self._lock:
+            self._entries[key] = (generation, self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _shared_key(generation, key):
+        """Returns the key of a page on the shared server."""
+        return f"todos:pages:{generation}:{key}"
+
+
+def get_page_cache():
+    """
+    Return the page cache of the process, building it on first use.
+
+    The cache lifetime comes from "TODO_PAGE_CACHE_TTL" (in seconds, default 0:
+    disabled) and its size from "TODO_PAGE_CACHE_MAX_ENTRIES" (default 1024
+    pages). With "TODO_PAGE_CACHE_REDIS_URL" (e.g. `redis://localhost:6379/0`),
+    the pages and the generation are shared through that server; otherwise
+    the cache is local to the process (`GET /todos` also keys its pages by
+    the version of the table, so the writes of other workers are seen).
+
+    Returns:
+        PageCache: The shared page cache.
+    """
+    global _page_cache  # pylint: disable=global-statement
+    if _page_cache is None:
+        with _lock:
+            if _page_cache is None:
+                ttl = float(os.getenv("TODO_PAGE_CACHE_TTL", str(DEFAULT_TTL)))
+                redis_url = os.getenv("TODO_PAGE_CACHE_REDIS_URL")
+                redis = None
+                if ttl > 0 and redis_url:
+                    from redis import asyncio as aioredis  # pylint: disable=import-outside-toplevel
+                    redis = aioredis.from_url(redis_url)
+                _page_cache = PageCache(ttl=ttl, redis=redis, max_entries=int(os.getenv(
+                    "TODO_PAGE_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES))))
+    return _page_cache
+
+
+async def close_page_cache():
+    """
+    Close the page cache, if it was built, so that the next use builds it again.
+    """
+    global _page_cache  # pylint: disable=global-statement
+    with _lock:
+        cache, _page_cache = _page_cache, None
+    if cache is not None:
+        await cache.close()
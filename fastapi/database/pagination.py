@@ -0,0 +1,86 @@
+"""
+This module provides the opaque cursors used for keyset pagination of
+todo items.
+
+A cursor records the sort key of the listing (a column of `SORT_KEYS`,
+prefixed with "-" for a descending order), and the sort value and ID of the
+last item of a page. The next page starts right after that item,
+using the index of the sort column instead of scanning and discarding the
+previous rows, so its cost does not depend on how deep the page is.
+"""
+import base64
+import binascii
+import json
+
+SORT_KEYS = ("id", "label", "quantity")
+
+
+class InvalidCursor(ValueError):
+    """
+    Raised when a cursor cannot be decoded, or does not match the listing.
+    """
+
+
+def parse_sort(order_by):
+    """
+    Split a sort key into its column and direction.
+
+    Args:
+        order_by (str): One of `SORT_KEYS`, prefixed with "-" for a descending order.
+
+    Returns:
+        tuple: The column name and whether the order is descending.
+
+    Raises:
+        InvalidCursor: If the column is not one of `SORT_KEYS`.
+    """
+    column = order_by.removeprefix("-")
+    if column not in SORT_KEYS:
+        raise InvalidCursor(f"Cannot sort by {order_by}")
+    return column, column != order_by
+
+
+def encode_cursor(order_by, value, last_id):
+    """
+    Build the cursor of the page following an item.
+
+    Args:
+        order_by (str): The sort key, see `parse_sort`.
+        value: The value of the sort column for the last item of the page.
+        last_id (int): The ID of the last item of the page.
+
+    Returns:
+        str: An URL-safe opaque cursor.
+    """
+    payload = json.dumps({"k": order_by, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Read a cursor built by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor sent by the client.
+
+    Returns:
+        tuple: The sort key, the sort value and the ID of the last item.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        order_by, value, last_id = payload["k"], payload["v"], payload["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(order_by, str) or not isinstance(last_id, int):
+        raise InvalidCursor("Invalid cursor")
+    try:
+        column, _ = parse_sort(order_by)
+    except InvalidCursor as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if column != "id" and value is not None and not isinstance(value, (str, int)):
+        raise InvalidCursor("Invalid cursor")
+    return order_by, value, last_id
@@ -0,0 +1,112 @@
+"""
+This module provides a connection pool that measures how long requests wait
+for a database connection.
+
+Pool statistics (connections checked out, overflow, time spent acquiring a
+connection, timeouts) are what is needed to size the pool of each worker:
+a pool that is too small shows up as wait time long before it shows up as
+`QueuePool limit ... reached` errors.
+"""
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class TimedPoolMixin:
+    """
+    Mixin for `QueuePool` classes recording the time spent in each connection checkout.
+
+    The measured time includes waiting for a connection to be returned to the
+    pool, opening a new connection when the pool is not full, and the
+    pre-ping of the connection when it is enabled.
+
+    Attributes:
+        checkouts (int): The number of connections handed out.
+        timeouts (int): The number of checkouts that gave up after the pool timeout.
+        wait_time (float): The total time spent acquiring connections, in seconds.
+        max_wait_time (float): The longest time spent acquiring one connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self._stats_lock = threading.Lock()
+
+    def connect(self):
+        """
+        Check a connection out of the pool, timing the checkout.
+
+        Returns:
+            PoolProxiedConnection: The connection.
+
+        Raises:
+            sqlalchemy.exc.TimeoutError: If no connection was available within
+                                         the pool timeout (counted in `timeouts`).
+        """
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.checkouts += 1
+            self.wait_time += elapsed
+            self.max_wait_time = max(self.max_wait_time, elapsed)
+        return connection
+
+    def stats(self):
+        """
+        Return the live statistics of the pool.
+
+        Returns:
+            dict: The configured 'size' and current 'checked_in', 'checked_out'
+            and 'overflow' connections, with the 'checkouts', 'timeouts',
+            'wait_time_total' and 'wait_time_max' (in seconds) since startup.
+        """
+        with self._stats_lock:
+            return {
+                "size": self.size(),
+                "checked_in": self.checkedin(),
+                "checked_out": self.checkedout(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_time_total": self.wait_time,
+                "wait_time_max": self.max_wait_time,
+            }
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    """
+    `QueuePool` of the synchronous engine, with statistics.
+    """
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    """
+    `AsyncAdaptedQueuePool` of the asynchronous engine, with statistics.
+    """
+
+
+def pool_stats(engine):
+    """
+    Return the statistics of the connection pool of an engine.
+
+    Args:
+        engine (Engine): The SQLAlchemy engine (`AsyncEngine.sync_engine` for
+                         an asynchronous engine).
+
+    Returns:
+        dict: The statistics of `TimedPoolMixin.stats()`, or only the pool
+        class for other pools.
+    """
+    if isinstance(engine.pool, TimedPoolMixin):
+        return engine.pool.stats()
+    return {"pool": type(engine.pool).__name__}
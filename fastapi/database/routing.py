@@ -0,0 +1,240 @@
+"""
+This module routes the queries of a session between the primary database and
+its read replicas.
+
+`RoutingSession` sends `SELECT` statements to a replica, and everything else
+(flushes, `INSERT`, `UPDATE`, `DELETE`, locking reads) to the primary. The
+replica is chosen round-robin by a `ReplicaSet` on the first read of a
+transaction and kept until the transaction ends, so that the queries of a
+request all see the same state of the data. A replica whose connections fail is ejected for
+a while: the failing query still raises, the following ones skip it. When all
+the replicas are ejected, reads go to the primary.
+
+Replicas lag behind the primary, so reads that belong to a write (e.g. the
+`refresh` of a created todo) must not use them: the `crud` write functions are
+decorated with `uses_primary`. Beyond that, a client can be pinned to the
+primary after its writes ("read-your-writes"): `ReadYourWritesMiddleware`
+answers every successful write request with a cookie holding the end of the
+replication lag budget, and the sessions of the following requests of the
+client send their reads to the primary until then (see `pin_to_primary`), so
+that a client never reads older data than it wrote.
+"""
+import functools
+import math
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+
+from .pool import pool_stats
+
+DEFAULT_EJECT_SECONDS = 30
+DEFAULT_LAG_BUDGET = 5
+PRIMARY_COOKIE = "db_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaSet:
+    """
+    Engines of the read replicas, handed out round-robin.
+
+    Attributes:
+        engines (List[Engine]): The engines of the replicas.
+        eject_seconds (float): How long a failing replica is skipped.
+    """
+
+    def __init__(self, engines, eject_seconds=DEFAULT_EJECT_SECONDS, clock=time.monotonic):
+        self.engines = list(engines)
+        self.eject_seconds = eject_seconds
+        self._clock = clock
+        self._ejected_until = {}
+        self._next = 0
+        self._lock = threading.Lock()
+        for engine in self.engines:
+            event.listen(engine, "handle_error", functools.partial(self._on_error, engine))
+
+    def __len__(self):
+        return len(self.engines)
+
+    def choose(self):
+        """
+        Return the next healthy replica.
+
+        Returns:
+            Engine: The engine of the replica, or None if there is no replica
+            or all of them are ejected.
+        """
+        now = self._clock()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                engine = self.engines[self._next]
+                self._next = (self._next + 1) % len(self.engines)
+                if self._ejected_until.get(engine, 0) <= now:
+                    return engine
+        return None
+
+    def eject(self, engine):
+        """
+        Skip a replica for `eject_seconds`.
+
+        Args:
+            engine (Engine): The engine of the failing replica.
+        """
+        with self._lock:
+            self._ejected_until[engine] = self._clock() + self.eject_seconds
+
+    def stats(self):
+        """
+        Return the state of each replica.
+
+        Returns:
+            List[dict]: The 'host', whether the replica is 'ejected', and the
+            statistics of its connection 'pool'.
+        """
+        now = self._clock()
+        with self._lock:
+            ejected = {engine for engine, until in self._ejected_until.items() if until > now}
+        return [{"host": engine.url.host, "ejected": engine in ejected,
+                 "pool": pool_stats(engine)} for engine in self.engines]
+
+    def _on_error(self, engine, context):
+        """Ejects the replica when a connection cannot be opened or is lost."""
+        if context.is_pre_ping:
+            return
+        if context.connection is None or context.is_disconnect:
+            self.eject(engine)
+
+
+class RoutingSession(Session):  # pylint: disable=too-few-public-methods
+    """
+    `Session` sending reads to the replicas and writes to the primary (its `bind`).
+
+    Args:
+        replicas (ReplicaSet, optional): The read replicas; without them,
+                                         every query goes to the primary.
+        read_your_writes (bool, optional): Whether to pin the session to the
+                                           primary after its first write.
+
+    Attributes:
+        pinned (bool): Whether every query goes to the primary, set by the 
+                       first write with `read_your_writes`, or by 
+                       `pin_to_primary`.
+    """
+
+    def __init__(self, *args, replicas=None, read_your_writes=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.read_your_writes = read_your_writes
+        self.pinned = False
+        self.primary_depth = 0
+        self.replica = None
+        event.listen(self, "after_transaction_end", self._on_transaction_end)
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        """Returns the engine of a statement: a replica for a plain `SELECT` of 
+        an unpinned session outside `uses_primary`, the primary otherwise."""
+        primary = super().get_bind(mapper, clause=clause, **kwargs)
+        if self._flushing or not _is_plain_select(clause):
+            if self.read_your_writes:
+                self.pinned = True
+            return primary
+        if not self.replicas or self.pinned or self.primary_depth:
+            return primary
+        if self.replica is None:
+            self.replica = self.replicas.choose()
+        return self.replica or primary
+
+    def _on_transaction_end(self, _session, transaction):
+        """Lets the next transaction choose its replica again."""
+        if transaction.parent is None:
+            self.replica = None
+
+
+def _is_plain_select(clause):
+    """Tells whether a statement is a `SELECT` without `FOR UPDATE`."""
+    return (clause is not None and getattr(clause, "is_select", False)
+            and getattr(clause, "_for_update_arg", None) is None)
+
+
+def uses_primary(func):
+    """
+    Decorator running every query of a function on the primary.
+
+    The decorated function takes the session as its first argument, or as
+    the `db` keyword argument. Sessions other than `RoutingSession` ignore it.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        db = kwargs["db"] if "db" in kwargs else args[0]
+        if not isinstance(db, RoutingSession):
+            return func(*args, **kwargs)
+        db.primary_depth += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            db.primary_depth -= 1
+    return wrapper
+
+
+def pin_to_primary(db):
+    """
+    Send every query of a session to the primary, e.g. for a client that 
+    wrote within the replication lag budget.
+
+    Args:
+        db (Session | AsyncSession): The session; sessions other than 
+                                     `RoutingSession` ignore it.
+    """
+    session = getattr(db, "sync_session", db)
+    if isinstance(session, RoutingSession):
+        session.pinned = True
+
+
+class ReadYourWritesMiddleware:  # pylint: disable=too-few-public-methods
+    """
+    ASGI middleware pinning the reads of a client to the primary after its writes.
+
+    The response to a successful write request (any method but GET, HEAD and 
+    OPTIONS, with a status below 400) sets the `PRIMARY_COOKIE` cookie to the 
+    time until which the replicas may still lag behind the write. The 
+    requests carrying the cookie until then get `read_primary` set in their 
+    state, for the database dependency to call `pin_to_primary`. A cookie 
+    ending later than the budget allows is ignored.
+
+    Args:
+        app (ASGIApp): The application to wrap.
+        lag_budget (float): The replication lag budget, in seconds.
+        clock (callable, optional): Returns the current time, in seconds 
+                                    since the epoch.
+    """
+
+    def __init__(self, app, lag_budget=DEFAULT_LAG_BUDGET, clock=time.time):
+        self.app = app
+        self.lag_budget = lag_budget
+        self.clock = clock
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        now = self.clock()
+        try:
+            until = float(HTTPConnection(scope).cookies.get(PRIMARY_COOKIE, "0"))
+        except ValueError:
+            until = 0.0
+        if now < until <= now + self.lag_budget:
+            scope.setdefault("state", {})["read_primary"] = True
+        if scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(raw=message["headers"]).append(
+                    "set-cookie", f"{PRIMARY_COOKIE}={self.clock() + self.lag_budget:.3f}; "
+                    f"Max-Age={math.ceil(self.lag_budget)}; Path=/; HttpOnly; SameSite=Lax")
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -2,8 +2,8 @@
 This module defines Pydantic models used for validating and serializing 
 Todo data.
 """
-from typing import List
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
 
 
 class TodoBase(BaseModel):
@@ -66,9 +66,90 @@ class TodosResponse(BaseModel):
     a collection of todo items, along with the total number of todos.
 
     Attributes:
-        total (int): The total number of todo items in the collection.
+        total (Optional[int]): The total number of todo items in the collection, 
+                               or None when the count was skipped.
         todos (List[Todo]): A list of `Todo` objects representing each 
                             todo item.
+        next_cursor (Optional[str]): The cursor of the next page in keyset 
+                                     mode, or None on the last page and in 
+                                     `skip` mode.
     """
-    total: int
+    total: Optional[int] = None
     todos: List[Todo]
+    next_cursor: Optional[str] = None
+
+
+class TodoFilters(BaseModel):
+    """Model representing the filters of a listing of todo items.
+
+    The filters are combined with AND, and each one is served by an index 
+    of the `todos` table (see `models.Todo`).
+
+    Attributes:
+        label_prefix (Optional[str]): Only list the todo items whose label 
+                                      starts with this text.
+        search (Optional[str]): Only list the todo items whose label matches 
+                                this full-text search (MySQL boolean mode).
+        min_quantity (Optional[int]): The lowest quantity to list (inclusive).
+        max_quantity (Optional[int]): The highest quantity to list (inclusive).
+    """
+    label_prefix: Optional[str] = Field(default=None, min_length=1, max_length=255)
+    search: Optional[str] = Field(default=None, min_length=1, max_length=255)
+    min_quantity: Optional[int] = None
+    max_quantity: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_quantity_range(self):
+        """Ensures that the quantity range is not empty.
+        """
+        if (self.min_quantity is not None and self.max_quantity is not None
+                and self.min_quantity > self.max_quantity):
+            raise ValueError("'min_quantity' cannot be greater than 'max_quantity'")
+        return self
+
+
+class BulkCreateResponse(BaseModel):
+    """Model representing the outcome of a bulk creation of todo items.
+
+    Attributes:
+        inserted (int): The number of todo items created.
+    """
+    inserted: int
+
+
+class TodosDeleteRequest(BaseModel):
+    """Model representing a request to delete several todo items at once.
+
+    The criteria are combined with AND, and at least one must be given.
+
+    Attributes:
+        ids (Optional[List[int]]): The IDs of the todo items to delete.
+        min_id (Optional[int]): The lowest ID to delete (inclusive).
+        max_id (Optional[int]): The highest ID to delete (inclusive).
+        label (Optional[str]): Only delete the todo items with this label.
+        quantity (Optional[int]): Only delete the todo items with this quantity.
+    """
+    ids: Optional[List[int]] = Field(default=None, min_length=1)
+    min_id: Optional[int] = None
+    max_id: Optional[int] = None
+    label: Optional[str] = None
+    quantity: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_criteria(self):
+        """Ensures that the request cannot delete every todo item by mistake.
+        """
+        if all(value is None for value in (self.ids, self.min_id, self.max_id,
+                                           self.label, self.quantity)):
+            raise ValueError("At least one of 'ids', 'min_id', 'max_id', 'label' "
+                             "or 'quantity' must be given")
+        return self
+
+
+class TodosDeleteResponse(BaseModel):
+    """Model representing the outcome of a bulk deletion of todo items.
+
+    Attributes:
+        deleted (int): The number of todo items deleted.
+    """
+    deleted: int
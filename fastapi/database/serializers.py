@@ -0,0 +1,88 @@
+"""
+This module serializes todo rows straight to JSON bytes.
+
+Returning ORM instances from an endpoint makes FastAPI validate them into
+`schemas.TodosResponse` (building one Pydantic model per item), convert the
+models back to dictionaries, then encode them. For rows read from the
+database, whose types are already known, this work is pure overhead: the
+rows are encoded once into the same JSON document instead, with orjson
+(several times faster than the `json` module on large pages).
+"""
+import csv
+import io
+from json.encoder import encode_basestring
+import orjson
+
+CSV_HEADER = ("id", "label", "quantity")
+
+
+def dump_todos_response(total, rows, next_cursor=None):
+    """Encodes a page of todo rows as a `schemas.TodosResponse` JSON document.
+
+    Args:
+        total (int): The total number of todo items, or None.
+        rows (List[Row]): The `(id, label, quantity)` rows of the page, e.g.
+                          from `crud.get_todo_rows`.
+        next_cursor (str, optional): The cursor of the next page.
+
+    Returns:
+        bytes: The UTF-8 JSON document, equal to the one FastAPI would
+               produce from the response model (the keys of the todo items 
+               are in column order).
+    """
+    return orjson.dumps({
+        "total": total,
+        "todos": [{"id": id_, "label": label, "quantity": quantity}
+                  for id_, label, quantity in rows],
+        "next_cursor": next_cursor,
+    })
+
+
+def dump_todo(row):
+    """Encodes a todo row as a `schemas.Todo` JSON document.
+
+    Args:
+        row (Row): The `(id, label, quantity)` row, e.g. from `crud.get_todo_row`.
+
+    Returns:
+        bytes: The UTF-8 JSON document.
+    """
+    id_, label, quantity = row
+    return orjson.dumps({"id": id_, "label": label, "quantity": quantity})
+
+
+def dump_todos_ndjson(rows):
+    """Encodes todo rows as NDJSON, one `{"id", "label", "quantity"}` object per line.
+
+    The lines are formatted directly, only the labels going through the JSON 
+    string encoder, which is several times faster than encoding one 
+    dictionary per row (with orjson too, once the lines are joined).
+
+    Args:
+        rows (List[Row]): The `(id, label, quantity)` rows.
+
+    Returns:
+        bytes: The UTF-8 lines, each ending with a newline.
+    """
+    return "".join([
+        f'{{"id":{id_},"label":{"null" if label is None else encode_basestring(label)},'
+        f'"quantity":{"null" if quantity is None else quantity}}}\n'
+        for id_, label, quantity in rows]).encode("utf-8")
+
+
+def dump_todos_csv(rows, header=False):
+    """Encodes todo rows as CSV lines (RFC 4180, CRLF line endings).
+
+    Args:
+        rows (List[Row]): The `(id, label, quantity)` rows.
+        header (bool, optional): Whether to start with the `CSV_HEADER` line.
+
+    Returns:
+        bytes: The UTF-8 lines.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CSV_HEADER)
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
@@ -0,0 +1,92 @@
+"""
+This module provides the version of the todos table, used as the ETag of the
+todo listings.
+
+Hashing a response to build its ETag still costs the query and the
+serialization of the page. Instead, the `table_versions` row of the 'todos'
+table is incremented in the same transaction as every insert and delete, so
+the version read at the start of a request tells whether any todo item changed
+since the client fetched its copy: when it did not, the request is answered
+with `304 Not Modified` after a single primary key lookup.
+
+The row is seeded at startup by `ensure_version`, with the current time in
+milliseconds, so that a version is never reused if the row is deleted and
+seeded again. A process finding the row missing (e.g. on a schema created
+without the startup of the application) seeds it once on the primary; until
+the row has been replicated to the replica serving the read, responses have
+no ETag.
+"""
+import time
+import weakref
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import models
+
+_seeded_binds = weakref.WeakSet()
+
+
+def ensure_version(bind):
+    """Seeds the version row of the todos table, if it is missing.
+
+    Called at startup, after the tables are created. Several processes may 
+    start at once: the ones losing the race keep the row of the winner.
+
+    Args:
+        bind (Engine): The engine of the (primary) database.
+    """
+    row = {"table_name": models.Todo.__tablename__, "version": time.time_ns() // 1_000_000}
+    with bind.connect() as connection:
+        exists = connection.scalar(
+            select(models.TableVersion.table_name)
+            .where(models.TableVersion.table_name == models.Todo.__tablename__))
+        if exists is not None:
+            return
+        try:
+            connection.execute(insert(models.TableVersion), row)
+            connection.commit()
+        except IntegrityError:
+            connection.rollback()
+
+
+def get_version(db: Session):
+    """Reads the version of the todos table.
+
+    If the row is missing, it is seeded with `ensure_version` on the primary 
+    (the `bind` of the session), once per process and database, then read 
+    again.
+
+    Args:
+        db (Session): The SQLAlchemy database session used for querying.
+
+    Returns:
+        int: The version of the table, or None if its row is still missing 
+             (e.g. not yet replicated to the replica serving the read).
+    """
+    version = _read_version(db)
+    if version is None and db.bind is not None and db.bind not in _seeded_binds:
+        _seeded_binds.add(db.bind)
+        ensure_version(db.bind)
+        version = _read_version(db)
+    return version
+
+
+def _read_version(db):
+    """Reads the version row of the todos table, None if missing."""
+    return db.scalar(select(models.TableVersion.version)
+                     .where(models.TableVersion.table_name == models.Todo.__tablename__))
+
+
+def record_change(db: Session):
+    """Increments the version of the todos table.
+
+    Must be called before the transaction of the change is committed, so
+    that the version and the rows change together.
+
+    Args:
+        db (Session): The SQLAlchemy database session of the change.
+    """
+    db.execute(update(models.TableVersion)
+               .where(models.TableVersion.table_name == models.Todo.__tablename__)
+               .values(version=models.TableVersion.version + 1))
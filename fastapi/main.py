@@ -1,23 +1,79 @@
 """
 Main module for the FastAPI application.
 """
+import codecs
+import json
 import os
-import io
+import re
+import sys
+from contextlib import asynccontextmanager
+from typing import Literal, Optional
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import NoResultFound
-from database import crud, models, schemas as todoSchemas
-from database.database import SessionLocal, engine
-from storage import actions, schemas as storageSchemas
-from botocore.exceptions import ClientError
-from fastapi import FastAPI, Depends, HTTPException, File, UploadFile
-from fastapi.responses import StreamingResponse
+from database import aio as dbAio, crud, models, page_cache, serializers, versioning, \
+    schemas as todoSchemas
+from database.pagination import InvalidCursor
+from database.database import get_engine, get_replica_settings, get_replica_urls, get_replicas, \
+    get_sessionmaker as get_session_factory
+from database.pool import pool_stats
+from database.routing import ReadYourWritesMiddleware, pin_to_primary
+from storage import actions, aio as storageAio, ranges, schemas as storageSchemas, \
+    serializers as storageSerializers
+from storage.backends import StorageError
+# isort, and so pylint, lists `compression` as a standard package (new in Python 3.14).
+# pylint: disable-next=wrong-import-order
+from compression import CompressionMiddleware, get_compression_settings
+from fastapi import FastAPI, Depends, HTTPException, File, Header, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 IS_TESTING = os.getenv('TESTING', 'false').lower() == 'true'
 FASTAPI_ROOT_PATH = os.getenv('FASTAPI_ROOT_PATH', "")
+MAX_ITEM_SIZE = 1024 * 1024
+JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
 
 
-app = FastAPI(root_path=FASTAPI_ROOT_PATH)
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Creates the missing tables and indexes and builds the storage backend 
+    and its client when the application starts, and stops the storage thread 
+    pool and removes the disk cache when it shuts down.
+
+    Nothing of this is done when the module is imported, so that tools and 
+    tests importing the application do not need a database, and only the 
+    client library of the configured backend is loaded.
+
+    Args:
+        _app (FastAPI): The application being started.
+
+    Yields:
+        None: Control back to the application until it shuts down.
+    """
+    if not IS_TESTING:  # pragma: no cover
+        await run_in_threadpool(init_database)
+    actions.init_backend()
+    yield
+    storageAio.shutdown()
+    actions.close_caches()
+    await page_cache.close_page_cache()
+    await dbAio.dispose()
+
+
+def init_database():  # pragma: no cover
+    """Creates the missing tables and indexes, and seeds the version of the 
+    todos table (see `database.versioning`)."""
+    engine = get_engine()
+    models.Base.metadata.create_all(bind=engine)
+    models.ensure_indexes(engine)
+    versioning.ensure_version(engine)
+
+
+app = FastAPI(root_path=FASTAPI_ROOT_PATH, lifespan=lifespan,
+              default_response_class=ORJSONResponse)
 
 
 app.add_middleware(
@@ -27,27 +83,60 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware, **get_compression_settings())
+if get_replica_settings()["read_your_writes"] and get_replica_urls():  # pragma: no cover
+    app.add_middleware(ReadYourWritesMiddleware,
+                       lag_budget=get_replica_settings()["lag_budget"])
 
 
-if not IS_TESTING:  # pragma: no cover
-    models.Base.metadata.create_all(bind=engine)
-
-
-def get_db():  # pragma: no cover
+async def get_db(request: Request):  # pragma: no cover
     """Dependency function to provide a database session.
 
     This function is used as a dependency in FastAPI to inject
     a SQLAlchemy session (`db`) into the request handlers. It ensures
     that the database session is correctly opened and closed.
 
+    With "DB_ASYNC=true" the session is an `AsyncSession` of the 
+    asynchronous engine (see `database.aio`), otherwise a regular `Session` 
+    used on the threadpool.
+
+    With "DB_READ_YOUR_WRITES=true", the session of a client that wrote 
+    within the replication lag budget reads from the primary (see 
+    `database.routing.ReadYourWritesMiddleware`).
+
+    Args:
+        request (Request): The request, whose state tells whether to read 
+                           from the primary.
+
     Yields:
-        Session: SQLAlchemy database session.
+        Session | AsyncSession: SQLAlchemy database session.
     """
-    db = SessionLocal()
+    read_primary = getattr(request.state, "read_primary", False)
+    if dbAio.is_enabled():
+        async with dbAio.get_sessionmaker()() as db:
+            if read_primary:
+                pin_to_primary(db)
+            yield db
+        return
+    db = get_session_factory()()
+    if read_primary:
+        pin_to_primary(db)
     try:
         yield db
     finally:
-        db.close()
+        await run_in_threadpool(db.close)
+
+
+def get_sessionmaker():  # pragma: no cover
+    """Dependency function to provide the factory of database sessions.
+
+    Used by the endpoints that manage their session themselves, such as 
+    streamed responses, which are sent after the `get_db` session is closed.
+
+    Returns:
+        sessionmaker: The factory of synchronous database sessions.
+    """
+    return get_session_factory()
 
 
 @app.get("/")
@@ -62,28 +151,229 @@ def main():
     return "Hello, this message comes from the Fast API root endpoint!"
 
 
+def get_todo_filters(label_prefix: Optional[str] = None, search: Optional[str] = None,
+                     min_quantity: Optional[int] = None, max_quantity: Optional[int] = None):
+    """Dependency function reading the filters of a listing of todo items.
+
+    Args:
+        label_prefix (str, optional): Only list the labels starting with this text.
+        search (str, optional): Only list the labels matching this full-text search.
+        min_quantity (int, optional): The lowest quantity to list.
+        max_quantity (int, optional): The highest quantity to list.
+
+    Returns:
+        todoSchemas.TodoFilters: The validated filters.
+
+    Raises:
+        HTTPException: With a 422 status if a filter is invalid.
+    """
+    try:
+        return todoSchemas.TodoFilters(label_prefix=label_prefix, search=search,
+                                       min_quantity=min_quantity, max_quantity=max_quantity)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(
+            e.errors(include_url=False, include_context=False))) from e
+
+
 @app.get("/todos", response_model=todoSchemas.TodosResponse)
-def get_todos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_todos(request: Request, skip: int = 0, limit: int = 100,
+                    cursor: Optional[str] = None, after_id: Optional[int] = None,
+                    order_by: Optional[Literal["id", "label", "quantity",
+                                               "-id", "-label", "-quantity"]] = None,
+                    include_total: bool = True,
+                    filters: todoSchemas.TodoFilters = Depends(get_todo_filters),
+                    if_none_match: Optional[str] = Header(None),
+                    db: Session = Depends(get_db)):
     """Fetches a paginated list of todo items.
 
     Queries the database to retrieve todo items with optional pagination
     using `skip` and `limit` query parameters. Returns the total number
     of todos and a list of todo items.
 
+    Passing `cursor`, `after_id` or `order_by` switches to keyset pagination: 
+    pages are sorted by `order_by` (default "id", "-" prefix for a descending 
+    order) and each one starts after the last item of the previous one, so 
+    deep pages are as fast as the first. The response then holds the 
+    `next_cursor` to pass back for the next page.
+
+    The `label_prefix`, `search`, `min_quantity` and `max_quantity` filters 
+    restrict the listing to the matching todo items, using the indexes of 
+    the `todos` table; filtered listings are sorted by the filtered column 
+    unless `order_by` says otherwise, and their total is counted exactly.
+
+    The total is computed with the strategy set by "TODO_COUNT_STRATEGY" 
+    (see `database.counting`), and skipped with `include_total=false`.
+
+    Only the `id`, `label` and `quantity` columns are read, as plain rows, and 
+    encoded straight to JSON: no ORM instance is built and the response model 
+    is not validated again (it still documents the response).
+
+    With "TODO_PAGE_CACHE_TTL", the responses are cached per query string and 
+    table version, and invalidated by every write (see `database.page_cache`).
+
+    The response carries the version of the todos table as its ETag (see 
+    `database.versioning`): a request whose `If-None-Match` header holds the 
+    current version is answered with `304 Not Modified` before the page is 
+    read or encoded.
+
     Args:
+        request (Request): The request, whose query string keys the page cache.
         skip (int, optional): The number of todo items to skip (default 0).
         limit (int, optional): The maximum number of todo items to return (default 100).
+        cursor (str, optional): The `next_cursor` of the previous page.
+        after_id (int, optional): Return the todos with an ID greater than this one.
+        order_by (str, optional): Sort by "id", "label" or "quantity" in keyset 
+                                  mode, or by "-id", "-label" or "-quantity" 
+                                  in descending order.
+        include_total (bool, optional): Whether to count the todo items (default True).
+        filters (todoSchemas.TodoFilters, optional): The filters injected via 
+                                                     `Depends(get_todo_filters)`.
+        if_none_match (str, optional): The ETags of the copies held by the client.
+        db (Session, optional): The database session injected via `Depends(get_db)`.
+
+    Returns:
+        todoSchemas.TodosResponse: The total count, the list of todos and the 
+        cursor of the next page.
+
+    Raises:
+        HTTPException: With a 400 status if the cursor is invalid, combined 
+                       with `skip`, or if `limit` is lower than 1.
+    """
+    version = await dbAio.get_todos_version(db)
+    headers = _todos_version_headers(version)
+    if _etag_matches(if_none_match, headers):
+        return Response(status_code=304, headers=headers)
+
+    cache = page_cache.get_page_cache()
+    if cache.enabled:
+        # Without a version, pages still expire and are invalidated by writes.
+        key = f"{'-' if version is None else version}:{cache.key(request.query_params)}"
+        content, generation = await cache.get(key)
+        if content is None:
+            content = await _get_todos_content(db, skip, limit, cursor, after_id, order_by,
+                                               include_total, filters)
+            await cache.set(key, content, generation)
+    else:
+        content = await _get_todos_content(db, skip, limit, cursor, after_id, order_by,
+                                           include_total, filters)
+    return Response(content, media_type="application/json", headers=headers)
+
+
+async def _get_todos_content(db, skip, limit, cursor, after_id, order_by, include_total,
+                             filters):
+    """Reads a page of todo items and encodes it as a `TodosResponse` JSON document."""
+    if cursor is None and after_id is None and order_by is None:
+        total_count, rows = await dbAio.get_todo_rows(
+            db, skip=skip, limit=limit, include_total=include_total, filters=filters)
+        return serializers.dump_todos_response(total_count, rows)
+
+    if skip:
+        raise HTTPException(status_code=400, detail="skip cannot be combined with a cursor")
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    try:
+        rows, next_cursor = await dbAio.get_todos_page(
+            db, limit=limit, cursor=cursor, after_id=after_id, order_by=order_by,
+            filters=filters)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    total_count = await dbAio.count_todos(db, filters=filters) if include_total else None
+    return serializers.dump_todos_response(total_count, rows, next_cursor)
+
+
+@app.get("/todos/export", response_class=StreamingResponse,
+         responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}})
+async def export_todos(export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+                       session_factory=Depends(get_sessionmaker)):
+    """Streams every todo item, as NDJSON or CSV.
+
+    The rows are read in ID order from a server-side cursor, one batch of 
+    "TODO_EXPORT_BATCH_SIZE" rows at a time, and each batch is encoded and 
+    sent before the next one is fetched: memory use does not depend on the 
+    size of the table, and there is no count nor offset scan. The export has 
+    its own database session, held until the last row is sent.
+
+    Args:
+        export_format (str, optional): "ndjson" (default, one JSON todo item 
+                                       per line) or "csv" (with a header line), 
+                                       passed as `format`.
+        session_factory (sessionmaker, optional): The factory of database sessions 
+                                                  injected via `Depends(get_sessionmaker)`.
+
+    Returns:
+        StreamingResponse: The todo items, as an attachment.
+    """
+    return StreamingResponse(
+        _export_chunks(session_factory, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="todos.{export_format}"'})
+
+
+def _export_chunks(session_factory, export_format):
+    """Yields the encoded batches of the export, on a session of its own."""
+    if export_format == "csv":
+        yield serializers.dump_todos_csv([], header=True)
+    dump = serializers.dump_todos_csv if export_format == "csv" else serializers.dump_todos_ndjson
+    with session_factory() as db:
+        for rows in crud.iter_todo_rows(db):
+            yield dump(rows)
+
+
+@app.get("/todos/{todo_id}", response_model=todoSchemas.Todo,
+         responses={304: {"description": "Not modified since the `If-None-Match` ETag"}})
+async def get_todo(todo_id: int, if_none_match: Optional[str] = Header(None),
+                   db: Session = Depends(get_db)):
+    """Fetches a specific todo item by ID.
+
+    Like `GET /todos`, the response carries the version of the todos table 
+    as its ETag, and a request whose `If-None-Match` header holds the current 
+    version is answered with `304 Not Modified` without encoding the todo 
+    item. The item is still looked up (by primary key), since the ETag is 
+    shared by every item: a missing one is a 404 whatever the header.
+
+    Args:
+        todo_id (int): The unique identifier of the todo item.
+        if_none_match (str, optional): The ETags of the copies held by the client.
         db (Session, optional): The database session injected via `Depends(get_db)`.
 
     Returns:
-        todoSchemas.TodosResponse: The total count and the list of todos.
+        todoSchemas.Todo: The todo item.
+
+    Raises:
+        HTTPException: If no todo item with the specified ID is found,
+                       raises a 404 Not Found error.
     """
-    total_count, todos = crud.get_todos(db=db, skip=skip, limit=limit)
-    return {"total": total_count, "todos": todos}
+    headers = _todos_version_headers(await dbAio.get_todos_version(db))
+    row = await dbAio.get_todo_row(db, todo_id=todo_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    if _etag_matches(if_none_match, headers):
+        return Response(status_code=304, headers=headers)
+    return Response(serializers.dump_todo(row), media_type="application/json", headers=headers)
+
+
+def _todos_version_headers(version):
+    """Returns the caching headers of a response built from the given version 
+    of the todos table: its ETag, and `no-cache` so that clients revalidate 
+    their copy before using it."""
+    if version is None:
+        return {}
+    return {"ETag": f'"todos-{version:x}"', "Cache-Control": "no-cache"}
+
+
+def _etag_matches(if_none_match, headers):
+    """Tells whether an `If-None-Match` header matches the ETag of the headers 
+    (weak comparison, as required for `If-None-Match`)."""
+    etag = headers.get("ETag")
+    if not if_none_match or etag is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
 
 
 @app.post("/todos", response_model=todoSchemas.Todo)
-def post_todo(todo: todoSchemas.TodoCreate, db: Session = Depends(get_db)):
+async def post_todo(todo: todoSchemas.TodoCreate, db: Session = Depends(get_db)):
     """Creates a new todo item.
 
     Accepts a `TodoCreate` schema as input, validates it, and persists the
@@ -97,19 +387,247 @@ def post_todo(todo: todoSchemas.TodoCreate, db: Session = Depends(get_db)):
     Returns:
         todoSchemas.Todo: The newly created todo item.
     """
-    return crud.create_todo(db=db, todo=todo)
+    try:
+        return await dbAio.create_todo(db, todo=todo)
+    finally:
+        await page_cache.get_page_cache().invalidate()
+
+
+@app.post("/todos/bulk", response_model=todoSchemas.BulkCreateResponse,
+          openapi_extra={"requestBody": {"required": True, "content": {"application/json": {
+              "schema": {"type": "array", "items": {"$ref": "#/components/schemas/TodoCreate"}}}}}})
+async def post_todos_bulk(request: Request,
+                          chunk_size: Optional[int] = Query(None, ge=1, le=50000),
+                          db: Session = Depends(get_db)):
+    """Creates many todo items at once.
+
+    The JSON array is read as it arrives: every `chunk_size` items (default 
+    "TODO_BULK_CHUNK_SIZE") are validated and inserted with multi-row 
+    `INSERT` statements in one transaction, so memory use does not depend on 
+    the size of the array.
+
+    Args:
+        request (Request): The request, whose JSON array body is streamed.
+        chunk_size (int, optional): The number of items per transaction.
+        db (Session, optional): The database session injected via `Depends(get_db)`.
+
+    Returns:
+        todoSchemas.BulkCreateResponse: The number of todo items created.
+
+    Raises:
+        HTTPException: With a 422 status if the body is not a JSON array or 
+                       an item is not a valid todo item (the chunks before it 
+                       are kept, see `inserted` in the detail), or a 413 status 
+                       if an item is too large.
+    """
+    chunk_size = chunk_size or crud.get_bulk_chunk_size()
+    inserted = 0
+    first_item = 0
+    items = []
+    try:
+        async for item in _json_array_items(request.stream()):
+            items.append(item)
+            if len(items) >= chunk_size:
+                inserted += await dbAio.run(db, _create_todo_items, items, first_item, inserted)
+                first_item += len(items)
+                items = []
+        if items:
+            inserted += await dbAio.run(db, _create_todo_items, items, first_item, inserted)
+    finally:
+        if inserted:
+            await page_cache.get_page_cache().invalidate()
+    return {"inserted": inserted}
+
+
+async def _json_array_items(stream):
+    """Decodes the items of a JSON array from a stream of `bytes` chunks, each 
+    one as soon as it is complete. An item longer than `MAX_ITEM_SIZE` 
+    characters is rejected as soon as it is, without reading further."""
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    text, position, expected = "", 0, "["
+    count, done = 0, False
+    stream = aiter(stream)
+    while not done:
+        try:
+            chunk = await anext(stream)
+        except StopAsyncIteration:
+            chunk, done = b"", True
+        try:
+            text = text[position:] + utf8.decode(chunk, final=done)
+        except UnicodeDecodeError as e:
+            raise HTTPException(status_code=422, detail="Invalid UTF-8 in the JSON body") from e
+        position = 0
+        while True:
+            position = JSON_WHITESPACE.match(text, position).end()
+            if position == len(text):
+                break
+            char = text[position]
+            if expected in ("[", ",", "end"):
+                if char not in {"[": "[", ",": ",]", "end": ""}[expected]:
+                    raise HTTPException(status_code=422, detail="The body must be a JSON array")
+                position += 1
+                expected = {"[": "first item", ",": "item", "]": "end"}[char]
+            elif expected == "first item" and char == "]":
+                position, expected = position + 1, "end"
+            else:
+                try:
+                    item, end = decoder.raw_decode(text, position)
+                except json.JSONDecodeError as e:
+                    if len(text) - position > MAX_ITEM_SIZE:
+                        raise HTTPException(status_code=413, detail="JSON item too large") from e
+                    if done:
+                        raise HTTPException(status_code=422, detail={
+                            "item": count, "error": f"Invalid JSON: {e.msg}"}) from e
+                    break
+                if end - position > MAX_ITEM_SIZE:
+                    raise HTTPException(status_code=413, detail="JSON item too large")
+                if end == len(text) and not done:
+                    break  # A number or literal may go on in the next chunk.
+                position, expected, count = end, ",", count + 1
+                yield item
+    if expected != "end":
+        raise HTTPException(status_code=422, detail="The body must be a JSON array")
+
+
+def _create_todo_items(db, items, first_item, inserted):
+    """Validates decoded JSON items into todo items and inserts them in one transaction.
+
+    Returns the number of todo items created.
+    """
+    todos = []
+    for number, item in enumerate(items, start=first_item):
+        try:
+            todos.append(todoSchemas.TodoCreate.model_validate(item).model_dump())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail={
+                "item": number,
+                "errors": jsonable_encoder(e.errors(include_url=False, include_context=False)),
+                "inserted": inserted,
+            }) from e
+    return crud.create_todos(db=db, todos=todos, chunk_size=len(todos) or 1)
+
+
+@app.post("/todos/import", response_model=todoSchemas.BulkCreateResponse)
+async def post_todos_import(request: Request,
+                            chunk_size: Optional[int] = Query(None, ge=1, le=50000),
+                            db: Session = Depends(get_db)):
+    """Imports todo items from a streamed NDJSON body.
+
+    Each line of the body is a JSON todo item (`{"label": ..., "quantity": ...}`). 
+    The body is read as it arrives: every `chunk_size` lines (default 
+    "TODO_BULK_CHUNK_SIZE") are validated and inserted in one transaction on the 
+    database (see `database.aio.run`), so memory use does not depend on the size of the import.
+
+    Args:
+        request (Request): The request, whose body is streamed.
+        chunk_size (int, optional): The number of items per transaction.
+        db (Session, optional): The database session injected via `Depends(get_db)`.
+
+    Returns:
+        todoSchemas.BulkCreateResponse: The number of todo items created.
+
+    Raises:
+        HTTPException: With a 422 status if a line is not a valid todo item 
+                       (the chunks before it are kept, see `inserted` in the 
+                       detail), or a 413 status if a line is too long.
+    """
+    chunk_size = chunk_size or crud.get_bulk_chunk_size()
+    inserted = 0
+    first_line = 1
+    lines = []
+    try:
+        async for line in _ndjson_lines(request.stream()):
+            lines.append(line)
+            if len(lines) >= chunk_size:
+                inserted += await dbAio.run(db, _import_todos, lines, first_line, inserted)
+                first_line += len(lines)
+                lines = []
+        if lines:
+            inserted += await dbAio.run(db, _import_todos, lines, first_line, inserted)
+    finally:
+        if inserted:
+            await page_cache.get_page_cache().invalidate()
+    return {"inserted": inserted}
+
+
+async def _ndjson_lines(stream):
+    """Splits a stream of `bytes` chunks into lines, blank lines included so 
+    that line numbers match the body."""
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *complete, buffer = buffer.split(b"\n")
+        if len(buffer) > MAX_ITEM_SIZE or any(len(line) > MAX_ITEM_SIZE for line in complete):
+            raise HTTPException(status_code=413, detail="NDJSON line too long")
+        for line in complete:
+            yield line
+    if buffer:
+        yield buffer
+
+
+def _import_todos(db, lines, first_line, inserted):
+    """Validates NDJSON lines into todo items and inserts them in one transaction.
+
+    Blank lines are skipped. Returns the number of todo items created.
+    """
+    todos = []
+    for number, line in enumerate(lines, start=first_line):
+        if not line.strip():
+            continue
+        try:
+            todos.append(todoSchemas.TodoCreate.model_validate_json(line).model_dump())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail={
+                "line": number,
+                "errors": jsonable_encoder(e.errors(include_url=False, include_context=False)),
+                "inserted": inserted,
+            }) from e
+    return crud.create_todos(db=db, todos=todos, chunk_size=len(todos) or 1)
+
+
+@app.delete("/todos", response_model=todoSchemas.TodosDeleteResponse)
+async def delete_todos(request: todoSchemas.TodosDeleteRequest,
+                       chunk_size: Optional[int] = Query(None, ge=1, le=50000),
+                       db: Session = Depends(get_db)):
+    """Deletes several todo items at once.
+
+    The JSON body selects the todo items by `ids`, by ID range (`min_id`, 
+    `max_id`) and/or by `label`/`quantity`; the criteria are combined with AND. 
+    The todo items are deleted with `DELETE ... WHERE` statements, chunked 
+    every `chunk_size` IDs (default "TODO_BULK_CHUNK_SIZE") for lists and ranges.
 
+    Args:
+        request (todoSchemas.TodosDeleteRequest): The selection of todo items.
+        chunk_size (int, optional): The number of IDs per statement.
+        db (Session, optional): The database session injected via `Depends(get_db)`.
 
-@app.delete("/todos/{todo_id}", response_model=todoSchemas.Todo)
-def delete_todo(todo_id: int, db: Session = Depends(get_db)):
+    Returns:
+        todoSchemas.TodosDeleteResponse: The number of todo items deleted.
+    """
+    try:
+        deleted = await dbAio.delete_todos(db, chunk_size=chunk_size, **request.model_dump())
+    finally:
+        await page_cache.get_page_cache().invalidate()
+    return {"deleted": deleted}
+
+
+@app.delete("/todos/{todo_id}", response_model=todoSchemas.Todo,
+            responses={204: {"description": "Todo deleted (`echo=false`)"}})
+async def delete_todo(todo_id: int, echo: bool = True, db: Session = Depends(get_db)):
     """Deletes a specific todo item by ID.
 
     Deletes the todo item corresponding to the provided `todo_id` from
     the database. If no todo is found with the given ID, a 404 HTTP
     exception is raised.
 
+    With `echo=false`, the deleted todo item is not returned: the row is 
+    deleted with a single `DELETE` statement, without selecting it first, 
+    and the response is an empty `204 No Content`.
+
     Args:
         todo_id (int): The unique identifier of the todo item to delete.
+        echo (bool, optional): Whether to return the deleted todo item (default True).
         db (Session, optional): The database session injected via `Depends(get_db)`.
 
     Returns:
@@ -119,10 +637,27 @@ def delete_todo(todo_id: int, db: Session = Depends(get_db)):
         HTTPException: If no todo item with the specified ID is found,
                        raises a 404 Not Found error.
     """
+    if not echo:
+        if not await dbAio.delete_todos(db, ids=[todo_id]):
+            raise HTTPException(status_code=404, detail="Todo not found")
+        await page_cache.get_page_cache().invalidate()
+        return Response(status_code=204)
     try:
-        return crud.delete_todo(db=db, todo_id=todo_id)
+        deleted = await dbAio.delete_todo(db, todo_id=todo_id)
     except NoResultFound as e:
         raise HTTPException(status_code=404, detail="Todo not found") from e
+    await page_cache.get_page_cache().invalidate()
+    return deleted
+
+
+def _storage_errors():
+    """Returns the exceptions of a failed storage operation: `StorageError`,
+    and the `ClientError` of botocore once the S3 backend has loaded it.
+    botocore is not imported here, so that the application starts without it."""
+    botocore_exceptions = sys.modules.get("botocore.exceptions")
+    if botocore_exceptions is None:
+        return (StorageError,)
+    return (botocore_exceptions.ClientError, StorageError)
 
 
 @app.post("/objects")
@@ -130,6 +665,9 @@ async def post_object(file: UploadFile = File(...)):
     """
     Upload a file to the S3 bucket.
 
+    The file is streamed to the bucket in parts (S3 multipart upload or GCS 
+    resumable upload) instead of being read into memory at once.
+
     **Args**:
     - file: The file to be uploaded (received as multipart/form-data).
 
@@ -140,8 +678,8 @@ async def post_object(file: UploadFile = File(...)):
     - HTTPException: If there is an issue if the upload fails or reading the file.
     """
     try:
-        file_content = await file.read()
-        path = actions.put_object(name=file.filename, content=file_content)
+        path = await storageAio.upload_object(name=file.filename, fileobj=file.file,
+                                              content_type=file.content_type)
         return {"message": f"File '{file.filename}' uploaded successfully to S3 bucket ({path})."}
     except Exception as e:
         raise HTTPException(
@@ -149,25 +687,70 @@ async def post_object(file: UploadFile = File(...)):
 
 
 @app.get("/objects", response_model=storageSchemas.ListFilesResponse)
-def get_objects():
+async def get_objects(limit: int = Query(1000, ge=1, le=1000), cursor: Optional[str] = None,
+                      prefix: Optional[str] = None):
     """
-    List all files (names and paths) in the S3 bucket.
+    List one page of files (names and paths) in the S3 bucket.
+
+    Pages are chained with the returned `next_cursor`, so buckets of any size 
+    can be listed with one backend call and bounded memory per page.
+
+    The page is encoded straight to JSON (see `storage.serializers`): the 
+    response model documents the response but is not validated again.
+
+    **Args**:
+    - limit: The maximum number of files to return (1 to 1000, default 1000).
+    - cursor: The `next_cursor` of the previous page (optional).
+    - prefix: Only list the files whose name starts with this prefix (optional).
 
     **Returns**:
-    - JSON object containing a list of files with their names and S3 paths.
+    - JSON object containing a list of files with their names and S3 paths, 
+      and the cursor of the next page (null on the last page).
 
     **Raises**:
     - HTTPException: If there is an issue with listing the files in the bucket.
     """
     try:
-        return {"files": actions.list_objects()}
-    except ClientError as e:
+        files, next_cursor = await storageAio.list_objects(
+            prefix=prefix, limit=limit, cursor=cursor)
+        return Response(storageSerializers.dump_list_files_response(files, next_cursor),
+                        media_type="application/json")
+    except _storage_errors() as e:
         raise HTTPException(
             status_code=500, detail=f"Error listing files: {str(e)}") from e
 
 
+@app.delete("/objects", response_model=storageSchemas.BatchDeleteResponse)
+async def delete_objects(request: storageSchemas.BatchDeleteRequest):
+    """
+    Delete several files from the S3 bucket at once.
+
+    The files are given by name, or selected by prefix. They are deleted with 
+    bulk requests (S3 `DeleteObjects`, GCS batch requests), so thousands of 
+    files cost a handful of backend calls.
+
+    **Args**:
+    - request: JSON body with either `names` (list of file names) or `prefix`.
+
+    **Returns**:
+    - JSON with the number of deleted and failed files, and the outcome for 
+      each file.
+
+    **Raises**:
+    - HTTPException: If there is an issue deleting the files.
+    """
+    try:
+        results = await storageAio.delete_objects(names=request.names, prefix=request.prefix)
+    except _storage_errors() as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error deleting files: {str(e)}") from e
+
+    deleted = sum(1 for result in results if result["deleted"])
+    return {"deleted": deleted, "failed": len(results) - deleted, "results": results}
+
+
 @app.delete("/objects/{file_name}", response_model=storageSchemas.DeleteResponse)
-def delet_object(file_name: str):
+async def delet_object(file_name: str):
     """
     Delete a file from the S3 bucket.
 
@@ -181,40 +764,115 @@ def delet_object(file_name: str):
     - HTTPException: If there is an issue deleting the file.
     """
     try:
-        path = actions.delete_object(name=file_name)
+        path = await storageAio.delete_object(name=file_name)
         return {"message": f"File '{file_name}' deleted successfully from S3 bucket ({path})."}
-    except ClientError as e:
+    except _storage_errors() as e:
         raise HTTPException(
             status_code=500, detail=f"Error deleting files: {str(e)}") from e
 
 
 @app.get("/objects/{file_name}")
-async def get_object(file_name: str):
+async def get_object(file_name: str, range_header: Optional[str] = Header(None, alias="Range")):
     """
     Download a file from the S3 bucket.
 
+    The content is streamed from the bucket to the client chunk by chunk, with 
+    the `Content-Length` and `Content-Type` of the stored object. Reads from the 
+    bucket run on the storage thread pool, never on the event loop.
+
+    With the local filesystem backend, the file is served directly from disk. 
+    When the disk cache is enabled ("OBJECT_CACHE_DIR"), hot files are served 
+    from their cached copy after an ETag check, and filled while streaming.
+
+    A `Range` header (single or multiple byte ranges) is answered with a 
+    `206 Partial Content` response, and only the requested bytes are read 
+    from the bucket. Several ranges are sent as `multipart/byteranges`.
+
     **Args**:
     - file_name: The name of the file (S3 object key) to be downloaded.
+    - Range (header, optional): The byte ranges to download, e.g. `bytes=0-1023`.
 
     **Returns**:
-    - A StreamingResponse containing the file content.
+    - A StreamingResponse containing the file content, or the requested ranges.
 
     **Raises**:
-    - HTTPException: If there is an issue retrieving the file.
+    - HTTPException: If there is an issue retrieving the file, or with a 416 
+      status if no requested range overlaps the file.
     """
+    headers = {
+        "Content-Disposition": f"attachment; filename={file_name}",
+        "Accept-Ranges": "bytes",
+    }
     try:
-        file_content = actions.get_object(name=file_name)
+        if range_header is not None:
+            info = await storageAio.stat_object(name=file_name)
+            size = info["content_length"]
+            try:
+                byte_ranges = ranges.parse_range_header(range_header, size)
+            except ranges.RangeNotSatisfiable as e:
+                raise HTTPException(
+                    status_code=416, detail="Requested range not satisfiable",
+                    headers={"Content-Range": f"bytes */{size}"}) from e
+            if byte_ranges:
+                return await _partial_object_response(file_name, info, byte_ranges, headers)
+
+        local_path = actions.get_local_path(name=file_name)
+        if local_path is not None:
+            info = await storageAio.stat_object(name=file_name)
+            return FileResponse(local_path, media_type=info["content_type"], headers=headers)
+
+        cached = await storageAio.get_cached_object(name=file_name)
+        if cached is not None:
+            info, chunks = cached
+            headers["Content-Length"] = str(info["content_length"])
+            return StreamingResponse(chunks, media_type=info["content_type"], headers=headers)
+
+        info, chunks = await storageAio.stream_object(name=file_name)
+        headers["Content-Length"] = str(info["content_length"])
 
         return StreamingResponse(
-            io.BytesIO(file_content),
-            media_type='application/octet-stream',
-            headers={"Content-Disposition": f"attachment; filename={file_name}"}
+            chunks,
+            media_type=info["content_type"],
+            headers=headers
         )
-    except ClientError as e:
+    except _storage_errors() as e:
         raise HTTPException(
             status_code=500, detail=f"Error downloading file: {str(e)}") from e
 
 
+async def _partial_object_response(file_name, info, byte_ranges, headers):
+    """Build the `206 Partial Content` response for the requested byte ranges.
+
+    Args:
+        file_name (str): The name of the file (object key) to be downloaded.
+        info (dict): The object metadata returned by `actions.stat_object`.
+        byte_ranges (list): The `(start, end)` ranges returned by
+                            `ranges.parse_range_header`.
+        headers (dict): The headers shared by every download response.
+
+    Returns:
+        StreamingResponse: A single range response, or a `multipart/byteranges` one.
+    """
+    size = info["content_length"]
+
+    if len(byte_ranges) == 1:
+        start, end = byte_ranges[0]
+        chunks = await storageAio.stream_object_range(name=file_name, start=start, end=end)
+        headers["Content-Range"] = ranges.content_range(start, end, size)
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            chunks, status_code=206, media_type=info["content_type"], headers=headers)
+
+    def open_range(start, end):
+        return actions.stream_object_range(name=file_name, start=start, end=end)
+
+    media_type, length, body = ranges.multipart_byteranges(
+        byte_ranges, size, info["content_type"], open_range)
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(storageAio.iterate(body), status_code=206,
+                             media_type=media_type, headers=headers)
+
+
 @app.get("/bucket-type")
 def get_bucket_type_endpoint():
     """
@@ -238,3 +896,38 @@ def get_bucket_type_endpoint():
         raise HTTPException(
             status_code=500, detail=f"Error retrieving bucket type: {str(e)}"
         ) from e
+
+
+@app.get("/metrics")
+def get_metrics():
+    """
+    Retrieve the counters of the in-process caches and of the database pool.
+
+    **Returns**:
+    - JSON object with the hits, misses, hit ratio and size of each storage 
+      cache, and the live statistics of the database connection pool (and of 
+      the asynchronous one as "async_pool", once built with "DB_ASYNC=true"), 
+      and the state of each read replica as "replicas" when some are configured. 
+      The counters of the `GET /todos` response cache are under "page_cache".
+
+    Example:
+        {
+            "storage": {
+                "list_cache": {"hits": 42, "misses": 3, "hit_ratio": 0.93, "size": 2}
+            },
+            "database": {
+                "pool": {"size": 10, "checked_in": 8, "checked_out": 2, "overflow": 0,
+                         "checkouts": 1200, "timeouts": 0,
+                         "wait_time_total": 0.84, "wait_time_max": 0.02}
+            }
+        }
+    """
+    database = {"pool": pool_stats(get_engine()),
+                "page_cache": page_cache.get_page_cache().stats()}
+    replicas = get_replicas()
+    if replicas:
+        database["replicas"] = replicas.stats()
+    async_pool = dbAio.get_pool_stats()
+    if async_pool is not None:
+        database["async_pool"] = async_pool
+    return {"storage": actions.get_cache_stats(), "database": database}
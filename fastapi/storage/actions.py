@@ -1,39 +1,203 @@
 """
-This module provides utility functions for interacting with an S3 bucket 
-using the `boto3` library.
+This module provides utility functions for interacting with the object 
+storage bucket (S3, GCS or the local filesystem).
+
+The storage backend is selected once, from the "OBJECT_BUCKET_TYPE" and 
+"OBJECT_BUCKET" environment variables, and shared by every call.
 """
 import os
-import boto3
-from google.cloud import storage
+import tempfile
+import threading
+from . import clients
+from .cache import DiskCache, ListingCache
+from .backends import create_backend
+from .backends.base import DEFAULT_CONTENT_TYPE, S3_MIN_PART_SIZE  # pylint: disable=unused-import
+
+DEFAULT_UPLOAD_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_UPLOAD_CONCURRENCY = 4
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DEFAULT_LIST_LIMIT = 1000
+DEFAULT_LOCAL_ROOT = "./objects"
+DEFAULT_LIST_CACHE_TTL = 5
+DEFAULT_LIST_CACHE_MAX_ENTRIES = 1024
+DEFAULT_OBJECT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_OBJECT_CACHE_REVALIDATE_AFTER = 0
+
+_backend = None
+_backend_lock = threading.Lock()
+_list_cache = None
+_object_cache = None
+_object_cache_built = False
 
 
 def get_s3_client():
     """
-    Create and return an S3 client using the `boto3` library.
+    Return the shared S3 client of the process, built with the `boto3` library.
 
     This client is used to interact with the S3 service, allowing 
     operations such as uploading, downloading, listing, and deleting objects 
-    from the bucket.
+    from the bucket. It is built once and reused, see `storage.clients`.
 
     Returns:
         boto3.S3.Client: A low-level client representing Amazon Simple Storage Service (S3).
     """
-    return boto3.client('s3')
+    return clients.get_client("S3")
 
 
 def get_gcs_client():
     """
-    Create and return a Google Cloud Storage (GCS) client using the 
-    `google.cloud.storage` library.
+    Return the shared Google Cloud Storage (GCS) client of the process, built 
+    with the `google.cloud.storage` library.
 
     This client is used to interact with GCS, allowing operations 
     such as uploading, downloading, listing, and deleting objects from 
-    the bucket.
+    the bucket. It is built once and reused, see `storage.clients`.
 
     Returns:
         google.cloud.storage.Client: A GCS client instance.
     """
-    return storage.Client()
+    return clients.get_client("GCS")
+
+
+def get_backend():
+    """
+    Return the storage backend of the process, building it on first use.
+
+    The backend type comes from "OBJECT_BUCKET_TYPE" ("S3", "GCS" or "LOCAL"), 
+    the bucket from "OBJECT_BUCKET", and the directory holding the buckets of 
+    the local backend from "OBJECT_LOCAL_ROOT" (default "./objects").
+
+    Returns:
+        storage.backends.StorageBackend: The shared backend instance.
+    """
+    global _backend  # pylint: disable=global-statement
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(
+                    get_bucket_type(), get_bucket(), clients.get_client,
+                    local_root=os.getenv("OBJECT_LOCAL_ROOT", DEFAULT_LOCAL_ROOT))
+    return _backend
+
+
+def init_backend():
+    """
+    Build the storage backend (and its client) ahead of the first request, 
+    so that no request pays for it.
+
+    Returns:
+        storage.backends.StorageBackend: The shared backend instance.
+    """
+    return get_backend()
+
+
+def reset_backend():
+    """
+    Drop the storage backend and the shared clients, so that the next call 
+    builds them again from the environment (e.g. in tests).
+    """
+    global _backend, _list_cache  # pylint: disable=global-statement
+    with _backend_lock:
+        _backend = None
+        _list_cache = None
+    close_caches()
+    clients.reset_clients()
+
+
+def get_list_cache():
+    """
+    Return the listing cache of the process, building it on first use.
+
+    The cache lifetime comes from "OBJECT_LIST_CACHE_TTL" (in seconds, default 5, 
+    0 disables the cache) and its size from "OBJECT_LIST_CACHE_MAX_ENTRIES" 
+    (default 1024 pages). The cache is local to the process: writes made by 
+    another worker or outside of the API become visible after at most the TTL.
+
+    Returns:
+        storage.cache.ListingCache: The shared listing cache.
+    """
+    global _list_cache  # pylint: disable=global-statement
+    if _list_cache is None:
+        with _backend_lock:
+            if _list_cache is None:
+                _list_cache = ListingCache(
+                    ttl=float(os.getenv("OBJECT_LIST_CACHE_TTL", str(DEFAULT_LIST_CACHE_TTL))),
+                    max_entries=int(os.getenv(
+                        "OBJECT_LIST_CACHE_MAX_ENTRIES", str(DEFAULT_LIST_CACHE_MAX_ENTRIES))))
+    return _list_cache
+
+
+def get_object_cache():
+    """
+    Return the disk cache of object contents of the process, building it on 
+    first use.
+
+    The cache is enabled by "OBJECT_CACHE_DIR": each process keeps its files 
+    in its own subdirectory of it, removed by `close_caches()`. The budget comes 
+    from "OBJECT_CACHE_MAX_BYTES" (default 1 GiB), and "OBJECT_CACHE_REVALIDATE_AFTER" 
+    is the number of seconds an entry is served before its ETag is checked 
+    against the bucket again (default 0, always check). The local backend 
+    is never cached, its objects already are files.
+
+    Returns:
+        storage.cache.DiskCache: The shared disk cache, or None if disabled.
+    """
+    global _object_cache, _object_cache_built  # pylint: disable=global-statement
+    if not _object_cache_built:
+        with _backend_lock:
+            if not _object_cache_built:
+                cache_dir = os.getenv("OBJECT_CACHE_DIR")
+                if cache_dir and get_bucket_type() != "LOCAL":
+                    os.makedirs(cache_dir, exist_ok=True)
+                    _object_cache = DiskCache(
+                        tempfile.mkdtemp(prefix="objects-", dir=cache_dir),
+                        max_bytes=int(os.getenv(
+                            "OBJECT_CACHE_MAX_BYTES", str(DEFAULT_OBJECT_CACHE_MAX_BYTES))),
+                        revalidate_after=float(os.getenv(
+                            "OBJECT_CACHE_REVALIDATE_AFTER",
+                            str(DEFAULT_OBJECT_CACHE_REVALIDATE_AFTER))))
+                _object_cache_built = True
+    return _object_cache
+
+
+def close_caches():
+    """
+    Drop the disk cache of object contents and remove its files.
+    """
+    global _object_cache, _object_cache_built  # pylint: disable=global-statement
+    with _backend_lock:
+        cache, _object_cache, _object_cache_built = _object_cache, None, False
+    if cache is not None:
+        cache.close()
+
+
+def get_cache_stats():
+    """
+    Return the hit/miss counters of the storage caches.
+
+    **Returns**:
+    - A dictionary with the counters of the listing cache under 'list_cache', 
+      and of the disk cache under 'object_cache' when it is enabled.
+    """
+    stats = {"list_cache": get_list_cache().stats()}
+    object_cache = get_object_cache()
+    if object_cache is not None:
+        stats["object_cache"] = object_cache.stats()
+    return stats
+
+
+def get_local_path(name):
+    """
+    Return the filesystem path of an object when the backend stores it on 
+    the local disk, so that it can be served directly from the file.
+
+    **Args**:
+    - name: The key (filename) of the object.
+
+    **Returns**:
+    - The path of the file, or None for remote backends.
+    """
+    return get_backend().local_path(name)
 
 
 def get_bucket():
@@ -55,49 +219,116 @@ def get_bucket_type():
     Retrieve the type of the object storage system from environment variables.
 
     This function accesses the environment variable "OBJECT_BUCKET_TYPE" to determine 
-    whether to use "S3" (default) or "GCS" for storage operations.
+    whether to use "S3" (default), "GCS" or "LOCAL" for storage operations.
 
     Returns:
-        str: The type of storage system, either "S3" or "GCS".
+        str: The type of storage system, either "S3", "GCS" or "LOCAL".
     """
     return os.getenv("OBJECT_BUCKET_TYPE", "S3")
 
 
-def list_objects():
+def get_upload_part_size():
+    """
+    Retrieve the part size used for streaming uploads from environment variables.
+
+    This function accesses the environment variable "OBJECT_UPLOAD_PART_SIZE" 
+    (in bytes). The value is raised to the S3 minimum multipart part size (5 MiB) 
+    if it is lower.
+
+    Returns:
+        int: The number of bytes read from the upload and sent per part.
+    """
+    part_size = int(os.getenv("OBJECT_UPLOAD_PART_SIZE", str(DEFAULT_UPLOAD_PART_SIZE)))
+    return max(part_size, S3_MIN_PART_SIZE)
+
+
+def get_upload_concurrency():
+    """
+    Retrieve the number of parts uploaded in parallel from environment variables.
+
+    This function accesses the environment variable "OBJECT_UPLOAD_CONCURRENCY".
+
+    Returns:
+        int: The maximum number of parts in flight for a single upload (at least 1).
     """
-    List all objects stored in the specified S3 bucket.
+    concurrency = int(os.getenv("OBJECT_UPLOAD_CONCURRENCY", str(DEFAULT_UPLOAD_CONCURRENCY)))
+    return max(concurrency, 1)
+
+
+def get_download_chunk_size():
+    """
+    Retrieve the chunk size used for streaming downloads from environment variables.
+
+    This function accesses the environment variable "OBJECT_DOWNLOAD_CHUNK_SIZE" 
+    (in bytes).
+
+    Returns:
+        int: The number of bytes read from the bucket and sent to the client at once.
+    """
+    return int(os.getenv("OBJECT_DOWNLOAD_CHUNK_SIZE", str(DEFAULT_DOWNLOAD_CHUNK_SIZE)))
+
+
+def list_objects(prefix=None, limit=None, cursor=None):
+    """
+    List one page of the objects stored in the specified S3 bucket.
+
+    Each call makes a single backend request (`list_objects_v2` on S3, one 
+    page of `list_blobs` on GCS), so memory use is bounded by `limit`. The 
+    returned cursor is the backend continuation/page token, and is passed 
+    back as-is to fetch the next page.
+
+    Pages are served from the listing cache (see `get_list_cache()`) for up to 
+    "OBJECT_LIST_CACHE_TTL" seconds. Writes made through this module invalidate 
+    the pages they affect, so a listing always sees the previous writes of the 
+    process.
+
+    **Args**:
+    - prefix: Only list the objects whose key starts with this prefix (optional).
+    - limit: The maximum number of objects to return (defaults to 1000, 
+      the S3 maximum).
+    - cursor: The `next_cursor` returned by the previous page (optional).
 
     **Returns**:
-    - A list of dictionaries, where each dictionary represents an object 
-      in the bucket with the following keys:
-        - 'name': The object key (filename) in the S3 bucket.
-        - 'path': The full S3 path to the object (s3://bucket_name/object_key).
+    - A tuple containing:
+        - A list of dictionaries, where each dictionary represents an object 
+          in the bucket with the following keys:
+            - 'name': The object key (filename) in the S3 bucket.
+            - 'path': The full S3 path to the object (s3://bucket_name/object_key).
+        - The cursor of the next page, or None if this is the last page.
 
     If no objects are found, an empty list is returned.
 
     **Example**:
     ```python
-    objects = list_objects()
-    for obj in objects:
-        print(obj["name"], obj["path"])
+    objects, cursor = list_objects(prefix="logs/", limit=100)
+    while cursor:
+        more_objects, cursor = list_objects(prefix="logs/", limit=100, cursor=cursor)
     ```
     """
-    bucket_name = get_bucket()
-    bucket_type = get_bucket_type()
-
-    if bucket_type == "GCS":
-        gcs_client = get_gcs_client()
-        bucket = gcs_client.bucket(bucket_name=bucket_name)
-        blobs = bucket.list_blobs()
-        return [{"name": blob.name, "path": f"gs://{bucket_name}/{blob.name}"} for blob in blobs]
-
-    s3_client = get_s3_client()
-    response = s3_client.list_objects(Bucket=bucket_name)
-    if "Contents" not in response:
-        return []
-
-    return [{"name": obj['Key'], "path": f"s3://{bucket_name}/{obj['Key']}"}
-            for obj in response['Contents']]
+    backend = get_backend()
+    limit = limit or DEFAULT_LIST_LIMIT
+    cache = get_list_cache()
+    if not cache.enabled:
+        return backend.list_objects(prefix=prefix, limit=limit, cursor=cursor)
+
+    key = (backend.bucket_name, prefix or "", limit, cursor)
+    page, generation = cache.get(key)
+    if page is None:
+        page = backend.list_objects(prefix=prefix, limit=limit, cursor=cursor)
+        cache.set(key, page, generation)
+    files, next_cursor = page
+    return list(files), next_cursor
+
+
+def _invalidate(name=None, prefix=None):
+    """
+    Drop the cached listing pages and contents affected by a write to `name` 
+    or to `prefix`.
+    """
+    get_list_cache().invalidate(get_backend().bucket_name, name=name, prefix=prefix)
+    object_cache = get_object_cache()
+    if object_cache is not None:
+        object_cache.invalidate(name=name, prefix=prefix)
 
 
 def put_object(name, content):
@@ -118,24 +349,55 @@ def put_object(name, content):
     print(f"File uploaded to: {s3_path}")
     ```
     """
-    bucket_name = get_bucket()
-    bucket_type = get_bucket_type()
+    try:
+        return get_backend().put_object(name, content)
+    finally:
+        _invalidate(name=name)
 
-    if bucket_type == "GCS":
-        gcs_client = get_gcs_client()
-        bucket = gcs_client.bucket(bucket_name=bucket_name)
-        blob = bucket.blob(name)
-        blob.upload_from_string(content)
-        return f"gs://{bucket_name}/{name}"
 
-    s3_client = get_s3_client()
-    s3_client.put_object(
-        Bucket=bucket_name,
-        Key=name,
-        Body=content
-    )
+def upload_object(name, fileobj, part_size=None, concurrency=None, content_type=None):
+    """
+    Stream a file-like object to the bucket without buffering it entirely in memory.
+
+    On S3 the content is sent as a multipart upload: parts of `part_size` bytes 
+    are read one after the other and uploaded by up to `concurrency` threads. 
+    If anything fails, the multipart upload is aborted so no orphan parts are 
+    left in the bucket. Content smaller than one part is sent with a single 
+    `put_object` call.
 
-    return f"s3://{bucket_name}/{name}"
+    On GCS the content is sent as a resumable upload in chunks of `part_size` 
+    bytes (rounded up to a multiple of 256 KiB). Resumable uploads are sequential, 
+    so `concurrency` is not used. On the local filesystem the content is 
+    copied to disk in chunks of `part_size` bytes.
+
+    Peak memory is bounded by `part_size * concurrency`, whatever the file size.
+
+    **Args**:
+    - name: The key (filename) to save the object under in the bucket.
+    - fileobj: A readable binary file-like object (e.g. `UploadFile.file`).
+    - part_size: The number of bytes per part (defaults to `get_upload_part_size()`).
+    - concurrency: The number of parts uploaded in parallel 
+      (defaults to `get_upload_concurrency()`).
+    - content_type: The MIME type stored with the object (optional).
+
+    **Returns**:
+    - A string representing the full path (s3://bucket_name/object_key) 
+      where the file was uploaded.
+
+    **Example**:
+    ```python
+    with open("big.bin", "rb") as fileobj:
+        s3_path = upload_object("big.bin", fileobj)
+    ```
+    """
+    try:
+        return get_backend().upload_object(
+            name, fileobj,
+            part_size=part_size or get_upload_part_size(),
+            concurrency=concurrency or get_upload_concurrency(),
+            content_type=content_type)
+    finally:
+        _invalidate(name=name)
 
 
 def delete_object(name):
@@ -155,23 +417,58 @@ def delete_object(name):
     print(f"File deleted from: {s3_path}")
     ```
     """
-    bucket_name = get_bucket()
-    bucket_type = get_bucket_type()
+    try:
+        return get_backend().delete_object(name)
+    finally:
+        _invalidate(name=name)
+
 
-    if bucket_type == "GCS":
-        gcs_client = get_gcs_client()
-        bucket = gcs_client.bucket(bucket_name=bucket_name)
-        blob = bucket.blob(name)
-        blob.delete()
-        return f"gs://{bucket_name}/{name}"
+def delete_objects(names=None, prefix=None):
+    """
+    Delete several objects (files) from the specified S3 bucket in bulk.
 
-    s3_client = get_s3_client()
-    s3_client.delete_object(
-        Bucket=bucket_name,
-        Key=name
-    )
+    The objects are either listed by name, or selected by key prefix (the 
+    matching keys are listed page by page and each page is deleted at once). 
+    S3 deletes up to 1000 keys per `delete_objects` request and GCS up to 100 
+    per batch request, so deleting 100k keys takes a few hundred backend calls.
+
+    **Args**:
+    - names: The keys (filenames) of the objects to delete.
+    - prefix: Delete every object whose key starts with this prefix.
 
-    return f"s3://{bucket_name}/{name}"
+    **Returns**:
+    - A list with one dictionary per object:
+        - 'name': The object key (filename).
+        - 'deleted': Whether the object was deleted.
+        - 'error': The reason of the failure, or None.
+
+    **Example**:
+    ```python
+    results = delete_objects(prefix="tmp/")
+    failed = [result["name"] for result in results if not result["deleted"]]
+    ```
+    """
+    backend = get_backend()
+    if names is not None:
+        names = list(names)
+        try:
+            return backend.delete_objects(names)
+        finally:
+            for name in names:
+                _invalidate(name=name)
+
+    results = []
+    cursor = None
+    try:
+        while True:
+            files, cursor = backend.list_objects(
+                prefix=prefix, limit=DEFAULT_LIST_LIMIT, cursor=cursor)
+            if files:
+                results.extend(backend.delete_objects([file["name"] for file in files]))
+            if not cursor:
+                return results
+    finally:
+        _invalidate(prefix=prefix or "")
 
 
 def get_object(name):
@@ -193,16 +490,144 @@ def get_object(name):
     print(file_content)
     ```
     """
-    bucket_name = get_bucket()
-    bucket_type = get_bucket_type()
+    if get_object_cache() is None:
+        return get_backend().get_object(name)
+
+    cached = get_cached_object(name)
+    if cached is not None:
+        return b"".join(cached[1])
+    _, chunks = stream_object(name)
+    return b"".join(chunks)
+
+
+def get_cached_object(name, chunk_size=None):
+    """
+    Return the copy of an object held by the disk cache, if it is up to date.
 
-    if bucket_type == "GCS":
-        gcs_client = get_gcs_client()
-        bucket = gcs_client.bucket(bucket_name=bucket_name)
-        blob = bucket.blob(name)
-        return blob.download_as_bytes()
+    The ETag of the object is checked against the bucket (a metadata request, 
+    no content is transferred) unless the entry was validated less than 
+    "OBJECT_CACHE_REVALIDATE_AFTER" seconds ago.
+
+    The cached file is opened before this function returns, so the copy can 
+    be read to the end even if the cache evicts it in the meantime.
+
+    **Args**:
+    - name: The key (filename) of the object.
+    - chunk_size: The number of bytes per chunk 
+      (defaults to `get_download_chunk_size()`).
+
+    **Returns**:
+    - A tuple with the object metadata (see `stat_object`) and an iterator of 
+      `bytes` chunks read from the cached file, or None if the cache is 
+      disabled or does not hold the object.
 
-    s3_client = get_s3_client()
+    **Raises**:
+    - ClientError: If there is an issue with retrieving the object metadata.
+    """
+    object_cache = get_object_cache()
+    if object_cache is None:
+        return None
+    cached = object_cache.lookup(name, get_backend().stat_object)
+    if cached is None:
+        return None
+    info, file = cached
+    return info, _read_chunks(file, chunk_size or get_download_chunk_size())
+
+
+def _read_chunks(file, chunk_size):
+    """
+    Yield the chunks of an open file, closing it at the end.
+    """
+    with file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+def stream_object(name, chunk_size=None):
+    """
+    Open an object (file) of the bucket for a chunked, streaming download.
 
-    response = s3_client.get_object(Bucket=bucket_name, Key=name)
-    return response['Body'].read()
+    The object metadata is fetched first, then its content is read lazily: 
+    nothing but the current chunk is held in memory, whatever the object size.
+    On S3 the chunks come from `StreamingBody.iter_chunks`, on GCS from a 
+    `blob.open("rb")` reader, and on the local filesystem from the file.
+    When the disk cache is enabled, the chunks are also written to it, so 
+    that the next download can use `get_cached_object`.
+
+    **Args**:
+    - name: The key (filename) of the object to retrieve from the bucket.
+    - chunk_size: The number of bytes per chunk 
+      (defaults to `get_download_chunk_size()`).
+
+    **Returns**:
+    - A tuple containing:
+        - A dictionary with the object metadata:
+            - 'content_length': The size of the object in bytes.
+            - 'content_type': The MIME type of the object.
+            - 'etag': The entity tag of the current version of the object.
+        - An iterator of `bytes` chunks with the object content.
+
+    **Raises**:
+    - ClientError: If there is an issue with retrieving the object.
+
+    **Example**:
+    ```python
+    info, chunks = stream_object("myfile.txt")
+    for chunk in chunks:
+        output.write(chunk)
+    ```
+    """
+    info, chunks = get_backend().stream_object(
+        name, chunk_size=chunk_size or get_download_chunk_size())
+    object_cache = get_object_cache()
+    if object_cache is not None:
+        chunks = object_cache.fill(name, info, chunks)
+    return info, chunks
+
+
+def stat_object(name):
+    """
+    Retrieve the metadata of an object (file) without downloading its content.
+
+    **Args**:
+    - name: The key (filename) of the object in the bucket.
+
+    **Returns**:
+    - A dictionary with the object metadata:
+        - 'content_length': The size of the object in bytes.
+        - 'content_type': The MIME type of the object.
+        - 'etag': The entity tag of the current version of the object.
+
+    **Raises**:
+    - ClientError: If there is an issue with retrieving the object metadata.
+    """
+    return get_backend().stat_object(name)
+
+
+def stream_object_range(name, start, end, chunk_size=None):
+    """
+    Stream a byte range of an object (file) of the bucket chunk by chunk.
+
+    Only the requested bytes are transferred from the bucket: S3 receives a 
+    `Range` header, and GCS downloads are bounded by `start`/`end`.
+
+    **Args**:
+    - name: The key (filename) of the object to retrieve from the bucket.
+    - start: The offset of the first byte to retrieve.
+    - end: The offset of the last byte to retrieve (inclusive).
+    - chunk_size: The number of bytes per chunk 
+      (defaults to `get_download_chunk_size()`).
+
+    **Returns**:
+    - An iterator of `bytes` chunks with the content of the range.
+
+    **Raises**:
+    - ClientError: If there is an issue with retrieving the object.
+
+    **Example**:
+    ```python
+    first_kilobyte = b"".join(stream_object_range("myfile.txt", 0, 1023))
+    ```
+    """
+    return get_backend().stream_object_range(
+        name, start, end, chunk_size=chunk_size or get_download_chunk_size())
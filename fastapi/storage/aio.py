@@ -0,0 +1,169 @@
+"""
+This module provides an asyncio API over `storage.actions`.
+
+The storage SDKs (`boto3`, `google.cloud.storage`) are blocking, so every call
+is run on a dedicated, bounded thread pool instead of the event loop. Async
+endpoints await these functions and keep serving other requests while a
+transfer is in flight. The pool is separate from the Starlette threadpool used
+by sync endpoints, so storage transfers cannot starve database requests.
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from . import actions
+
+DEFAULT_IO_THREADS = 32
+
+_executor = None
+_executor_lock = threading.Lock()
+_END = object()
+
+
+def get_io_threads():
+    """
+    Retrieve the size of the storage thread pool from environment variables.
+
+    This function accesses the environment variable "OBJECT_IO_THREADS".
+
+    Returns:
+        int: The maximum number of storage calls running at the same time.
+    """
+    return max(int(os.getenv("OBJECT_IO_THREADS", str(DEFAULT_IO_THREADS))), 1)
+
+
+def get_executor():
+    """
+    Return the storage thread pool, creating it on first use.
+
+    Returns:
+        ThreadPoolExecutor: The pool running the blocking storage calls.
+    """
+    global _executor  # pylint: disable=global-statement
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_io_threads(), thread_name_prefix="storage-io")
+    return _executor
+
+
+def shutdown():
+    """
+    Stop the storage thread pool, waiting for the running calls to finish.
+    """
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def run(func, *args, **kwargs):
+    """
+    Run a blocking function on the storage thread pool and await its result.
+
+    Args:
+        func (callable): The blocking function.
+        *args: Positional arguments of the function.
+        **kwargs: Keyword arguments of the function.
+
+    Returns:
+        The result of the function.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def iterate(iterator):
+    """
+    Consume a blocking iterator of chunks from the storage thread pool.
+
+    Each `next()` call, which may read from the network, runs on the pool.
+    The iterator is closed when the consumer stops early (e.g. when the client
+    disconnects), which releases the underlying connection.
+
+    Args:
+        iterator (iterator): The blocking iterator, e.g. from `actions.stream_object`.
+
+    Yields:
+        bytes: The chunks of the iterator.
+    """
+    try:
+        while (chunk := await run(next, iterator, _END)) is not _END:
+            yield chunk
+    finally:
+        if hasattr(iterator, "close"):
+            await run(iterator.close)
+
+
+async def list_objects(**kwargs):
+    """
+    Async version of `actions.list_objects`.
+    """
+    return await run(actions.list_objects, **kwargs)
+
+
+async def upload_object(**kwargs):
+    """
+    Async version of `actions.upload_object`.
+    """
+    return await run(actions.upload_object, **kwargs)
+
+
+async def delete_object(**kwargs):
+    """
+    Async version of `actions.delete_object`.
+    """
+    return await run(actions.delete_object, **kwargs)
+
+
+async def delete_objects(**kwargs):
+    """
+    Async version of `actions.delete_objects`.
+    """
+    return await run(actions.delete_objects, **kwargs)
+
+
+async def stat_object(**kwargs):
+    """
+    Async version of `actions.stat_object`.
+    """
+    return await run(actions.stat_object, **kwargs)
+
+
+async def get_cached_object(**kwargs):
+    """
+    Async version of `actions.get_cached_object`.
+
+    Returns:
+        tuple: The object metadata and an async iterator of `bytes` chunks, 
+        or None if the disk cache does not hold the object.
+    """
+    cached = await run(actions.get_cached_object, **kwargs)
+    if cached is None:
+        return None
+    info, chunks = cached
+    return info, iterate(chunks)
+
+
+async def stream_object(**kwargs):
+    """
+    Async version of `actions.stream_object`.
+
+    Returns:
+        tuple: The object metadata and an async iterator of `bytes` chunks.
+    """
+    info, chunks = await run(actions.stream_object, **kwargs)
+    return info, iterate(chunks)
+
+
+async def stream_object_range(**kwargs):
+    """
+    Async version of `actions.stream_object_range`.
+
+    Returns:
+        async iterator: The `bytes` chunks of the range.
+    """
+    return iterate(await run(actions.stream_object_range, **kwargs))
@@ -0,0 +1,45 @@
+"""
+This package provides the storage backends (S3, GCS, local filesystem) 
+behind the `storage.actions` functions.
+"""
+from .base import StorageBackend, StorageError
+from .gcs import GCSBackend
+from .local import LocalBackend, ObjectNotFound
+from .s3 import S3Backend
+
+
+def create_backend(bucket_type, bucket_name, client_factory, local_root):
+    """
+    Build the storage backend of a bucket.
+
+    Args:
+        bucket_type (str): The type of storage system, "S3", "GCS" or "LOCAL".
+        bucket_name (str): The name of the bucket.
+        client_factory (callable): Returns the shared client of a bucket type 
+                                   (see `storage.clients.get_client`).
+        local_root (str): The directory holding the buckets of the local backend.
+
+    Returns:
+        StorageBackend: The backend instance.
+
+    Raises:
+        ValueError: If the bucket type is unknown.
+    """
+    if bucket_type == "S3":
+        return S3Backend(bucket_name, client_factory("S3"))
+    if bucket_type == "GCS":
+        return GCSBackend(bucket_name, client_factory("GCS"))
+    if bucket_type == "LOCAL":
+        return LocalBackend(bucket_name, local_root)
+    raise ValueError(f"Unknown bucket type: {bucket_type}")
+
+
+__all__ = [
+    "GCSBackend",
+    "LocalBackend",
+    "ObjectNotFound",
+    "S3Backend",
+    "StorageBackend",
+    "StorageError",
+    "create_backend",
+]
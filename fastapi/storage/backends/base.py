@@ -0,0 +1,167 @@
+"""
+This module defines the interface shared by every storage backend.
+"""
+from abc import ABC, abstractmethod
+
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+
+class StorageError(Exception):
+    """
+    Raised by a storage backend when an operation on the bucket fails.
+
+    Backends built on a cloud SDK may also raise the SDK errors 
+    (e.g. `botocore.exceptions.ClientError`).
+    """
+
+
+class StorageBackend(ABC):
+    """
+    Base class of the storage backends (S3, GCS, local filesystem).
+
+    A backend is built once at startup for the bucket selected by the 
+    environment, and shared by every request. Its methods receive every 
+    tuning value (page size, part size, chunk size...) explicitly, so that 
+    no environment variable is read on the request path.
+
+    Attributes:
+        scheme (str): The URL scheme of the object paths (e.g. "s3").
+        bucket_name (str): The name of the bucket.
+    """
+    scheme = None
+
+    def __init__(self, bucket_name):
+        self.bucket_name = bucket_name
+
+    def path(self, name):
+        """
+        Build the full path of an object, e.g. `s3://bucket_name/object_key`.
+
+        Args:
+            name (str): The key (filename) of the object.
+
+        Returns:
+            str: The full path of the object.
+        """
+        return f"{self.scheme}://{self.bucket_name}/{name}"
+
+    def local_path(self, name):  # pylint: disable=unused-argument
+        """
+        Return the path of an object on the local filesystem, if it has one.
+
+        Backends storing objects on a local disk return it so that downloads 
+        can be served straight from the file. Remote backends return None.
+
+        Args:
+            name (str): The key (filename) of the object.
+
+        Returns:
+            str: The filesystem path of the object, or None.
+        """
+        return None
+
+    @abstractmethod
+    def list_objects(self, prefix, limit, cursor):
+        """
+        List one page of objects, see `storage.actions.list_objects`.
+
+        Returns:
+            tuple: The list of `{"name", "path"}` dictionaries and the next cursor.
+        """
+
+    @abstractmethod
+    def put_object(self, name, content):
+        """
+        Upload `content` (bytes) under `name`, see `storage.actions.put_object`.
+
+        Returns:
+            str: The full path of the object.
+        """
+
+    @abstractmethod
+    def upload_object(self, name, fileobj, part_size, concurrency, content_type):  # pylint: disable=too-many-arguments
+        """
+        Stream a file-like object under `name`, see `storage.actions.upload_object`.
+
+        Returns:
+            str: The full path of the object.
+        """
+
+    @abstractmethod
+    def delete_object(self, name):
+        """
+        Delete the object `name`, see `storage.actions.delete_object`.
+
+        Returns:
+            str: The full path of the deleted object.
+        """
+
+    @abstractmethod
+    def delete_objects(self, names):
+        """
+        Delete several objects with as few requests as the backend allows, 
+        see `storage.actions.delete_objects`.
+
+        Returns:
+            list: One `{"name", "deleted", "error"}` dictionary per name, in order.
+        """
+
+    @abstractmethod
+    def get_object(self, name):
+        """
+        Download the whole content of the object `name`.
+
+        Returns:
+            bytes: The content of the object.
+        """
+
+    @abstractmethod
+    def stat_object(self, name):
+        """
+        Retrieve the metadata of the object `name`.
+
+        Returns:
+            dict: The 'content_length', 'content_type' and 'etag' of the object.
+            The ETag changes whenever the content of the object changes.
+        """
+
+    @abstractmethod
+    def stream_object(self, name, chunk_size):
+        """
+        Open the object `name` for a streaming download.
+
+        Returns:
+            tuple: The object metadata and an iterator of `bytes` chunks.
+        """
+
+    @abstractmethod
+    def stream_object_range(self, name, start, end, chunk_size):
+        """
+        Stream the bytes `start` to `end` (inclusive) of the object `name`.
+
+        Returns:
+            iterator: The `bytes` chunks of the range.
+        """
+
+
+def read_part(fileobj, size):
+    """
+    Read exactly `size` bytes from `fileobj`, or less only at the end of the stream.
+
+    Args:
+        fileobj: A readable binary file-like object.
+        size (int): The number of bytes to read.
+
+    Returns:
+        bytes: The data read.
+    """
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = fileobj.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
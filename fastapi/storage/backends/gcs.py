@@ -0,0 +1,126 @@
+"""
+This module implements the storage backend for Google Cloud Storage (GCS) 
+with the `google.cloud.storage` library.
+"""
+from .base import DEFAULT_CONTENT_TYPE, StorageBackend
+
+GCS_CHUNK_ALIGNMENT = 256 * 1024
+GCS_MAX_BATCH_SIZE = 100
+
+
+class GCSBackend(StorageBackend):
+    """
+    Storage backend for a GCS bucket.
+
+    Attributes:
+        bucket_name (str): The name of the GCS bucket.
+        client (google.cloud.storage.Client): The shared GCS client.
+    """
+    scheme = "gs"
+
+    def __init__(self, bucket_name, client):
+        super().__init__(bucket_name)
+        self.client = client
+
+    @property
+    def bucket(self):
+        """
+        google.cloud.storage.Bucket: The bucket handle (no request is made).
+        """
+        return self.client.bucket(bucket_name=self.bucket_name)
+
+    def list_objects(self, prefix, limit, cursor):
+        blobs = self.bucket.list_blobs(prefix=prefix, max_results=limit, page_token=cursor)
+        page = next(blobs.pages, [])
+        files = [{"name": blob.name, "path": self.path(blob.name)} for blob in page]
+        return files, blobs.next_page_token
+
+    def put_object(self, name, content):
+        blob = self.bucket.blob(name)
+        blob.upload_from_string(content)
+        return self.path(name)
+
+    def upload_object(self, name, fileobj, part_size, concurrency, content_type):  # pylint: disable=too-many-arguments
+        """
+        Stream `fileobj` as a resumable upload in chunks of `part_size` bytes.
+
+        The chunk size is rounded up to a multiple of 256 KiB. Resumable uploads 
+        are sequential, so `concurrency` is not used.
+        """
+        chunk_size = -(-part_size // GCS_CHUNK_ALIGNMENT) * GCS_CHUNK_ALIGNMENT
+        blob = self.bucket.blob(name, chunk_size=chunk_size)
+        blob.upload_from_file(fileobj, content_type=content_type)
+        return self.path(name)
+
+    def delete_object(self, name):
+        blob = self.bucket.blob(name)
+        blob.delete()
+        return self.path(name)
+
+    def delete_objects(self, names):
+        """
+        Delete the objects with batch requests of up to 100 calls each.
+        """
+        bucket = self.bucket
+        results = []
+        for index in range(0, len(names), GCS_MAX_BATCH_SIZE):
+            batch_names = names[index:index + GCS_MAX_BATCH_SIZE]
+            with self.client.batch(raise_exception=False) as batch:
+                for name in batch_names:
+                    bucket.delete_blob(name)
+            responses = batch._responses  # pylint: disable=protected-access
+            for name, response in zip(batch_names, responses):
+                deleted = 200 <= response.status_code < 300
+                results.append({"name": name, "deleted": deleted,
+                                "error": None if deleted else f"{response.status_code}: "
+                                                              f"{response.reason}"})
+        return results
+
+    def get_object(self, name):
+        blob = self.bucket.blob(name)
+        return blob.download_as_bytes()
+
+    def stat_object(self, name):
+        blob = self.bucket.blob(name)
+        blob.reload()
+        return _info(blob)
+
+    def stream_object(self, name, chunk_size):
+        blob = self.bucket.blob(name)
+        blob.reload()
+        return _info(blob), _iter_blob(blob, chunk_size)
+
+    def stream_object_range(self, name, start, end, chunk_size):
+        blob = self.bucket.blob(name)
+        return _iter_blob_range(blob, start, end, chunk_size)
+
+
+def _info(blob):
+    """
+    Build the metadata dictionary of a reloaded blob.
+    """
+    return {
+        "content_length": blob.size,
+        "content_type": blob.content_type or DEFAULT_CONTENT_TYPE,
+        "etag": blob.etag,
+    }
+
+
+def _iter_blob(blob, chunk_size):
+    """
+    Yield the chunks of a GCS blob read through `blob.open("rb")`.
+    """
+    with blob.open("rb", chunk_size=chunk_size) as reader:
+        while chunk := reader.read(chunk_size):
+            yield chunk
+
+
+def _iter_blob_range(blob, start, end, chunk_size):
+    """
+    Yield the chunks of a byte range of a GCS blob, one bounded download per chunk.
+    """
+    position = start
+    while position <= end:
+        chunk_end = min(position + chunk_size - 1, end)
+        yield blob.download_as_bytes(start=position, end=chunk_end)
+        position = chunk_end + 1
@@ -0,0 +1,157 @@
+"""
+This module implements a storage backend on the local filesystem, for 
+single-node or on-premise deployments and network-free benchmarks.
+"""
+import bisect
+import mimetypes
+import os
+import tempfile
+from .base import DEFAULT_CONTENT_TYPE, StorageBackend, StorageError
+
+
+class ObjectNotFound(StorageError):
+    """
+    Raised when an object does not exist in the local bucket.
+    """
+
+
+class LocalBackend(StorageBackend):
+    """
+    Storage backend storing each object as a file under a bucket directory.
+
+    Object keys map to relative paths under `root/bucket_name`, so keys with 
+    slashes are stored in sub-directories. Uploads are written in chunks to a 
+    temporary file which is then renamed, so readers never see partial objects.
+
+    Attributes:
+        bucket_name (str): The name of the bucket (a sub-directory of `root`).
+        directory (str): The absolute path of the bucket directory.
+    """
+    scheme = "file"
+
+    def __init__(self, bucket_name, root):
+        super().__init__(bucket_name)
+        self.directory = os.path.realpath(os.path.join(root, bucket_name or ""))
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, name):
+        return f"file://{self.directory}/{name}"
+
+    def local_path(self, name):
+        """
+        Resolve an object key to its file, refusing keys escaping the bucket directory.
+
+        Raises:
+            StorageError: If the key is empty or points outside the bucket directory.
+        """
+        file_path = os.path.realpath(os.path.join(self.directory, name))
+        if not file_path.startswith(self.directory + os.sep):
+            raise StorageError(f"Invalid object name: {name}")
+        return file_path
+
+    def _existing_path(self, name):
+        """
+        Resolve an object key to its file, which must exist.
+        """
+        file_path = self.local_path(name)
+        if not os.path.isfile(file_path):
+            raise ObjectNotFound(f"Object not found: {name}")
+        return file_path
+
+    def list_objects(self, prefix, limit, cursor):
+        """
+        List the keys in lexicographic order; the cursor is the last key returned.
+        """
+        names = []
+        for dir_path, _, file_names in os.walk(self.directory):
+            relative_dir = os.path.relpath(dir_path, self.directory)
+            for file_name in file_names:
+                if file_name.startswith(".upload-"):
+                    continue
+                name = file_name if relative_dir == "." else \
+                    f"{relative_dir}/{file_name}".replace(os.sep, "/")
+                if not prefix or name.startswith(prefix):
+                    names.append(name)
+        names.sort()
+
+        start = bisect.bisect_right(names, cursor) if cursor else 0
+        page = names[start:start + limit]
+        next_cursor = page[-1] if start + limit < len(names) else None
+        return [{"name": name, "path": self.path(name)} for name in page], next_cursor
+
+    def put_object(self, name, content):
+        return self._write(name, [content])
+
+    def upload_object(self, name, fileobj, part_size, concurrency, content_type):  # pylint: disable=too-many-arguments
+        """
+        Copy `fileobj` to disk in chunks of `part_size` bytes.
+
+        The content type is derived from the file name when read back, so 
+        `content_type` and `concurrency` are not used.
+        """
+        return self._write(name, iter(lambda: fileobj.read(part_size), b""))
+
+    def _write(self, name, chunks):
+        """
+        Write `chunks` to a temporary file and atomically rename it to the object file.
+        """
+        file_path = self.local_path(name)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".upload-", dir=os.path.dirname(file_path))
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                for chunk in chunks:
+                    tmp_file.write(chunk)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return self.path(name)
+
+    def delete_object(self, name):
+        os.unlink(self._existing_path(name))
+        return self.path(name)
+
+    def delete_objects(self, names):
+        results = []
+        for name in names:
+            try:
+                self.delete_object(name)
+                results.append({"name": name, "deleted": True, "error": None})
+            except (StorageError, OSError) as e:
+                results.append({"name": name, "deleted": False, "error": str(e)})
+        return results
+
+    def get_object(self, name):
+        with open(self._existing_path(name), "rb") as file:
+            return file.read()
+
+    def stat_object(self, name):
+        stat = os.stat(self._existing_path(name))
+        return {
+            "content_length": stat.st_size,
+            "content_type": mimetypes.guess_type(name)[0] or DEFAULT_CONTENT_TYPE,
+            "etag": f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+        }
+
+    def stream_object(self, name, chunk_size):
+        info = self.stat_object(name)
+        return info, self.stream_object_range(name, 0, info["content_length"] - 1, chunk_size)
+
+    def stream_object_range(self, name, start, end, chunk_size):
+        return _iter_file(self._existing_path(name), start, end, chunk_size)
+
+
+def _iter_file(file_path, start, end, chunk_size):
+    """
+    Yield the chunks of the bytes `start` to `end` (inclusive) of a file.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
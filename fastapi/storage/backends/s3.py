@@ -0,0 +1,160 @@
+"""
+This module implements the storage backend for Amazon S3 (and S3-compatible 
+services such as MinIO) with the `boto3` library.
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from .base import DEFAULT_CONTENT_TYPE, StorageBackend, read_part
+
+S3_MAX_DELETE_KEYS = 1000
+
+
+class S3Backend(StorageBackend):
+    """
+    Storage backend for an S3 bucket.
+
+    Attributes:
+        bucket_name (str): The name of the S3 bucket.
+        client (boto3.S3.Client): The shared, thread-safe S3 client.
+    """
+    scheme = "s3"
+
+    def __init__(self, bucket_name, client):
+        super().__init__(bucket_name)
+        self.client = client
+
+    def list_objects(self, prefix, limit, cursor):
+        params = {"Bucket": self.bucket_name, "MaxKeys": limit}
+        if prefix:
+            params["Prefix"] = prefix
+        if cursor:
+            params["ContinuationToken"] = cursor
+        response = self.client.list_objects_v2(**params)
+
+        files = [{"name": obj['Key'], "path": self.path(obj['Key'])}
+                 for obj in response.get('Contents', [])]
+        return files, response.get("NextContinuationToken")
+
+    def put_object(self, name, content):
+        self.client.put_object(
+            Bucket=self.bucket_name,
+            Key=name,
+            Body=content
+        )
+        return self.path(name)
+
+    def upload_object(self, name, fileobj, part_size, concurrency, content_type):  # pylint: disable=too-many-arguments
+        """
+        Stream `fileobj` as a multipart upload with up to `concurrency` parts in flight.
+
+        Content smaller than one part is sent with a single `put_object` call. 
+        The multipart upload is aborted on any error.
+        """
+        extra_args = {"ContentType": content_type} if content_type else {}
+        first_part = read_part(fileobj, part_size)
+        if len(first_part) < part_size:
+            self.client.put_object(
+                Bucket=self.bucket_name, Key=name, Body=first_part, **extra_args)
+        else:
+            self._multipart_upload(name, fileobj, first_part, part_size,
+                                   concurrency, extra_args)
+        return self.path(name)
+
+    def _multipart_upload(self, name, fileobj, first_part,  # pylint: disable=too-many-arguments
+                          part_size, concurrency, extra_args):
+        """
+        Upload `fileobj` as a multipart upload, starting with the already read `first_part`.
+
+        A new part is only read once a slot is free, so at most `concurrency` parts 
+        are held in memory at any time.
+        """
+        upload_id = self.client.create_multipart_upload(
+            Bucket=self.bucket_name, Key=name, **extra_args)["UploadId"]
+
+        def upload_part(part_number, body):
+            response = self.client.upload_part(
+                Bucket=self.bucket_name, Key=name, UploadId=upload_id,
+                PartNumber=part_number, Body=body)
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+        parts = []
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                pending = set()
+                part_number = 1
+                body = first_part
+                while body:
+                    pending.add(executor.submit(upload_part, part_number, body))
+                    del body
+                    if len(pending) >= concurrency:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        parts.extend(future.result() for future in done)
+                    part_number += 1
+                    body = read_part(fileobj, part_size)
+                parts.extend(future.result() for future in wait(pending).done)
+
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket_name, Key=name, UploadId=upload_id,
+                MultipartUpload={"Parts": sorted(parts, key=lambda part: part["PartNumber"])})
+        except BaseException:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=name, UploadId=upload_id)
+            raise
+
+    def delete_object(self, name):
+        self.client.delete_object(
+            Bucket=self.bucket_name,
+            Key=name
+        )
+        return self.path(name)
+
+    def delete_objects(self, names):
+        """
+        Delete the objects with `delete_objects` requests of up to 1000 keys each.
+        """
+        results = []
+        for index in range(0, len(names), S3_MAX_DELETE_KEYS):
+            batch = names[index:index + S3_MAX_DELETE_KEYS]
+            response = self.client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={"Objects": [{"Key": name} for name in batch], "Quiet": True})
+            errors = {error["Key"]: f"{error.get('Code')}: {error.get('Message')}"
+                      for error in response.get("Errors", [])}
+            results.extend({"name": name, "deleted": name not in errors,
+                            "error": errors.get(name)} for name in batch)
+        return results
+
+    def get_object(self, name):
+        response = self.client.get_object(Bucket=self.bucket_name, Key=name)
+        return response['Body'].read()
+
+    def stat_object(self, name):
+        response = self.client.head_object(Bucket=self.bucket_name, Key=name)
+        return {
+            "content_length": response["ContentLength"],
+            "content_type": response.get("ContentType") or DEFAULT_CONTENT_TYPE,
+            "etag": response.get("ETag"),
+        }
+
+    def stream_object(self, name, chunk_size):
+        response = self.client.get_object(Bucket=self.bucket_name, Key=name)
+        info = {
+            "content_length": response["ContentLength"],
+            "content_type": response.get("ContentType") or DEFAULT_CONTENT_TYPE,
+            "etag": response.get("ETag"),
+        }
+        return info, _iter_body(response["Body"], chunk_size)
+
+    def stream_object_range(self, name, start, end, chunk_size):
+        response = self.client.get_object(
+            Bucket=self.bucket_name, Key=name, Range=f"bytes={start}-{end}")
+        return _iter_body(response["Body"], chunk_size)
+
+
+def _iter_body(body, chunk_size):
+    """
+    Yield the chunks of a `StreamingBody` and release its connection afterwards.
+    """
+    try:
+        yield from body.iter_chunks(chunk_size=chunk_size)
+    finally:
+        body.close()
@@ -0,0 +1,337 @@
+"""
+This module provides the caches of the storage layer.
+
+Listing a bucket is slow and billed per request, while the same pages are
+requested over and over (e.g. by the website after every render). Pages are
+cached in memory per bucket, prefix, page size and cursor for a short time.
+
+Hot objects are downloaded again and again, each time paying for egress and
+for the latency of the bucket. They can be kept in a local directory, within
+a byte budget, and revalidated against the ETag of the object in the bucket.
+
+The writes made through `storage.actions` invalidate the entries they
+affect, so a read made after a write in the same process always sees it.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class ListingCache:
+    """
+    Thread-safe TTL cache of listing pages with prefix-based invalidation.
+
+    A generation counter is bumped on every invalidation: a page fetched
+    while a write was in progress is not stored, so a stale page can never
+    overwrite a fresh invalidation.
+
+    Attributes:
+        ttl (float): The number of seconds a page stays valid (0 disables the cache).
+        max_entries (int): The maximum number of cached pages (oldest evicted first).
+        hits (int): The number of lookups served from the cache.
+        misses (int): The number of lookups that had to call the backend.
+    """
+
+    def __init__(self, ttl, max_entries=1024, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """
+        bool: Whether pages are cached at all.
+        """
+        return self.ttl > 0
+
+    def get(self, key):
+        """
+        Look up a page.
+
+        Args:
+            key (tuple): `(bucket_name, prefix, limit, cursor)`.
+
+        Returns:
+            tuple: The cached value and the generation to pass to `set`. The
+            value is None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self.hits += 1
+                return entry[1], self._generation
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None, self._generation
+
+    def set(self, key, value, generation):
+        """
+        Store a page fetched from the backend.
+
+        Args:
+            key (tuple): `(bucket_name, prefix, limit, cursor)`.
+            value: The page to cache.
+            generation (int): The generation returned by `get` before the fetch.
+                              The page is dropped if an invalidation happened since.
+        """
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, bucket_name, name=None, prefix=None):
+        """
+        Drop the pages that may list an object, or any object under a prefix.
+
+        Args:
+            bucket_name (str): The bucket the write was made to.
+            name (str): The key of a written or deleted object.
+            prefix (str): The prefix of a bulk deletion.
+        """
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries):
+                entry_bucket, entry_prefix = key[0], key[1] or ""
+                if entry_bucket != bucket_name:
+                    continue
+                if name is not None and name.startswith(entry_prefix):
+                    del self._entries[key]
+                elif prefix is not None and (prefix.startswith(entry_prefix)
+                                             or entry_prefix.startswith(prefix)):
+                    del self._entries[key]
+
+    def clear(self):
+        """
+        Drop every cached page.
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: The 'hits', 'misses', 'hit_ratio' and current 'size' of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
+
+
+class DiskCache:
+    """
+    Thread-safe cache of object contents on the local disk, with a byte budget
+    and least-recently-used eviction.
+
+    Each entry remembers the ETag of the object it was filled from. Entries
+    older than `revalidate_after` seconds are checked against the current ETag
+    of the object before being served, and dropped if it changed. The index
+    lives in memory, so the directory is owned by one cache (one process) and
+    its content is dropped when the cache is closed.
+
+    Attributes:
+        directory (str): The directory holding the cached files.
+        max_bytes (int): The total size of the cached files not to exceed.
+        revalidate_after (float): The number of seconds an entry is served
+                                  without checking its ETag.
+        hits (int): The number of lookups served from the disk.
+        misses (int): The number of lookups that had to download the object.
+        evictions (int): The number of entries dropped to stay within the budget.
+    """
+
+    def __init__(self, directory, max_bytes, revalidate_after=0, clock=time.monotonic):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _file_path(self, name):
+        return os.path.join(self.directory, hashlib.sha256(name.encode()).hexdigest())
+
+    def lookup(self, name, stat):
+        """
+        Look up the cached copy of an object.
+
+        Args:
+            name (str): The key (filename) of the object.
+            stat (callable): Returns the current metadata of the object (with
+                             its 'etag'), called when the entry must be revalidated.
+
+        Returns:
+            tuple: The metadata and the cached copy, opened for reading in
+            binary mode (to be closed by the caller), or None on a miss. The
+            file is opened while the entry is known to exist, so it stays
+            readable even if the entry is evicted or invalidated afterwards.
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            info, file_path, validated_at = entry
+        if self._clock() - validated_at >= self.revalidate_after:
+            try:
+                current = stat(name)
+            except Exception:
+                self.invalidate(name)
+                raise
+            if current.get("etag") != info["etag"]:
+                self.invalidate(name)
+                with self._lock:
+                    self.misses += 1
+                return None
+            with self._lock:
+                if self._entries.get(name, (None, None))[1] == file_path:
+                    self._entries[name] = (info, file_path, self._clock())
+        with self._lock:
+            if self._entries.get(name, (None, None))[1] != file_path:
+                self.misses += 1
+                return None
+            file = open(file_path, "rb")  # pylint: disable=consider-using-with
+            self.hits += 1
+        return info, file
+
+    def fill(self, name, info, chunks):
+        """
+        Copy the chunks of a download to the cache while they are consumed.
+
+        The entry is only added once the whole content has been read, and not
+        at all if the object does not fit in the budget, has no ETag, or was
+        written or deleted in the meantime.
+
+        Args:
+            name (str): The key (filename) of the object.
+            info (dict): The metadata of the object, as returned by `stream_object`.
+            chunks (iterator): The `bytes` chunks of the object.
+
+        Yields:
+            bytes: The chunks, unchanged.
+        """
+        if not info.get("etag") or info["content_length"] > self.max_bytes:
+            yield from chunks
+            return
+
+        with self._lock:
+            generation = self._generation
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".fill-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                for chunk in chunks:
+                    file.write(chunk)
+                    yield chunk
+            if os.path.getsize(temp_path) == info["content_length"]:
+                temp_path = self._add(name, info, temp_path, generation)
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+            if temp_path is not None:
+                os.unlink(temp_path)
+
+    def _add(self, name, info, temp_path, generation):
+        """
+        Move a filled file into the cache, then evict entries over the budget.
+
+        Returns:
+            str: The temporary path if the file was not added, else None.
+        """
+        file_path = self._file_path(name)
+        with self._lock:
+            if generation != self._generation:
+                return temp_path
+            os.replace(temp_path, file_path)
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self._bytes -= previous[0]["content_length"]
+            self._entries[name] = (info, file_path, self._clock())
+            self._bytes += info["content_length"]
+            while self._bytes > self.max_bytes:
+                _, (evicted_info, evicted_path, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_info["content_length"]
+                self.evictions += 1
+                _unlink(evicted_path)
+        return None
+
+    def invalidate(self, name=None, prefix=None):
+        """
+        Drop the cached copy of an object, or of every object under a prefix.
+
+        Args:
+            name (str): The key of a written or deleted object.
+            prefix (str): The prefix of a bulk deletion.
+        """
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries):
+                if key == name or (prefix is not None and key.startswith(prefix)):
+                    info, file_path, _ = self._entries.pop(key)
+                    self._bytes -= info["content_length"]
+                    _unlink(file_path)
+
+    def close(self):
+        """
+        Drop every entry and remove the cache directory.
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._bytes = 0
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: The 'hits', 'misses', 'hit_ratio', 'evictions', current 'size'
+            (entries), 'bytes' and 'max_bytes' of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _unlink(file_path):
+    """
+    Remove a cached file, ignoring files already gone.
+    """
+    try:
+        os.unlink(file_path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,137 @@
+"""
+This module provides a process-wide registry of storage clients.
+
+Building a `boto3` or `google.cloud.storage` client resolves credentials,
+loads the service model and opens a new HTTP connection pool. The registry
+builds one client per backend, the first time it is needed (or at startup),
+and shares it between every request and thread.
+
+The client libraries are only imported by the builder of their backend:
+`google.cloud.storage` alone takes longer to import than the rest of the
+application, so an S3 or local deployment does not pay for it at startup.
+"""
+import os
+import threading
+
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 60
+DEFAULT_RETRY_MODE = "standard"
+DEFAULT_MAX_ATTEMPTS = 3
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_client_settings():
+    """
+    Retrieve the storage client settings from environment variables.
+
+    Environment Variables:
+        - OBJECT_CLIENT_MAX_POOL_CONNECTIONS: The size of the HTTP connection pool
+          (default 50).
+        - OBJECT_CLIENT_CONNECT_TIMEOUT: The connection timeout in seconds (default 5).
+        - OBJECT_CLIENT_READ_TIMEOUT: The read timeout in seconds (default 60).
+        - OBJECT_CLIENT_RETRY_MODE: The botocore retry mode, "legacy", "standard"
+          or "adaptive" (default "standard").
+        - OBJECT_CLIENT_MAX_ATTEMPTS: The maximum number of attempts per request
+          (default 3).
+
+    Returns:
+        dict: The client settings.
+    """
+    return {
+        "max_pool_connections": int(os.getenv(
+            "OBJECT_CLIENT_MAX_POOL_CONNECTIONS", str(DEFAULT_MAX_POOL_CONNECTIONS))),
+        "connect_timeout": float(os.getenv(
+            "OBJECT_CLIENT_CONNECT_TIMEOUT", str(DEFAULT_CONNECT_TIMEOUT))),
+        "read_timeout": float(os.getenv(
+            "OBJECT_CLIENT_READ_TIMEOUT", str(DEFAULT_READ_TIMEOUT))),
+        "retry_mode": os.getenv("OBJECT_CLIENT_RETRY_MODE", DEFAULT_RETRY_MODE),
+        "max_attempts": int(os.getenv(
+            "OBJECT_CLIENT_MAX_ATTEMPTS", str(DEFAULT_MAX_ATTEMPTS))),
+    }
+
+
+def build_s3_client(settings):
+    """
+    Build an S3 client with a sized connection pool, timeouts and retries.
+
+    The client is created from its own `boto3` session, as sessions are not
+    thread-safe while clients are.
+
+    Args:
+        settings (dict): The settings returned by `get_client_settings()`.
+
+    Returns:
+        boto3.S3.Client: A low-level client representing Amazon Simple Storage Service (S3).
+    """
+    import boto3  # pylint: disable=import-outside-toplevel
+    from botocore.config import Config  # pylint: disable=import-outside-toplevel
+
+    config = Config(
+        max_pool_connections=settings["max_pool_connections"],
+        connect_timeout=settings["connect_timeout"],
+        read_timeout=settings["read_timeout"],
+        retries={"mode": settings["retry_mode"],
+                 "total_max_attempts": settings["max_attempts"]},
+    )
+    return boto3.session.Session().client("s3", config=config)
+
+
+def build_gcs_client(settings):
+    """
+    Build a Google Cloud Storage (GCS) client with a sized connection pool.
+
+    Timeouts and retries are set per call by the `google.cloud.storage` library.
+
+    Args:
+        settings (dict): The settings returned by `get_client_settings()`.
+
+    Returns:
+        google.cloud.storage.Client: A GCS client instance.
+    """
+    from google.cloud import storage  # pylint: disable=import-outside-toplevel
+    from requests.adapters import HTTPAdapter  # pylint: disable=import-outside-toplevel
+
+    client = storage.Client()
+    adapter = HTTPAdapter(pool_connections=settings["max_pool_connections"],
+                          pool_maxsize=settings["max_pool_connections"])
+    client._http.mount("https://", adapter)  # pylint: disable=protected-access
+    return client
+
+
+BUILDERS = {
+    "S3": build_s3_client,
+    "GCS": build_gcs_client,
+}
+
+
+def get_client(bucket_type):
+    """
+    Return the shared client of a storage backend, building it on first use.
+
+    Args:
+        bucket_type (str): The type of storage system, either "S3" or "GCS".
+
+    Returns:
+        The client of the backend, shared by the whole process.
+    """
+    client = _clients.get(bucket_type)
+    if client is None:
+        with _lock:
+            client = _clients.get(bucket_type)
+            if client is None:
+                client = BUILDERS[bucket_type](get_client_settings())
+                _clients[bucket_type] = client
+    return client
+
+
+def reset_clients():
+    """
+    Drop every shared client, so that the next call builds new ones.
+
+    This is used when the settings or credentials change (e.g. in tests).
+    """
+    with _lock:
+        _clients.clear()
@@ -0,0 +1,138 @@
+"""
+This module provides helpers to serve HTTP byte ranges (RFC 9110) of
+objects stored in the bucket.
+"""
+import re
+import secrets
+
+MAX_RANGES = 64
+RANGE_SPEC = re.compile(r"([0-9]*)-([0-9]*)")
+
+
+class RangeNotSatisfiable(Exception):
+    """
+    Raised when none of the ranges of a `Range` header overlaps the object.
+    """
+
+
+def parse_range_header(header, size):
+    """
+    Parse a `Range` request header against an object of `size` bytes.
+
+    Single ranges (`bytes=0-99`), open ranges (`bytes=100-`), suffix ranges
+    (`bytes=-100`) and lists of them (`bytes=0-99,200-299`) are supported.
+    Overlapping or adjacent ranges are coalesced, and ranges that do not
+    overlap the object are dropped.
+
+    **Args**:
+    - header: The raw value of the `Range` header.
+    - size: The size of the object in bytes.
+
+    **Returns**:
+    - A list of `(start, end)` tuples with inclusive byte offsets, or None if
+      the header is malformed, uses another unit than bytes or asks for too
+      many ranges. In that case the header must be ignored and the full object
+      served.
+
+    **Raises**:
+    - RangeNotSatisfiable: If the header is valid but no range overlaps the object.
+
+    **Example**:
+    ```python
+    parse_range_header("bytes=0-99,-10", 1000)  # [(0, 99), (990, 999)]
+    ```
+    """
+    unit, _, specs = header.partition("=")
+    if unit.strip().lower() != "bytes" or not specs.strip():
+        return None
+
+    specs = specs.split(",")
+    if len(specs) > MAX_RANGES:
+        return None
+
+    byte_ranges = []
+    for spec in specs:
+        match = RANGE_SPEC.fullmatch(spec.strip())
+        if match is None or not (match[1] or match[2]):
+            return None
+        first, last = match.groups()
+        if not first:
+            length = int(last)
+            if length > 0 and size > 0:
+                byte_ranges.append((max(size - length, 0), size - 1))
+            continue
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+        if start < size:
+            byte_ranges.append((start, min(end, size - 1)))
+
+    if not byte_ranges:
+        raise RangeNotSatisfiable(f"bytes */{size}")
+
+    return _coalesce(byte_ranges) if len(byte_ranges) > 1 else byte_ranges
+
+
+def _coalesce(byte_ranges):
+    """
+    Merge overlapping or adjacent ranges, sorted by start offset.
+    """
+    merged = []
+    for start, end in sorted(byte_ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def content_range(start, end, size):
+    """
+    Build the value of a `Content-Range` header.
+
+    **Returns**:
+    - str: For example `bytes 0-99/1000`.
+    """
+    return f"bytes {start}-{end}/{size}"
+
+
+def multipart_byteranges(byte_ranges, size, content_type, open_range):
+    """
+    Build a `multipart/byteranges` body for several ranges of one object.
+
+    The parts are produced lazily: the content of a range is only requested
+    from the bucket once the previous parts have been sent.
+
+    **Args**:
+    - byte_ranges: A list of `(start, end)` tuples as returned by `parse_range_header`.
+    - size: The size of the object in bytes.
+    - content_type: The MIME type of the object, repeated in each part.
+    - open_range: A callable `(start, end) -> iterator of bytes` returning the
+      content of one range.
+
+    **Returns**:
+    - A tuple containing:
+        - The `Content-Type` header value, including the boundary.
+        - The exact length of the body in bytes.
+        - An iterator of `bytes` chunks with the body.
+    """
+    boundary = secrets.token_hex(16)
+    part_headers = [
+        (f"--{boundary}\r\nContent-Type: {content_type}\r\n"
+         f"Content-Range: {content_range(start, end, size)}\r\n\r\n").encode()
+        for start, end in byte_ranges
+    ]
+    closing = f"--{boundary}--\r\n".encode()
+    length = sum(len(header) + end - start + 1 + 2
+                 for header, (start, end) in zip(part_headers, byte_ranges))
+    length += len(closing)
+
+    def body():
+        for header, (start, end) in zip(part_headers, byte_ranges):
+            yield header
+            yield from open_range(start, end)
+            yield b"\r\n"
+        yield closing
+
+    return f"multipart/byteranges; boundary={boundary}", length, body()
@@ -3,7 +3,7 @@ This module defines Pydantic models used for validating and serializing
 S3 data.
 """
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class FileInfo(BaseModel):
@@ -31,14 +31,17 @@ class UploadResponse(BaseModel):
 
 class ListFilesResponse(BaseModel):
     """
-    Model representing the response from listing files in an S3 bucket.
+    Model representing one page of the response from listing files in an S3 bucket.
 
     Attributes:
     - files: A list of FileInfo objects containing information about 
       the files stored in the bucket. If no files exist, this will be an 
       empty list.
+    - next_cursor: The cursor to pass to get the next page, or None if 
+      this is the last page.
     """
     files: Optional[List[FileInfo]] = []
+    next_cursor: Optional[str] = None
 
 
 class DeleteResponse(BaseModel):
@@ -50,3 +53,54 @@ class DeleteResponse(BaseModel):
     - message: A success message indicating the file was deleted.
     """
     message: str
+
+
+class BatchDeleteRequest(BaseModel):
+    """
+    Model representing a request to delete several files from the bucket.
+
+    Exactly one of the attributes must be set.
+
+    Attributes:
+    - names: The names of the files (object keys) to delete.
+    - prefix: Delete every file whose name starts with this (non-empty) prefix.
+    """
+    names: Optional[List[str]] = None
+    prefix: Optional[str] = Field(default=None, min_length=1)
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        """
+        Ensure that the files are selected either by names or by prefix.
+        """
+        if (self.names is None) == (self.prefix is None):
+            raise ValueError("Exactly one of 'names' or 'prefix' must be given")
+        return self
+
+
+class DeleteResult(BaseModel):
+    """
+    Model representing the outcome of deleting one file in a batch.
+
+    Attributes:
+    - name: The name of the file (object key).
+    - deleted: Whether the file was deleted.
+    - error: The reason of the failure, if any.
+    """
+    name: str
+    deleted: bool
+    error: Optional[str] = None
+
+
+class BatchDeleteResponse(BaseModel):
+    """
+    Model representing the response after deleting several files from the bucket.
+
+    Attributes:
+    - deleted: The number of files deleted.
+    - failed: The number of files that could not be deleted.
+    - results: The outcome for each file.
+    """
+    deleted: int
+    failed: int
+    results: List[DeleteResult]
@@ -0,0 +1,86 @@
+"""
+Unit tests for the storage client registry.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import pytest
+from storage import clients
+
+
+@pytest.fixture(autouse=True)
+def reset_registry(monkeypatch):
+    """
+    Fixture that empties the client registry before and after each test.
+    """
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    clients.reset_clients()
+    yield
+    clients.reset_clients()
+
+
+def test_get_client_is_shared():
+    """
+    Test that the registry returns the same client on every call.
+
+    Asserts:
+        - The client is built once, and rebuilt after a reset.
+    """
+    client = clients.get_client("S3")
+
+    assert clients.get_client("S3") is client
+    clients.reset_clients()
+    assert clients.get_client("S3") is not client
+
+
+def test_get_client_built_once_across_threads():
+    """
+    Test that concurrent first calls build a single client.
+
+    Asserts:
+        - The builder is called once and every thread gets its client.
+    """
+    with mock.patch.dict(clients.BUILDERS, {"S3": mock.Mock(side_effect=lambda settings: object())}):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: clients.get_client("S3"), range(32)))
+
+        clients.BUILDERS["S3"].assert_called_once()
+    assert all(result is results[0] for result in results)
+
+
+def test_s3_client_settings(monkeypatch):
+    """
+    Test that the S3 client is configured from environment variables.
+
+    Asserts:
+        - The pool size, timeouts and retry settings are applied.
+    """
+    monkeypatch.setenv('OBJECT_CLIENT_MAX_POOL_CONNECTIONS', '100')
+    monkeypatch.setenv('OBJECT_CLIENT_CONNECT_TIMEOUT', '2')
+    monkeypatch.setenv('OBJECT_CLIENT_READ_TIMEOUT', '30')
+    monkeypatch.setenv('OBJECT_CLIENT_RETRY_MODE', 'adaptive')
+    monkeypatch.setenv('OBJECT_CLIENT_MAX_ATTEMPTS', '5')
+
+    config = clients.get_client("S3").meta.config
+
+    assert config.max_pool_connections == 100
+    assert config.connect_timeout == 2
+    assert config.read_timeout == 30
+    assert config.retries == {"mode": "adaptive", "total_max_attempts": 5}
+
+
+def test_gcs_client_pool_size(monkeypatch):
+    """
+    Test that the GCS client HTTP session gets a sized connection pool.
+
+    Asserts:
+        - An adapter with the configured pool size is mounted for https.
+    """
+    monkeypatch.setenv('OBJECT_CLIENT_MAX_POOL_CONNECTIONS', '20')
+
+    with mock.patch('google.cloud.storage.Client') as mock_client:
+        clients.get_client("GCS")
+
+    http = mock_client.return_value._http  # pylint: disable=protected-access
+    prefix, adapter = http.mount.call_args.args
+    assert prefix == "https://"
+    assert adapter._pool_maxsize == 20  # pylint: disable=protected-access
@@ -0,0 +1,215 @@
+"""
+Unit tests for the compression of the API responses.
+"""
+import asyncio
+import gzip
+import brotli
+import pytest
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+from compression import CompressionMiddleware, get_compression_settings, negotiate
+
+BODY = b'{"id":1,"label":"Todo","quantity":1},' * 100
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+
+@app.get("/json")
+def get_json(size: int = len(BODY)):
+    """
+    Return a JSON body of `size` bytes, with an ETag.
+    """
+    return Response(BODY[:size], media_type="application/json", headers={"ETag": '"v1"'})
+
+
+@app.get("/stream")
+def get_stream():
+    """
+    Return a streamed NDJSON body, in three chunks.
+    """
+    return StreamingResponse(iter([BODY, BODY, BODY]), media_type="application/x-ndjson")
+
+
+@app.get("/download")
+def get_download(media_type: str = "application/octet-stream", ranges: bool = False):
+    """
+    Return a download of the given content type, with `Accept-Ranges` if asked.
+    """
+    headers = {"Accept-Ranges": "bytes"} if ranges else {}
+    return Response(BODY, media_type=media_type, headers=headers)
+
+
+@app.get("/not-modified")
+def get_not_modified():
+    """
+    Return a 304 response, with a strong ETag.
+    """
+    return Response(status_code=304, headers={"ETag": '"v1"'})
+
+
+client = TestClient(app)
+
+DECODERS = {"gzip": gzip.decompress, "br": brotli.decompress,
+            "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)}
+
+
+def get_raw(path, accept_encoding):
+    """
+    Request a path and return the response with its body as sent, not decoded.
+    """
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+@pytest.mark.parametrize("accept_encoding,expected", [
+    ("gzip, deflate, br, zstd", "zstd"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br, gzip", "br"),
+    ("*", "zstd"),
+    ("zstd;q=0, *;q=0.1", "br"),
+    ("identity", None),
+    ("gzip;q=0", None),
+    ("", None),
+])
+def test_negotiate(accept_encoding, expected):
+    """
+    Test that the accepted encoding with the highest quality, then the
+    preferred one, is chosen.
+    """
+    assert negotiate(accept_encoding, ["zstd", "br", "gzip"]) == expected
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_compressed_response(encoding):
+    """
+    Test that a large JSON response is compressed with the negotiated encoding.
+
+    Asserts:
+        - The body decodes to the original one, and is much smaller.
+        - `Content-Length` is the compressed size, and `Vary` is set.
+        - The strong ETag is weakened, since the bytes differ.
+    """
+    response, raw = get_raw("/json", encoding)
+
+    assert response.headers["Content-Encoding"] == encoding
+    assert response.headers["Content-Length"] == str(len(raw))
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == 'W/"v1"'
+    assert DECODERS[encoding](raw) == BODY
+    assert len(raw) < len(BODY) / 10
+
+
+def test_not_modified_keeps_etag_of_copy():
+    """
+    Test that a 304 carries the weak ETag when the client revalidates a
+    compressed copy, and the strong one otherwise.
+    """
+    weak = client.get("/not-modified", headers={"If-None-Match": 'W/"v1"'})
+    strong = client.get("/not-modified", headers={"If-None-Match": '"v1"'})
+
+    assert weak.status_code == strong.status_code == 304
+    assert weak.headers["ETag"] == 'W/"v1"'
+    assert strong.headers["ETag"] == '"v1"'
+
+
+def test_small_response_not_compressed():
+    """
+    Test that a response under the minimum size is sent as it is.
+    """
+    response, raw = get_raw("/json?size=100", "gzip")
+
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == '"v1"'
+    assert raw == BODY[:100]
+
+
+def test_not_accepted():
+    """
+    Test that nothing is compressed for a client that accepts no encoding.
+    """
+    response, raw = get_raw("/json", "identity")
+
+    assert "Content-Encoding" not in response.headers
+    assert raw == BODY
+
+
+def test_streamed_response_compressed_chunk_by_chunk():
+    """
+    Test that a streamed response stays streamed: each chunk is compressed
+    and sent on its own, decodable as soon as it arrives.
+    """
+    messages = []
+
+    async def scenario():
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if request_sent:
+                await asyncio.Event().wait()
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+                 "method": "GET", "scheme": "http", "path": "/stream", "raw_path": b"/stream",
+                 "query_string": b"", "root_path": "", "server": ("test", 80),
+                 "headers": [(b"host", b"test"), (b"accept-encoding", b"gzip")]}
+        await app(scope, receive, send)
+
+    asyncio.run(scenario())
+
+    start, *bodies = messages
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    decompressor = gzip.zlib.decompressobj(16 + gzip.zlib.MAX_WBITS)
+    decoded = [decompressor.decompress(message["body"]) for message in bodies]
+    assert decoded[:3] == [BODY, BODY, BODY]
+    assert bodies[-1]["more_body"] is False
+
+
+@pytest.mark.parametrize("path", [
+    "/download",
+    "/download?media_type=image/png",
+    "/download?media_type=application/zip",
+    "/download?media_type=text/plain&ranges=true",
+])
+def test_downloads_not_compressed(path):
+    """
+    Test that octet-stream downloads, already compressed content types and
+    downloads supporting byte ranges are sent as they are.
+    """
+    response, raw = get_raw(path, "gzip, br, zstd")
+
+    assert "Content-Encoding" not in response.headers
+    assert raw == BODY
+
+
+def test_get_compression_settings(monkeypatch):
+    """
+    Test that the settings are read from the environment, and that an
+    unknown encoding or an out of range level is rejected.
+    """
+    monkeypatch.setenv("RESPONSE_COMPRESSION_MIN_SIZE", "10")
+    monkeypatch.setenv("RESPONSE_COMPRESSION_ENCODINGS", "br, gzip")
+    monkeypatch.setenv("RESPONSE_COMPRESSION_GZIP_LEVEL", "1")
+
+    assert get_compression_settings() == {
+        "minimum_size": 10, "encodings": ["br", "gzip"],
+        "levels": {"gzip": 1, "br": 4, "zstd": 3}}
+
+    monkeypatch.setenv("RESPONSE_COMPRESSION_ENCODINGS", "deflate")
+    with pytest.raises(ValueError):
+        get_compression_settings()
+
+    monkeypatch.setenv("RESPONSE_COMPRESSION_ENCODINGS", "gzip")
+    monkeypatch.setenv("RESPONSE_COMPRESSION_GZIP_LEVEL", "12")
+    with pytest.raises(ValueError, match="RESPONSE_COMPRESSION_GZIP_LEVEL"):
+        get_compression_settings()
@@ -2,11 +2,18 @@
 """
 Unit tests for the CRUD operations related to the Todo model.
 """
+import csv
+import io
+import json
 from unittest.mock import MagicMock, create_autospec
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.exc import NoResultFound
-from database import crud, models, schemas
+from sqlalchemy.dialects import mysql
+from database import counting, crud, models, schemas, serializers, versioning
+from database.database import Base
+from database.pagination import InvalidCursor
 
 
 @pytest.fixture
@@ -20,6 +27,25 @@ def mock_db_session():
     return create_autospec(Session)
 
 
+@pytest.fixture
+def sqlite_session():
+    """
+    Fixture to create a session on an in-memory SQLite database holding the 
+    todos table, for the queries whose SQL matters (e.g. keyset pagination).
+
+    Yields:
+        A `Session` bound to the in-memory database.
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
 def test_get_todos(mock_db_session):
     """
     Test the `get_todos` function from the `crud` module.
@@ -34,7 +60,7 @@ def test_get_todos(mock_db_session):
         id=2, label="Test Todo 2", quantity=2)]
     query = mock_db_session.query
     query.return_value.offset.return_value.limit.return_value.all.return_value = mock_todos
-    query.return_value.count.return_value = len(mock_todos)
+    mock_db_session.scalar.return_value = len(mock_todos)
 
     total_count, todos = crud.get_todos(db=mock_db_session)
 
@@ -113,3 +139,474 @@ def test_delete_todo_not_found(mock_db_session):
 
     with pytest.raises(NoResultFound):
         crud.delete_todo(db=mock_db_session, todo_id=999)
+
+
+def _walk_pages(db, limit, order_by=None, filters=None):
+    """
+    Fetch every page of a keyset listing, following the cursors.
+    """
+    pages = []
+    cursor = None
+    while True:
+        todos, cursor = crud.get_todos_page(db=db, limit=limit, cursor=cursor,
+                                            order_by=order_by, filters=filters)
+        pages.append([todo.id for todo in todos])
+        if cursor is None:
+            return pages
+
+
+def test_get_todos_page_by_id(sqlite_session):
+    """
+    Test keyset pagination by ID, with cursors and with `after_id`.
+    """
+    sqlite_session.add_all(models.Todo(label=f"Todo {i}", quantity=i) for i in range(5))
+    sqlite_session.commit()
+
+    assert _walk_pages(sqlite_session, limit=2) == [[1, 2], [3, 4], [5]]
+
+    todos, next_cursor = crud.get_todos_page(db=sqlite_session, limit=10, after_id=3)
+    assert [todo.id for todo in todos] == [4, 5]
+    assert next_cursor is None
+
+
+@pytest.mark.parametrize("order_by, expected", [
+    ("label", [[3, 5], [2, 4], [1]]),
+    ("quantity", [[3, 2], [1, 5], [4]]),
+    ("-label", [[1, 4], [2, 5], [3]]),
+    ("-quantity", [[4, 5], [1, 2], [3]]),
+    ("-id", [[5, 4], [3, 2], [1]]),
+])
+def test_get_todos_page_by_column(sqlite_session, order_by, expected):
+    """
+    Test keyset pagination by a non-unique column, including NULL values and ties.
+    """
+    sqlite_session.add_all([
+        models.Todo(id=1, label="c", quantity=2),
+        models.Todo(id=2, label="b", quantity=1),
+        models.Todo(id=3, label=None, quantity=None),
+        models.Todo(id=4, label="b", quantity=3),
+        models.Todo(id=5, label="a", quantity=2),
+    ])
+    sqlite_session.commit()
+
+    assert _walk_pages(sqlite_session, limit=2, order_by=order_by) == expected
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"cursor": "not-a-cursor"},
+    {"cursor": "eyJrIjoiaWQifQ"},
+    {"order_by": "password"},
+    {"after_id": 1, "order_by": "label"},
+])
+def test_get_todos_page_invalid(sqlite_session, kwargs):
+    """
+    Test that malformed cursors and invalid combinations raise `InvalidCursor`.
+    """
+    with pytest.raises(InvalidCursor):
+        crud.get_todos_page(db=sqlite_session, **kwargs)
+
+
+def test_get_todos_page_cursor_order_mismatch(sqlite_session):
+    """
+    Test that a cursor cannot be reused with another sort column.
+    """
+    sqlite_session.add_all(models.Todo(label=f"Todo {i}", quantity=i) for i in range(3))
+    sqlite_session.commit()
+    _, next_cursor = crud.get_todos_page(db=sqlite_session, limit=1, order_by="label")
+
+    with pytest.raises(InvalidCursor):
+        crud.get_todos_page(db=sqlite_session, cursor=next_cursor, order_by="quantity")
+
+
+def test_get_todos_without_total(mock_db_session):
+    """
+    Test that `include_total=False` skips the count query.
+    """
+    query = mock_db_session.query
+    query.return_value.offset.return_value.limit.return_value.all.return_value = []
+
+    total_count, todos = crud.get_todos(db=mock_db_session, include_total=False)
+
+    assert total_count is None
+    assert todos == []
+    mock_db_session.scalar.assert_not_called()
+
+
+def test_count_todos_cached(sqlite_session, monkeypatch):
+    """
+    Test that the cached count is served from memory and invalidated by writes.
+    """
+    monkeypatch.setenv("TODO_COUNT_STRATEGY", "cached")
+    counting.invalidate()
+    crud.create_todo(db=sqlite_session, todo=schemas.TodoCreate(label="a", quantity=1))
+    assert crud.count_todos(db=sqlite_session) == 1
+
+    sqlite_session.add(models.Todo(label="outside of crud", quantity=1))
+    sqlite_session.commit()
+    assert crud.count_todos(db=sqlite_session) == 1
+
+    crud.create_todo(db=sqlite_session, todo=schemas.TodoCreate(label="b", quantity=1))
+    assert crud.count_todos(db=sqlite_session) == 3
+    counting.invalidate()
+
+
+def test_count_todos_counter(sqlite_session, monkeypatch):
+    """
+    Test that the counter row is seeded once, then maintained by the writes.
+    """
+    monkeypatch.setenv("TODO_COUNT_STRATEGY", "counter")
+    sqlite_session.add_all(models.Todo(label=f"Todo {i}", quantity=i) for i in range(3))
+    sqlite_session.commit()
+    assert crud.count_todos(db=sqlite_session) == 3
+
+    crud.create_todo(db=sqlite_session, todo=schemas.TodoCreate(label="new", quantity=1))
+    crud.delete_todo(db=sqlite_session, todo_id=1)
+    crud.delete_todo(db=sqlite_session, todo_id=2)
+
+    assert sqlite_session.get(models.RowCount, "todos").count == 2
+    assert crud.count_todos(db=sqlite_session) == 2
+
+
+def test_count_todos_estimate_fallback(sqlite_session, monkeypatch):
+    """
+    Test that the estimate falls back to an exact count outside of MySQL.
+    """
+    monkeypatch.setenv("TODO_COUNT_STRATEGY", "estimate")
+    sqlite_session.add(models.Todo(label="a", quantity=1))
+    sqlite_session.commit()
+
+    assert crud.count_todos(db=sqlite_session) == 1
+
+
+def test_count_todos_unknown_strategy(mock_db_session, monkeypatch):
+    """
+    Test that an unknown strategy is rejected.
+    """
+    monkeypatch.setenv("TODO_COUNT_STRATEGY", "guess")
+
+    with pytest.raises(ValueError):
+        crud.count_todos(db=mock_db_session)
+
+
+def test_get_todo_rows(sqlite_session):
+    """
+    Test that the ORM-free read path returns plain rows, without loading 
+    `models.Todo` instances in the session.
+    """
+    sqlite_session.add_all(models.Todo(label=f"Todo {i}", quantity=i) for i in range(3))
+    sqlite_session.commit()
+    sqlite_session.expunge_all()
+
+    total_count, rows = crud.get_todo_rows(db=sqlite_session, skip=1, limit=10)
+
+    assert total_count == 3
+    assert [tuple(row) for row in rows] == [(2, "Todo 1", 1), (3, "Todo 2", 2)]
+    assert len(sqlite_session.identity_map) == 0
+
+
+def test_get_todo_row(sqlite_session):
+    """
+    Test that a single todo item is read as a plain row, or None when missing.
+    """
+    sqlite_session.add(models.Todo(label="Todo", quantity=2))
+    sqlite_session.commit()
+
+    assert tuple(crud.get_todo_row(db=sqlite_session, todo_id=1)) == (1, "Todo", 2)
+    assert crud.get_todo_row(db=sqlite_session, todo_id=2) is None
+    assert json.loads(serializers.dump_todo((1, "Todo", 2))) == \
+        schemas.Todo(id=1, label="Todo", quantity=2).model_dump()
+
+
+def test_table_version(sqlite_session):
+    """
+    Test that the version of the todos table is seeded once, by the first 
+    read of a fresh schema or at startup, then changed by every write, but 
+    not by a deletion matching nothing.
+    """
+    version = versioning.get_version(sqlite_session)
+    assert version is not None
+    sqlite_session.rollback()
+    versioning.ensure_version(sqlite_session.get_bind())
+    assert versioning.get_version(sqlite_session) == version
+
+    crud.create_todo(db=sqlite_session, todo=schemas.TodoCreate(label="a", quantity=1))
+    crud.create_todos(db=sqlite_session, todos=[{"label": "b", "quantity": 2}] * 3, chunk_size=2)
+    crud.delete_todo(db=sqlite_session, todo_id=1)
+    crud.delete_todos(db=sqlite_session, ids=[2, 42], chunk_size=1)
+
+    assert versioning.get_version(sqlite_session) == version + 5
+
+
+def test_dump_todos_response():
+    """
+    Test that the serialized rows match the JSON of the response model.
+    """
+    rows = [(1, "Café ☕", 2), (2, 'Quote " and \\ slash', 0)]
+
+    content = serializers.dump_todos_response(2, rows, "cursor")
+
+    expected = schemas.TodosResponse(
+        total=2, next_cursor="cursor",
+        todos=[schemas.Todo(id=id_, label=label, quantity=quantity)
+               for id_, label, quantity in rows])
+    assert json.loads(content) == json.loads(expected.model_dump_json())
+    assert "Café ☕".encode() in content
+
+
+def test_iter_todo_rows_in_batches(sqlite_session, monkeypatch):
+    """
+    Test that the export iterates over every row in ID order, one batch of 
+    "TODO_EXPORT_BATCH_SIZE" rows at a time, from a streamed result.
+    """
+    monkeypatch.setenv("TODO_EXPORT_BATCH_SIZE", "2")
+    sqlite_session.add_all(models.Todo(label=f"Todo {i}", quantity=i) for i in range(5))
+    sqlite_session.commit()
+    options = []
+    event.listen(sqlite_session.get_bind(), "before_cursor_execute",
+                 lambda *args: options.append(args[4].execution_options))
+
+    batches = list(crud.iter_todo_rows(db=sqlite_session))
+
+    assert [[row.id for row in batch] for batch in batches] == [[1, 2], [3, 4], [5]]
+    assert options[-1]["stream_results"] is True
+    assert options[-1]["yield_per"] == 2
+
+
+def test_dump_todos_ndjson_and_csv():
+    """
+    Test the NDJSON and CSV encodings of the export, with special characters.
+    """
+    rows = [(1, "Café, ☕", 2), (2, 'Quote " and \\ slash', 0), (3, None, None)]
+
+    lines = serializers.dump_todos_ndjson(rows).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": id_, "label": label, "quantity": quantity} for id_, label, quantity in rows]
+
+    content = serializers.dump_todos_csv(rows, header=True).decode()
+    assert list(csv.reader(io.StringIO(content))) == [
+        ["id", "label", "quantity"], ["1", "Café, ☕", "2"], ["2", 'Quote " and \\ slash', "0"],
+        ["3", "", ""]]
+    assert serializers.dump_todos_csv([]) == b""
+
+
+def test_create_todos_in_chunks(sqlite_session, monkeypatch):
+    """
+    Test that bulk creation inserts every item with one commit per chunk, 
+    and keeps the counter row up to date.
+    """
+    monkeypatch.setenv("TODO_COUNT_STRATEGY", "counter")
+    assert crud.count_todos(db=sqlite_session) == 0
+    commit = MagicMock(wraps=sqlite_session.commit)
+    monkeypatch.setattr(sqlite_session, "commit", commit)
+
+    created = crud.create_todos(
+        db=sqlite_session,
+        todos=({"label": f"Todo {i}", "quantity": i} for i in range(7)),
+        chunk_size=3)
+
+    assert created == 7
+    assert commit.call_count == 3
+    assert crud.count_todos(db=sqlite_session) == 7
+    assert counting.exact_count(sqlite_session) == 7
+    assert not any(isinstance(obj, models.Todo) for obj in sqlite_session.identity_map.values())
+
+
+@pytest.mark.parametrize("kwargs, remaining", [
+    ({"ids": [2, 4, 4, 6, 99]}, [1, 3, 5, 7, 8, 9, 10]),
+    ({"min_id": 3, "max_id": 8}, [1, 2, 9, 10]),
+    ({"min_id": 9}, [1, 2, 3, 4, 5, 6, 7, 8]),
+    ({"quantity": 0}, [1, 2, 4, 5, 7, 8, 10]),
+    ({"label": "Todo 5"}, [1, 2, 3, 4, 6, 7, 8, 9, 10]),
+    ({"max_id": 6, "quantity": 0}, [1, 2, 4, 5, 7, 8, 9, 10]),
+    ({"ids": [1, 2, 3], "quantity": 0}, [1, 2, 4, 5, 6, 7, 8, 9, 10]),
+])
+def test_delete_todos(sqlite_session, kwargs, remaining):
+    """
+    Test bulk deletion by IDs, ID range and filters, chunked by 2 IDs.
+    """
+    sqlite_session.add_all(models.Todo(label=f"Todo {i}", quantity=i % 3) for i in range(1, 11))
+    sqlite_session.commit()
+
+    deleted = crud.delete_todos(db=sqlite_session, chunk_size=2, **kwargs)
+
+    ids = sqlite_session.scalars(select(models.Todo.id).order_by(models.Todo.id)).all()
+    assert ids == remaining
+    assert deleted == 10 - len(remaining)
+
+
+def test_delete_todos_statements(sqlite_session):
+    """
+    Test that bulk deletion runs DELETE statements only, one per chunk, each 
+    followed by the increment of the table version.
+    """
+    sqlite_session.add_all(models.Todo(label=f"Todo {i}", quantity=i) for i in range(5))
+    sqlite_session.commit()
+    statements = []
+    event.listen(sqlite_session.get_bind(), "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    crud.delete_todos(db=sqlite_session, ids=[1, 2, 3, 4, 5], chunk_size=3)
+
+    assert len(statements) == 4
+    assert all(statement.startswith("DELETE FROM todos") for statement in statements[::2])
+    assert all(statement.startswith("UPDATE table_versions") for statement in statements[1::2])
+
+
+def test_delete_todos_sparse_range_statements(sqlite_session):
+    """
+    Test that an ID range with sparse IDs is deleted in keyset chunks: one 
+    SELECT of the next IDs and one DELETE per chunk of existing rows, 
+    whatever the gaps between the IDs.
+    """
+    sqlite_session.add_all(models.Todo(id=id_, label="Todo", quantity=1)
+                           for id_ in (1, 2, 1_000_000, 2_000_000, 2_000_001))
+    sqlite_session.commit()
+    statements = []
+    event.listen(sqlite_session.get_bind(), "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    deleted = crud.delete_todos(db=sqlite_session, min_id=1, chunk_size=2)
+
+    assert deleted == 5
+    assert [statement.split()[0] for statement in statements] == \
+        ["SELECT", "DELETE", "UPDATE"] * 3
+    assert sqlite_session.scalars(select(models.Todo.id)).all() == []
+
+
+def test_delete_todos_without_criteria(mock_db_session):
+    """
+    Test that a bulk deletion without criteria is refused.
+    """
+    with pytest.raises(ValueError):
+        crud.delete_todos(db=mock_db_session)
+    mock_db_session.execute.assert_not_called()
+
+
+@pytest.fixture
+def filtered_session(sqlite_session):
+    """
+    Fixture filling the SQLite database with todo items to filter.
+
+    Returns:
+        A `Session` bound to the in-memory database.
+    """
+    sqlite_session.add_all([
+        models.Todo(id=1, label="buy milk", quantity=2),
+        models.Todo(id=2, label="Buy bread", quantity=5),
+        models.Todo(id=3, label="buy 50% off", quantity=9),
+        models.Todo(id=4, label="buy_eggs", quantity=1),
+        models.Todo(id=5, label="clean", quantity=5),
+    ])
+    sqlite_session.commit()
+    return sqlite_session
+
+
+@pytest.mark.parametrize("filters, expected_ids", [
+    (schemas.TodoFilters(label_prefix="buy"), [2, 3, 1, 4]),
+    (schemas.TodoFilters(label_prefix="buy 50%"), [3]),
+    (schemas.TodoFilters(label_prefix="buy_"), [4]),
+    (schemas.TodoFilters(min_quantity=2, max_quantity=5), [1, 2, 5]),
+    (schemas.TodoFilters(max_quantity=1), [4]),
+    (schemas.TodoFilters(label_prefix="buy", min_quantity=2), [2, 3, 1]),
+    (schemas.TodoFilters(search="milk"), [1]),
+    (schemas.TodoFilters(), [1, 2, 3, 4, 5]),
+])
+def test_filters(filtered_session, filters, expected_ids):
+    """
+    Test the filters in both pagination modes, with wildcards in the label prefix 
+    matched literally, and the count of the matching todo items. As with the 
+    default MySQL collation, the prefix is case-insensitive.
+    """
+    total, rows = crud.get_todo_rows(db=filtered_session, filters=filters)
+
+    assert sorted(row.id for row in rows) == sorted(expected_ids)
+    assert total == len(expected_ids)
+    assert sum(_walk_pages(filtered_session, limit=2, filters=filters), []) == expected_ids
+
+
+def test_filters_descending(filtered_session):
+    """
+    Test a filtered listing sorted by descending quantity.
+    """
+    filters = schemas.TodoFilters(min_quantity=2)
+
+    assert _walk_pages(filtered_session, limit=2, order_by="-quantity", filters=filters) == [
+        [3, 5], [2, 1]]
+
+
+def test_search_uses_mysql_fulltext(mock_db_session):
+    """
+    Test that the search filter is a `MATCH ... AGAINST` on MySQL, served by the 
+    FULLTEXT index of the label.
+    """
+    mock_db_session.get_bind.return_value.dialect.name = "mysql"
+
+    crud.get_todo_rows(db=mock_db_session, include_total=False,
+                       filters=schemas.TodoFilters(search="milk"))
+
+    statement = mock_db_session.execute.call_args.args[0]
+    assert "MATCH (todos.label) AGAINST (%s IN BOOLEAN MODE)" in str(
+        statement.compile(dialect=mysql.dialect()))
+    fulltext = [index for index in models.Todo.__table__.indexes
+                if index.dialect_options["mysql"]["prefix"] == "FULLTEXT"]
+    assert [index.expressions for index in fulltext] == [[models.Todo.__table__.c.label]]
+
+
+@pytest.fixture
+def explained_session():
+    """
+    Fixture recording the query plan of every statement run on a SQLite database 
+    holding enough todo items for its planner to prefer the indexes.
+
+    SQLite only uses an index for `LIKE 'prefix%'` when `LIKE` is case-sensitive, 
+    as the index is; MySQL compares both with the column collation.
+
+    Yields:
+        tuple: The session and the list of the plans, as lists of plan lines.
+    """
+    engine = create_engine("sqlite://")
+    plans = []
+
+    @event.listens_for(engine, "connect")
+    def case_sensitive_like(dbapi_connection, _record):
+        dbapi_connection.execute("PRAGMA case_sensitive_like = ON")
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def explain(connection, cursor, statement, parameters, *_):
+        if statement.startswith("SELECT"):
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append([row[-1] for row in plan])
+
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.execute(insert(models.Todo), [
+        {"label": f"Todo {i}", "quantity": i % 1000} for i in range(20000)])
+    session.commit()
+    try:
+        yield session, plans
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.mark.parametrize("filters", [
+    schemas.TodoFilters(label_prefix="Todo 12"),
+    schemas.TodoFilters(min_quantity=990),
+    schemas.TodoFilters(max_quantity=10),
+    schemas.TodoFilters(min_quantity=10, max_quantity=20),
+    schemas.TodoFilters(label_prefix="Todo 12", max_quantity=20),
+])
+def test_filters_use_indexes(explained_session, filters):
+    """
+    Test with `EXPLAIN QUERY PLAN` that no filtered listing, page or count 
+    scans the table: every query searches an index.
+    """
+    db, plans = explained_session
+
+    crud.get_todo_rows(db=db, limit=10, filters=filters)
+    _, cursor = crud.get_todos_page(db=db, limit=10, filters=filters)
+    crud.get_todos_page(db=db, limit=10, cursor=cursor, filters=filters)
+
+    assert len(plans) == 4
+    for plan in plans:
+        assert all(line.startswith("SEARCH todos USING") for line in plan if "todos" in line), plan
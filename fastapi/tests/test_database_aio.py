@@ -0,0 +1,132 @@
+# pylint: disable=redefined-outer-name
+"""
+Unit tests for the asynchronous database layer.
+"""
+import asyncio
+import threading
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from database import aio, schemas
+from database.database import Base
+from database.pool import TimedAsyncAdaptedQueuePool
+from database.routing import ReplicaSet, RoutingSession
+
+SETTINGS = {"pool_size": 2, "max_overflow": 0, "pool_timeout": 5,
+            "pool_recycle": -1, "pool_pre_ping": False, "echo": False}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """
+    Fixture that creates the tables in a temporary SQLite database.
+
+    Returns:
+        Path: The path of the database file.
+    """
+    path = tmp_path / "aio.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return path
+
+
+def test_is_enabled(monkeypatch):
+    """
+    Test that the asynchronous layer is disabled unless "DB_ASYNC" is true.
+    """
+    monkeypatch.delenv("DB_ASYNC", raising=False)
+    assert aio.is_enabled() is False
+    monkeypatch.setenv("DB_ASYNC", "TRUE")
+    assert aio.is_enabled() is True
+
+
+def test_crud_on_async_session(db_path):
+    """
+    Test that the async `crud` functions work on an `AsyncSession`.
+
+    Asserts:
+        - Todos are created, listed, counted and deleted.
+        - The engine uses the timed pool, whose statistics are recorded.
+    """
+    async def scenario():
+        engine = aio.create_async_db_engine(f"sqlite+aiosqlite:///{db_path}", SETTINGS)
+        assert isinstance(engine.pool, TimedAsyncAdaptedQueuePool)
+        async with async_sessionmaker(bind=engine, expire_on_commit=False)() as db:
+            todo = await aio.create_todo(db, todo=schemas.TodoCreate(label="a", quantity=1))
+            inserted = await aio.create_todos(db, todos=[
+                {"label": "b", "quantity": 2}, {"label": "c", "quantity": 3}])
+            total, rows = await aio.get_todo_rows(db, skip=0, limit=10)
+            page, _ = await aio.get_todos_page(db, limit=1, after_id=todo.id)
+            deleted = await aio.delete_todos(db, ids=[todo.id])
+            count = await aio.count_todos(db)
+        checkouts = engine.pool.stats()["checkouts"]
+        await engine.dispose()
+        return todo.label, inserted, total, [tuple(row) for row in rows], \
+            [tuple(row) for row in page], deleted, count, checkouts
+
+    label, inserted, total, rows, page, deleted, count, checkouts = asyncio.run(scenario())
+
+    assert label == "a"
+    assert inserted == 2
+    assert total == 3
+    assert rows == [(1, "a", 1), (2, "b", 2), (3, "c", 3)]
+    assert page == [(2, "b", 2)]
+    assert deleted == 1
+    assert count == 2
+    assert checkouts >= 1
+
+
+def test_run_on_sync_session_uses_threadpool(db_path):
+    """
+    Test that a regular `Session` is used on the threadpool, off the event loop.
+    """
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    db = sessionmaker(bind=engine)()
+
+    async def scenario():
+        loop_thread = threading.current_thread()
+        thread = await aio.run(db, lambda _db: threading.current_thread())
+        total, _ = await aio.get_todo_rows(db, skip=0, limit=10)
+        return thread is not loop_thread, total
+
+    off_loop, total = asyncio.run(scenario())
+
+    assert off_loop is True
+    assert total == 0
+    db.close()
+    engine.dispose()
+
+
+def test_async_session_routes_reads_to_replicas(db_path, tmp_path):
+    """
+    Test that an `AsyncSession` on a `RoutingSession` reads from the replicas.
+    """
+    replica_path = tmp_path / "replica.db"
+    engine = create_engine(f"sqlite:///{replica_path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    async def scenario():
+        primary = aio.create_async_db_engine(f"sqlite+aiosqlite:///{db_path}", SETTINGS)
+        replica = aio.create_async_db_engine(f"sqlite+aiosqlite:///{replica_path}", SETTINGS)
+        factory = async_sessionmaker(
+            bind=primary, expire_on_commit=False, sync_session_class=RoutingSession,
+            replicas=ReplicaSet([replica.sync_engine]))
+        async with factory() as db:
+            await aio.create_todo(db, todo=schemas.TodoCreate(label="a", quantity=1))
+            replica_total, _ = await aio.get_todo_rows(db, skip=0, limit=10)
+        await primary.dispose()
+        await replica.dispose()
+        return replica_total
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_get_pool_stats_before_first_use():
+    """
+    Test that no asynchronous pool statistics are reported before the engine is built.
+    """
+    asyncio.run(aio.dispose())
+    assert aio.get_pool_stats() is None
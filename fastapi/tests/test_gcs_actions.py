@@ -2,9 +2,11 @@
 """
 Unit tests for the GCS actions.
 """
+import io
 from unittest import mock
 import pytest
-from storage.actions import list_objects, put_object, delete_object, get_object
+from storage.actions import (reset_backend, list_objects, put_object, upload_object,
+                             delete_object, delete_objects, get_object, stream_object, stream_object_range)
 
 BUCKET_NAME = 'test-bucket'
 
@@ -24,6 +26,7 @@ def gcs_client(monkeypatch):
     """
     monkeypatch.setenv('OBJECT_BUCKET', BUCKET_NAME)
     monkeypatch.setenv('OBJECT_BUCKET_TYPE', "GCS")
+    reset_backend()
 
     # Mock the storage.Client class and its methods
     with mock.patch('google.cloud.storage.Client') as mock_client:
@@ -54,9 +57,10 @@ def test_list_objects_with_data(gcs_client):
     mock_blob_2 = mock.Mock()
     mock_blob_2.name = "testfile2.txt"
 
-    mock_bucket.list_blobs.return_value = [mock_blob_1, mock_blob_2]
+    mock_bucket.list_blobs.return_value = mock.Mock(
+        pages=iter([[mock_blob_1, mock_blob_2]]), next_page_token="next-page")
 
-    objects = list_objects()
+    objects, next_cursor = list_objects(prefix="test", limit=2, cursor="this-page")
 
     expected_objects = [
         {"name": "testfile1.txt", "path": "gs://test-bucket/testfile1.txt"},
@@ -64,6 +68,9 @@ def test_list_objects_with_data(gcs_client):
     ]
 
     assert objects == expected_objects
+    assert next_cursor == "next-page"
+    mock_bucket.list_blobs.assert_called_once_with(
+        prefix="test", max_results=2, page_token="this-page")
 
 
 def test_list_objects_with_no_data(gcs_client):
@@ -78,11 +85,12 @@ def test_list_objects_with_no_data(gcs_client):
         by the gcs_client fixture.
     """
     _, mock_bucket, _ = gcs_client
-    mock_bucket.list_blobs.return_value = []
+    mock_bucket.list_blobs.return_value = mock.Mock(pages=iter([]), next_page_token=None)
 
-    objects = list_objects()
+    objects, next_cursor = list_objects()
 
     assert objects == []
+    assert next_cursor is None
 
 
 def test_put_object(gcs_client):
@@ -160,3 +168,103 @@ def test_get_object(gcs_client):
     downloaded_content = get_object(object_name)
 
     assert downloaded_content == expected_content
+
+
+def test_upload_object(gcs_client):
+    """
+    Test streaming an object into the GCS bucket with a resumable upload.
+
+    Args:
+        gcs_client (tuple): The mocked GCS client, bucket, and blob provided 
+        by the gcs_client fixture.
+
+    Asserts:
+        - The blob chunk size is rounded up to a multiple of 256 KiB.
+        - The file-like object is handed to the blob without being read.
+    """
+    _, mock_bucket, mock_blob = gcs_client
+    fileobj = io.BytesIO(b"Hello, this is a streamed file.")
+
+    gcs_path = upload_object("myfile.txt", fileobj, part_size=5 * 1024 * 1024 + 1)
+
+    mock_bucket.blob.assert_called_once_with("myfile.txt", chunk_size=21 * 256 * 1024)
+    mock_blob.upload_from_file.assert_called_once_with(fileobj, content_type=None)
+    assert fileobj.tell() == 0
+    assert gcs_path == f"gs://{BUCKET_NAME}/myfile.txt"
+
+
+def test_stream_object(gcs_client):
+    """
+    Test streaming an object from the GCS bucket chunk by chunk.
+
+    Args:
+        gcs_client (tuple): The mocked GCS client, bucket, and blob provided 
+        by the gcs_client fixture.
+
+    Asserts:
+        - The metadata comes from the reloaded blob.
+        - The content is read through `blob.open("rb")` in chunks.
+    """
+    _, _, mock_blob = gcs_client
+    mock_blob.size = 10
+    mock_blob.content_type = "text/plain"
+    mock_blob.etag = "CJC2"
+    mock_blob.open.return_value = mock.MagicMock()
+    reader = mock_blob.open.return_value.__enter__.return_value
+    reader.read.side_effect = [b"01234", b"56789", b""]
+
+    info, chunks = stream_object("testfile.txt", chunk_size=5)
+
+    mock_blob.reload.assert_called_once()
+    assert info == {"content_length": 10, "content_type": "text/plain", "etag": "CJC2"}
+    assert list(chunks) == [b"01234", b"56789"]
+    mock_blob.open.assert_called_once_with("rb", chunk_size=5)
+
+
+def test_stream_object_range(gcs_client):
+    """
+    Test streaming a byte range of an object from the GCS bucket.
+
+    Args:
+        gcs_client (tuple): The mocked GCS client, bucket, and blob provided 
+        by the gcs_client fixture.
+
+    Asserts:
+        - Each chunk is downloaded with bounded `start`/`end` offsets.
+    """
+    _, _, mock_blob = gcs_client
+    mock_blob.download_as_bytes.side_effect = [b"file", b" 1"]
+
+    chunks = list(stream_object_range("testfile.txt", 5, 10, chunk_size=4))
+
+    assert chunks == [b"file", b" 1"]
+    assert mock_blob.download_as_bytes.call_args_list == [
+        mock.call(start=5, end=8), mock.call(start=9, end=10)]
+
+
+def test_delete_objects(gcs_client):
+    """
+    Test deleting several objects from the GCS bucket with a batch request.
+
+    Args:
+        gcs_client (tuple): The mocked GCS client, bucket, and blob provided 
+        by the gcs_client fixture.
+
+    Asserts:
+        - Each deletion is deferred in the batch, and failures are reported per key.
+    """
+    mock_client, mock_bucket, _ = gcs_client
+    batch = mock.MagicMock()
+    batch.__enter__.return_value = batch
+    batch._responses = [  # pylint: disable=protected-access
+        mock.Mock(status_code=204), mock.Mock(status_code=404, reason="Not Found")]
+    mock_client.return_value.batch.return_value = batch
+
+    results = delete_objects(names=["a.txt", "missing.txt"])
+
+    mock_client.return_value.batch.assert_called_once_with(raise_exception=False)
+    assert mock_bucket.delete_blob.call_args_list == [mock.call("a.txt"), mock.call("missing.txt")]
+    assert results == [
+        {"name": "a.txt", "deleted": True, "error": None},
+        {"name": "missing.txt", "deleted": False, "error": "404: Not Found"},
+    ]
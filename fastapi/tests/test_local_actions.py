@@ -0,0 +1,152 @@
+# pylint: disable=redefined-outer-name
+"""
+Unit tests for the local filesystem actions.
+"""
+import io
+import pytest
+from storage.actions import (reset_backend, list_objects, put_object, upload_object,
+                             delete_object, delete_objects, get_object, get_local_path, stat_object,
+                             stream_object, stream_object_range)
+from storage.backends import ObjectNotFound, StorageError
+
+BUCKET_NAME = 'test-bucket'
+
+
+@pytest.fixture(autouse=True)
+def bucket_dir(monkeypatch, tmp_path):
+    """
+    Fixture that selects the local filesystem backend on a temporary directory.
+
+    Environment Variables Set:
+        - OBJECT_BUCKET: The name of the bucket (set to 'test-bucket').
+        - OBJECT_BUCKET_TYPE: The storage type (set to 'LOCAL').
+        - OBJECT_LOCAL_ROOT: The temporary directory holding the bucket.
+
+    Yields:
+        pathlib.Path: The directory of the bucket.
+    """
+    monkeypatch.setenv('OBJECT_BUCKET', BUCKET_NAME)
+    monkeypatch.setenv('OBJECT_BUCKET_TYPE', "LOCAL")
+    monkeypatch.setenv('OBJECT_LOCAL_ROOT', str(tmp_path))
+    reset_backend()
+    yield tmp_path / BUCKET_NAME
+    reset_backend()
+
+
+def test_put_and_get_object(bucket_dir):
+    """
+    Test writing an object and reading it back from the local bucket.
+
+    Args:
+        bucket_dir (pathlib.Path): The directory of the bucket.
+
+    Asserts:
+        - The object is stored as a file, under a sub-directory for keys with slashes.
+        - The returned path and content match.
+    """
+    path = put_object("docs/readme.txt", b"Hello")
+
+    assert (bucket_dir / "docs" / "readme.txt").read_bytes() == b"Hello"
+    assert path == f"file://{bucket_dir.resolve()}/docs/readme.txt"
+    assert get_object("docs/readme.txt") == b"Hello"
+    assert get_local_path("docs/readme.txt") == str((bucket_dir / "docs" / "readme.txt").resolve())
+
+
+def test_upload_object_in_chunks():
+    """
+    Test streaming a file-like object to the local bucket.
+
+    Asserts:
+        - The content is copied entirely and no temporary file is listed.
+    """
+    content = b"0123456789" * 1000
+
+    path = upload_object("big.bin", io.BytesIO(content), part_size=64)
+
+    assert get_object("big.bin") == content
+    assert list_objects() == ([{"name": "big.bin", "path": path}], None)
+
+
+def test_list_objects_paginated():
+    """
+    Test listing the local bucket page by page, filtered by prefix.
+
+    Asserts:
+        - Keys are listed in lexicographic order and the cursor resumes after the last key.
+    """
+    for name in ["logs/b.txt", "logs/a.txt", "logs/sub/c.txt", "other.txt"]:
+        put_object(name, b"content")
+
+    first_page, cursor = list_objects(prefix="logs/", limit=2)
+    second_page, last_cursor = list_objects(prefix="logs/", limit=2, cursor=cursor)
+
+    assert [obj["name"] for obj in first_page] == ["logs/a.txt", "logs/b.txt"]
+    assert cursor == "logs/b.txt"
+    assert [obj["name"] for obj in second_page] == ["logs/sub/c.txt"]
+    assert last_cursor is None
+
+
+def test_stream_object_and_range():
+    """
+    Test streaming an object and a byte range of it from the local bucket.
+
+    Asserts:
+        - The metadata is derived from the file and its name.
+        - Only the requested bytes are read.
+    """
+    put_object("page.html", b"<p>Hello</p>")
+
+    info, chunks = stream_object("page.html", chunk_size=5)
+
+    assert info == stat_object("page.html")
+    assert info["content_length"] == 12 and info["content_type"] == "text/html"
+    assert list(chunks) == [b"<p>He", b"llo</", b"p>"]
+    assert list(stream_object_range("page.html", 3, 7, chunk_size=3)) == [b"Hel", b"lo"]
+
+
+def test_delete_object():
+    """
+    Test deleting an object from the local bucket.
+
+    Asserts:
+        - The object is removed, and deleting it again raises ObjectNotFound.
+    """
+    put_object("testfile.txt", b"content")
+
+    delete_object("testfile.txt")
+
+    assert list_objects() == ([], None)
+    with pytest.raises(ObjectNotFound):
+        delete_object("testfile.txt")
+
+
+@pytest.mark.parametrize("name", ["../escape.txt", "/etc/passwd", "a/../../escape.txt", ""])
+def test_object_names_stay_in_bucket(name):
+    """
+    Test that object names cannot point outside the bucket directory.
+
+    Asserts:
+        - StorageError is raised.
+    """
+    with pytest.raises(StorageError):
+        put_object(name, b"content")
+
+
+def test_delete_objects():
+    """
+    Test deleting several objects from the local bucket, by name and by prefix.
+
+    Asserts:
+        - Missing objects are reported as failures without stopping the batch.
+    """
+    for name in ["a.txt", "tmp/b.txt", "tmp/c.txt"]:
+        put_object(name, b"content")
+
+    by_name = delete_objects(names=["a.txt", "missing.txt"])
+    by_prefix = delete_objects(prefix="tmp/")
+
+    assert [(result["name"], result["deleted"]) for result in by_name] == [
+        ("a.txt", True), ("missing.txt", False)]
+    assert [(result["name"], result["deleted"]) for result in by_prefix] == [
+        ("tmp/b.txt", True), ("tmp/c.txt", True)]
+    assert list_objects() == ([], None)
@@ -2,11 +2,19 @@
 """
 Test module for FastAPI endpoints related to Todo items.
 """
+import asyncio
+import json
 from unittest.mock import MagicMock, patch
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.exc import NoResultFound
 import pytest
-from main import app, get_db
+from main import app, get_db, get_sessionmaker
+from database import models, page_cache
+from database.database import Base
+from database.schemas import TodoFilters
+from database.versioning import get_version as read_table_version
+from storage import actions, schemas as storageSchemas, serializers as storageSerializers
 from botocore.exceptions import ClientError
 from fastapi.testclient import TestClient
 
@@ -44,6 +52,19 @@ def override_get_db(db_session_mock):
     app.dependency_overrides[get_db] = lambda: db_session_mock
 
 
+@pytest.fixture(autouse=True)
+def table_version():
+    """
+    Fixture to mock the version of the todos table, read by the todo 
+    endpoints for their ETag.
+
+    Yields:
+        MagicMock: The mock of `versioning.get_version`, returning 1.
+    """
+    with patch("database.versioning.get_version", return_value=1) as mock_version:
+        yield mock_version
+
+
 @pytest.fixture
 def override_storage_utils():
     """
@@ -53,10 +74,11 @@ def override_storage_utils():
     simulate Storage interactions, ensuring tests do not require real
     AWS credentials or a live Storage bucket.
     """
-    with patch("storage.actions.put_object") as mock_put, \
+    with patch("storage.actions.upload_object") as mock_put, \
             patch("storage.actions.list_objects") as mock_list, \
             patch("storage.actions.delete_object") as mock_delete, \
-            patch("storage.actions.get_object") as mock_get:
+            patch("storage.actions.stream_object") as mock_get, \
+            patch("storage.actions.get_local_path", return_value=None):
         yield mock_put, mock_list, mock_delete, mock_get
 
 
@@ -86,18 +108,275 @@ def test_get_todos(db_session_mock):
         db_session_mock (MagicMock): The mocked database session.
     """
     mock_todos = [{"id": 1, "label": "Test Todo", "quantity": 1}]
-    query = db_session_mock.query
-    query.return_value.offset.return_value.limit.return_value.all.return_value = mock_todos
-    query.return_value.count.return_value = 1
+    mock_rows = [(1, "Test Todo", 1)]
 
-    with patch("database.crud.get_todos", return_value=(1, mock_todos)):
+    with patch("database.crud.get_todo_rows", return_value=(1, mock_rows)) as mock_get_rows:
         response = client.get("/todos?skip=0&limit=10")
 
     assert response.status_code == 200
     assert response.json() == {
         "total": 1,
-        "todos": mock_todos
+        "todos": mock_todos,
+        "next_cursor": None
     }
+    mock_get_rows.assert_called_once_with(
+        db_session_mock, skip=0, limit=10, include_total=True, filters=TodoFilters())
+
+
+def test_get_todos_keyset():
+    """
+    Test the GET /todos endpoint in keyset mode returns the next cursor.
+    """
+    mock_todos = [{"id": 11, "label": "Test Todo", "quantity": 1}]
+    mock_rows = [(11, "Test Todo", 1)]
+
+    with patch("database.crud.get_todos_page", return_value=(mock_rows, "next")) as mock_page, \
+            patch("database.crud.count_todos", return_value=20):
+        response = client.get("/todos?cursor=abc&limit=1&order_by=label")
+
+    assert response.status_code == 200
+    assert response.json() == {"total": 20, "todos": mock_todos, "next_cursor": "next"}
+    assert mock_page.call_args.kwargs["cursor"] == "abc"
+    assert mock_page.call_args.kwargs["order_by"] == "label"
+
+
+def test_get_todos_without_total():
+    """
+    Test the GET /todos endpoint skips the count with `include_total=false`.
+    """
+    with patch("database.crud.get_todo_rows", return_value=(None, [])) as mock_get_todos:
+        response = client.get("/todos?include_total=false")
+
+    assert response.status_code == 200
+    assert response.json() == {"total": None, "todos": [], "next_cursor": None}
+    assert mock_get_todos.call_args.kwargs["include_total"] is False
+
+
+def test_get_todos_page_cache(monkeypatch):
+    """
+    Test the GET /todos endpoint serves repeated pages from the page cache, 
+    until a todo is created.
+    """
+    monkeypatch.setattr(page_cache, "_page_cache", page_cache.PageCache(ttl=60))
+    created = {"id": 2, "label": "New", "quantity": 1}
+
+    with patch("database.crud.get_todo_rows", return_value=(1, [(1, "Todo", 1)])) as mock_get_rows, \
+            patch("database.crud.create_todo", return_value=created):
+        first = client.get("/todos?skip=0&limit=10")
+        second = client.get("/todos?limit=10&skip=0")
+        assert mock_get_rows.call_count == 1
+        client.post("/todos", json={"label": "New", "quantity": 1})
+        client.get("/todos?skip=0&limit=10")
+        assert mock_get_rows.call_count == 2
+
+    assert first.content == second.content
+    assert client.get("/metrics").json()["database"]["page_cache"]["hits"] == 1
+
+
+def test_get_todos_page_cache_on_fresh_schema(tmp_path, monkeypatch, table_version):
+    """
+    Test the GET /todos endpoint caches the pages of a schema created without 
+    the startup of the application: the missing version row is seeded by the 
+    first read, and the pages are cached under it.
+    """
+    table_version.side_effect = read_table_version
+    monkeypatch.setattr(page_cache, "_page_cache", page_cache.PageCache(ttl=60))
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}",
+                           connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    fill(engine, 3)
+    app.dependency_overrides[get_db] = lambda: Session(bind=engine)
+    try:
+        first = client.get("/todos?limit=2")
+        second = client.get("/todos?limit=2")
+    finally:
+        engine.dispose()
+
+    assert first.content == second.content
+    assert first.headers["ETag"].startswith('"todos-')
+    assert page_cache.get_page_cache().stats()["hits"] == 1
+
+
+def test_get_todos_not_modified(table_version):
+    """
+    Test the GET /todos endpoint answers a matching `If-None-Match` with a 304, 
+    without reading the page, and sends the new page once the table changed.
+    """
+    with patch("database.crud.get_todo_rows", return_value=(1, [(1, "Todo", 1)])) as mock_get_rows:
+        first = client.get("/todos")
+        etag = first.headers["ETag"]
+        not_modified = client.get("/todos", headers={"If-None-Match": f'"other", W/{etag}'})
+        assert mock_get_rows.call_count == 1
+        table_version.return_value = 2
+        modified = client.get("/todos", headers={"If-None-Match": etag})
+
+    assert (first.status_code, etag, first.headers["Cache-Control"]) == (200, '"todos-1"', "no-cache")
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == f"W/{etag}"
+    assert not_modified.content == b""
+    assert modified.status_code == 200
+    assert modified.headers["ETag"] == '"todos-2"'
+
+
+def test_get_todos_without_version(table_version):
+    """
+    Test the GET /todos endpoint sends no ETag when the table version is unknown.
+    """
+    table_version.return_value = None
+    with patch("database.crud.get_todo_rows", return_value=(0, [])):
+        response = client.get("/todos", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_get_todo():
+    """
+    Test the GET /todos/{todo_id} endpoint returns the todo item, with an ETag 
+    answering later requests with a 304 once the item is found.
+    """
+    with patch("database.crud.get_todo_row", return_value=(1, "Todo", 2)) as mock_get_row:
+        response = client.get("/todos/1")
+        not_modified = client.get("/todos/1", headers={"If-None-Match": response.headers["ETag"]})
+        any_copy = client.get("/todos/1", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "label": "Todo", "quantity": 2}
+    assert not_modified.status_code == any_copy.status_code == 304
+    assert not_modified.content == b""
+    assert mock_get_row.call_args.kwargs["todo_id"] == 1
+
+
+def test_get_todo_not_found():
+    """
+    Test the GET /todos/{todo_id} endpoint returns a 404 for an unknown ID, 
+    even to a conditional request matching the ETag of the table.
+    """
+    with patch("database.crud.get_todo_row", return_value=None):
+        response = client.get("/todos/42")
+        any_copy = client.get("/todos/42", headers={"If-None-Match": "*"})
+        table_copy = client.get("/todos/42", headers={"If-None-Match": '"todos-1"'})
+
+    assert response.status_code == any_copy.status_code == table_copy.status_code == 404
+    assert response.json() == {"detail": "Todo not found"}
+
+
+def test_get_todos_filters():
+    """
+    Test the GET /todos endpoint passes its filters down, in both pagination modes.
+    """
+    with patch("database.crud.get_todo_rows", return_value=(0, [])) as mock_get_rows:
+        response = client.get("/todos?label_prefix=buy&min_quantity=2&max_quantity=5")
+
+    assert response.status_code == 200
+    assert mock_get_rows.call_args.kwargs["filters"] == TodoFilters(
+        label_prefix="buy", min_quantity=2, max_quantity=5)
+
+    with patch("database.crud.get_todos_page", return_value=([], None)) as mock_page, \
+            patch("database.crud.count_todos", return_value=0) as mock_count:
+        response = client.get("/todos?search=milk&order_by=-quantity")
+
+    assert response.status_code == 200
+    assert mock_page.call_args.kwargs["filters"] == TodoFilters(search="milk")
+    assert mock_page.call_args.kwargs["order_by"] == "-quantity"
+    assert mock_count.call_args.kwargs["filters"] == TodoFilters(search="milk")
+
+
+@pytest.mark.parametrize("query", [
+    "min_quantity=5&max_quantity=2",
+    "label_prefix=",
+])
+def test_get_todos_invalid_filters(query):
+    """
+    Test the GET /todos endpoint rejects empty filters and empty quantity ranges.
+    """
+    response = client.get(f"/todos?{query}")
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("query", [
+    "cursor=abc&skip=10",
+    "after_id=1&limit=0",
+    "cursor=not-a-cursor",
+    "order_by=password",
+])
+def test_get_todos_keyset_invalid(query):
+    """
+    Test the GET /todos endpoint rejects invalid keyset pagination parameters.
+    """
+    response = client.get(f"/todos?{query}")
+
+    assert response.status_code in (400, 422)
+
+
+@pytest.fixture
+def export_database(tmp_path, monkeypatch):
+    """
+    Fixture serving the exports from a SQLite database holding 5 todo items, 
+    fetched 2 rows at a time.
+
+    Yields:
+        Engine: The engine of the database.
+    """
+    monkeypatch.setenv("TODO_EXPORT_BATCH_SIZE", "2")
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}",
+                           connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    app.dependency_overrides[get_sessionmaker] = lambda: sessionmaker(bind=engine)
+    yield engine
+    del app.dependency_overrides[get_sessionmaker]
+    engine.dispose()
+
+
+def fill(engine, count):
+    """
+    Insert `count` todo items.
+    """
+    with engine.begin() as connection:
+        connection.execute(insert(models.Todo), [
+            {"label": f"Todo, {i}", "quantity": i} for i in range(count)])
+
+
+def test_export_todos_ndjson(export_database):
+    """
+    Test the GET /todos/export endpoint streams every todo item as NDJSON.
+    """
+    fill(export_database, 5)
+
+    response = client.get("/todos/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="todos.ndjson"'
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"id": i + 1, "label": f"Todo, {i}", "quantity": i} for i in range(5)]
+
+
+def test_export_todos_csv(export_database):
+    """
+    Test the GET /todos/export endpoint streams a CSV document, with its 
+    header even when there is no todo item.
+    """
+    response = client.get("/todos/export?format=csv")
+    assert response.text == "id,label,quantity\r\n"
+
+    fill(export_database, 3)
+    response = client.get("/todos/export?format=csv")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.text.splitlines() == [
+        "id,label,quantity", '1,"Todo, 0",0', '2,"Todo, 1",1', '3,"Todo, 2",2']
+
+
+def test_export_todos_invalid_format():
+    """
+    Test the GET /todos/export endpoint rejects unknown formats.
+    """
+    response = client.get("/todos/export?format=xml")
+
+    assert response.status_code == 422
 
 
 def test_post_todo_success():
@@ -127,6 +406,143 @@ def test_post_todo_success():
     assert response.json() == created_todo
 
 
+def _consume_todos(db, todos, chunk_size):  # pylint: disable=unused-argument
+    """
+    Stand-in for `crud.create_todos` that counts the items it is given.
+    """
+    return len(list(todos))
+
+
+def test_post_todos_bulk():
+    """
+    Test the POST /todos/bulk endpoint creates every todo of the array.
+    """
+    todos = [{"label": f"Todo {i}", "quantity": i} for i in range(3)]
+
+    with patch("database.crud.create_todos", side_effect=_consume_todos) as mock_create:
+        response = client.post("/todos/bulk?chunk_size=2", json=todos)
+
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 3}
+    assert mock_create.call_count == 2
+
+
+def test_post_todos_bulk_invalid():
+    """
+    Test the POST /todos/bulk endpoint rejects the array if an item is invalid.
+    """
+    with patch("database.crud.create_todos") as mock_create:
+        response = client.post("/todos/bulk", json=[{"label": "ok", "quantity": 1},
+                                                    {"label": "missing quantity"}])
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["item"] == 1
+    mock_create.assert_not_called()
+
+
+def test_post_todos_bulk_streamed_in_chunks():
+    """
+    Test the POST /todos/bulk endpoint validates and inserts the array chunk 
+    by chunk as it arrives, whatever the boundaries of the body chunks, and 
+    reports the first invalid item and how many todos were inserted before it.
+    """
+    body = json.dumps([{"label": f"Todo {i}", "quantity": i} for i in range(5)]
+                      + [{"label": "missing quantity"}]).encode()
+
+    with patch("database.crud.create_todos", side_effect=_consume_todos) as mock_create:
+        response = client.post("/todos/bulk?chunk_size=2",
+                               content=(body[i:i + 7] for i in range(0, len(body), 7)))
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["item"] == 5
+    assert response.json()["detail"]["inserted"] == 4
+    assert mock_create.call_count == 2
+
+
+@pytest.mark.parametrize("body", [b'{"label": "a", "quantity": 1}', b"[1] 2", b"[1, 2"])
+def test_post_todos_bulk_not_an_array(body):
+    """
+    Test the POST /todos/bulk endpoint rejects a body that is not a JSON array.
+    """
+    response = client.post("/todos/bulk", content=body)
+
+    assert response.status_code == 422
+
+
+def test_post_todos_bulk_item_too_large():
+    """
+    Test the POST /todos/bulk endpoint rejects an item larger than the limit 
+    with a 413 while reading it, without receiving the rest of the body.
+    """
+    chunks = [b'[{"label": "'] + [b"a" * 65536] * 64 + [b'", "quantity": 1}]']
+    received, messages = [], []
+
+    async def receive():
+        chunk = chunks[len(received)]
+        received.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": len(received) < len(chunks)}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+             "method": "POST", "scheme": "http", "path": "/todos/bulk", "raw_path": b"",
+             "query_string": b"", "root_path": "", "server": ("test", 80),
+             "headers": [(b"host", b"test"), (b"content-type", b"application/json")]}
+    with patch("database.crud.create_todos") as mock_create:
+        asyncio.run(app(scope, receive, send))
+
+    assert messages[0]["status"] == 413
+    assert len(received) < 20
+    mock_create.assert_not_called()
+
+
+def test_post_todos_import():
+    """
+    Test the POST /todos/import endpoint inserts a NDJSON body chunk by chunk.
+    """
+    body = b"".join(b'{"label": "Todo %d", "quantity": %d}\n' % (i, i) for i in range(5))
+
+    with patch("database.crud.create_todos", side_effect=_consume_todos) as mock_create:
+        response = client.post("/todos/import?chunk_size=2", content=body + b"\n",
+                               headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 5}
+    assert mock_create.call_count == 3
+
+
+def test_post_todos_import_invalid_line():
+    """
+    Test the POST /todos/import endpoint reports the first invalid line, and 
+    how many todos were inserted before it.
+    """
+    body = b'{"label": "a", "quantity": 1}\n{"label": "b", "quantity": 2}\n{bad\n'
+
+    with patch("database.crud.create_todos", side_effect=_consume_todos):
+        response = client.post("/todos/import?chunk_size=2", content=body)
+
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["line"] == 3
+    assert detail["inserted"] == 2
+    assert detail["errors"][0]["type"] == "json_invalid"
+
+
+def test_post_todos_import_line_too_long():
+    """
+    Test the POST /todos/import endpoint rejects a line larger than the limit 
+    with a 413, even when it arrives complete in one chunk.
+    """
+    body = b'{"label": "' + b"a" * (2 * 1024 * 1024) + b'", "quantity": 1}\n'
+
+    with patch("database.crud.create_todos") as mock_create:
+        response = client.post("/todos/import", content=body)
+
+    assert response.status_code == 413
+    mock_create.assert_not_called()
+
+
 def test_delete_todo_success():
     """
     Test the DELETE /todos/{todo_id} endpoint for successful deletion.
@@ -150,6 +566,51 @@ def test_delete_todo_success():
     assert response.json() == todo_item
 
 
+def test_delete_todo_without_echo():
+    """
+    Test the DELETE /todos/{todo_id} endpoint with `echo=false` deletes the 
+    todo with a single statement and returns no content.
+    """
+    with patch("database.crud.delete_todos", return_value=1) as mock_delete, \
+            patch("database.crud.delete_todo") as mock_delete_echo:
+        response = client.delete("/todos/1?echo=false")
+
+    assert response.status_code == 204
+    assert response.content == b""
+    assert mock_delete.call_args.kwargs["ids"] == [1]
+    mock_delete_echo.assert_not_called()
+
+    with patch("database.crud.delete_todos", return_value=0):
+        response = client.delete("/todos/999?echo=false")
+
+    assert response.status_code == 404
+
+
+def test_delete_todos_bulk():
+    """
+    Test the DELETE /todos endpoint deletes the selected todos in bulk.
+    """
+    with patch("database.crud.delete_todos", return_value=3) as mock_delete:
+        response = client.request("DELETE", "/todos", json={"min_id": 10, "quantity": 0})
+
+    assert response.status_code == 200
+    assert response.json() == {"deleted": 3}
+    kwargs = mock_delete.call_args.kwargs
+    assert (kwargs["min_id"], kwargs["quantity"], kwargs["ids"]) == (10, 0, None)
+
+
+@pytest.mark.parametrize("body", [{}, {"ids": []}])
+def test_delete_todos_bulk_invalid(body):
+    """
+    Test the DELETE /todos endpoint refuses requests that select nothing.
+    """
+    with patch("database.crud.delete_todos") as mock_delete:
+        response = client.request("DELETE", "/todos", json=body)
+
+    assert response.status_code == 422
+    mock_delete.assert_not_called()
+
+
 def test_delete_todo_not_found():
     """
     Test the DELETE /todos/{todo_id} endpoint when todo is not found.
@@ -217,15 +678,43 @@ def test_get_objects_success(override_storage_utils):
     asserts that the response matches the expected structure.
     """
     _, mock_list, _, _ = override_storage_utils
-    mock_list.return_value = [
+    files = [
         {"name": "myfile.txt", "path": "s3://your-bucket/myfile.txt"},
         {"name": "anotherfile.txt", "path": "s3://your-bucket/anotherfile.txt"}
     ]
+    mock_list.return_value = (files, "next-page")
 
-    response = client.get("/objects")
+    response = client.get("/objects?limit=2&prefix=my&cursor=this-page")
 
     assert response.status_code == 200
-    assert response.json() == {"files": mock_list.return_value}
+    assert response.json() == {"files": files, "next_cursor": "next-page"}
+    mock_list.assert_called_once_with(prefix="my", limit=2, cursor="this-page")
+
+
+def test_dump_list_files_response():
+    """
+    Test that a serialized page of files is byte for byte the JSON of the
+    response model, as FastAPI would send it.
+    """
+    files = [{"name": "café ☕.txt", "path": "s3://your-bucket/café ☕.txt"},
+             {"name": 'quote " and \\ slash', "path": "s3://your-bucket/q"}]
+
+    content = storageSerializers.dump_list_files_response(files, "next-page")
+
+    expected = storageSchemas.ListFilesResponse(files=files, next_cursor="next-page")
+    assert content == expected.model_dump_json().encode()
+    assert storageSerializers.dump_list_files_response([]) == b'{"files":[],"next_cursor":null}'
+
+
+def test_get_objects_invalid_limit():
+    """
+    Test the GET /objects endpoint with a page size above the backend maximum.
+
+    This test verifies that the request is rejected before reaching the bucket.
+    """
+    response = client.get("/objects?limit=1001")
+
+    assert response.status_code == 422
 
 
 def test_get_objects_failure(override_storage_utils):
@@ -289,6 +778,40 @@ def test_delete_object_failure(override_storage_utils):
     }
 
 
+def test_delete_objects_success():
+    """
+    Test the DELETE /objects endpoint for a successful batch deletion.
+
+    This test simulates deleting several files at once and asserts that
+    the response counts the deleted and failed files.
+    """
+    results = [
+        {"name": "a.txt", "deleted": True, "error": None},
+        {"name": "b.txt", "deleted": False, "error": "AccessDenied: Access Denied"},
+    ]
+
+    with patch("storage.actions.delete_objects", return_value=results) as mock_delete:
+        response = client.request("DELETE", "/objects", json={"names": ["a.txt", "b.txt"]})
+
+    mock_delete.assert_called_once_with(names=["a.txt", "b.txt"], prefix=None)
+    assert response.status_code == 200
+    assert response.json() == {"deleted": 1, "failed": 1, "results": results}
+
+
+@pytest.mark.parametrize("body", [{}, {"names": ["a.txt"], "prefix": "tmp/"}, {"prefix": ""}])
+def test_delete_objects_invalid_request(body):
+    """
+    Test the DELETE /objects endpoint with an ambiguous or empty selection.
+
+    This test verifies that the request is rejected before reaching the bucket.
+    """
+    with patch("storage.actions.delete_objects") as mock_delete:
+        response = client.request("DELETE", "/objects", json=body)
+
+    mock_delete.assert_not_called()
+    assert response.status_code == 422
+
+
 def test_get_object_success(override_storage_utils):
     """
     Test the GET /objects/{file_name} endpoint for successful file download.
@@ -300,13 +823,18 @@ def test_get_object_success(override_storage_utils):
     file_content = b"Sample file content"
 
     _, _, _, mock_get = override_storage_utils
-    mock_get.return_value = file_content
+    mock_get.return_value = (
+        {"content_length": len(file_content), "content_type": "text/plain"},
+        iter([file_content[:6], file_content[6:]])
+    )
 
     response = client.get(f"/objects/{file_name}")
 
     assert response.status_code == 200
     assert response.headers["Content-Disposition"] == f'attachment; filename={
         file_name}'
+    assert response.headers["Content-Length"] == str(len(file_content))
+    assert response.headers["Content-Type"].startswith("text/plain")
     assert response.content == file_content
 
 
@@ -334,6 +862,109 @@ def test_get_object_not_found(override_storage_utils):
     }
 
 
+def test_get_object_single_range(override_storage_utils):
+    """
+    Test the GET /objects/{file_name} endpoint with a single byte range.
+
+    This test verifies that only the requested range is read from the bucket
+    and that a 206 response with the matching `Content-Range` is returned.
+    """
+    file_content = b"Sample file content"
+    _, _, _, mock_get = override_storage_utils
+
+    with patch("storage.actions.stat_object",
+               return_value={"content_length": len(file_content),
+                             "content_type": "text/plain"}), \
+            patch("storage.actions.stream_object_range",
+                  return_value=iter([file_content[7:11]])) as mock_range:
+        response = client.get("/objects/myfile.txt", headers={"Range": "bytes=7-10"})
+
+    mock_get.assert_not_called()
+    mock_range.assert_called_once_with(name="myfile.txt", start=7, end=10)
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == "bytes 7-10/19"
+    assert response.headers["Content-Length"] == "4"
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.content == b"file"
+
+
+def test_get_object_multiple_ranges():
+    """
+    Test the GET /objects/{file_name} endpoint with several byte ranges.
+
+    This test verifies that a `multipart/byteranges` body is returned with
+    one part per range.
+    """
+    file_content = b"Sample file content"
+
+    with patch("storage.actions.stat_object",
+               return_value={"content_length": len(file_content),
+                             "content_type": "text/plain"}), \
+            patch("storage.actions.stream_object_range",
+                  side_effect=lambda name, start, end: iter([file_content[start:end + 1]])):
+        response = client.get("/objects/myfile.txt", headers={"Range": "bytes=0-5,-7"})
+
+    assert response.status_code == 206
+    assert response.headers["Content-Type"].startswith("multipart/byteranges; boundary=")
+    assert response.headers["Content-Length"] == str(len(response.content))
+    assert b"Content-Range: bytes 0-5/19\r\n\r\nSample\r\n" in response.content
+    assert b"Content-Range: bytes 12-18/19\r\n\r\ncontent\r\n" in response.content
+
+
+def test_get_object_range_not_satisfiable():
+    """
+    Test the GET /objects/{file_name} endpoint with a range beyond the file.
+
+    This test verifies that a 416 response announcing the file size is returned.
+    """
+    with patch("storage.actions.stat_object",
+               return_value={"content_length": 19, "content_type": "text/plain"}):
+        response = client.get("/objects/myfile.txt", headers={"Range": "bytes=100-"})
+
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == "bytes */19"
+
+
+def test_get_object_local_file(monkeypatch, tmp_path):
+    """
+    Test the GET /objects/{file_name} endpoint with the local filesystem backend.
+
+    This test verifies that an uploaded file is served straight from disk.
+    """
+    monkeypatch.setenv("OBJECT_BUCKET_TYPE", "LOCAL")
+    monkeypatch.setenv("OBJECT_BUCKET", "test-bucket")
+    monkeypatch.setenv("OBJECT_LOCAL_ROOT", str(tmp_path))
+    actions.reset_backend()
+    try:
+        client.post("/objects", files={"file": ("notes.txt", b"Sample file content")})
+        response = client.get("/objects/notes.txt")
+    finally:
+        actions.reset_backend()
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain")
+    assert response.headers["Content-Length"] == "19"
+    assert response.content == b"Sample file content"
+    assert (tmp_path / "test-bucket" / "notes.txt").exists()
+
+
+def test_get_object_cached_file(override_storage_utils):
+    """
+    Test the GET /objects/{file_name} endpoint serves disk cache hits from the cache.
+    """
+    _, _, _, mock_get = override_storage_utils
+    info = {"content_length": 14, "content_type": "text/plain", "etag": "v1"}
+
+    with patch("storage.actions.get_cached_object",
+               return_value=(info, iter([b"Cached ", b"content"]))):
+        response = client.get("/objects/hot.txt")
+
+    assert response.status_code == 200
+    assert response.content == b"Cached content"
+    assert response.headers["Content-Length"] == "14"
+    mock_get.assert_not_called()
+
+
 def test_get_bucket_type_success():
     """
     Test the GET /bucket-type endpoint for successfully retrieving the bucket type.
@@ -362,3 +993,18 @@ def test_get_bucket_type_failure():
     assert response.json() == {
         "detail": "Error retrieving bucket type: Bucket type error"
     }
+
+
+def test_get_metrics():
+    """
+    Test the GET /metrics endpoint returns the storage cache counters.
+    """
+    stats = {"list_cache": {"hits": 3, "misses": 1, "hit_ratio": 0.75, "size": 1}}
+    with patch("storage.actions.get_cache_stats", return_value=stats):
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.json()["storage"] == stats
+    pool = response.json()["database"]["pool"]
+    assert pool["size"] == 10
+    assert {"checked_out", "overflow", "wait_time_total", "timeouts"} <= pool.keys()
@@ -0,0 +1,136 @@
+"""
+Unit tests for the response cache of the todo listings.
+"""
+import asyncio
+import fakeredis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from starlette.datastructures import QueryParams
+from database.page_cache import PageCache
+
+
+class FakeClock:
+    """
+    A manually advanced clock, to test expiry without sleeping.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_miss_then_hit():
+    """
+    Test that a stored page is served until it expires, and counted.
+    """
+    async def scenario():
+        clock = FakeClock()
+        cache = PageCache(ttl=5, clock=clock)
+
+        page, generation = await cache.get("limit=10")
+        assert page is None
+        await cache.set("limit=10", b"page", generation)
+
+        assert (await cache.get("limit=10"))[0] == b"page"
+        clock.now = 5
+        assert (await cache.get("limit=10"))[0] is None
+        return cache.stats()
+
+    assert asyncio.run(scenario()) == {"hits": 1, "shared_hits": 0, "misses": 2,
+                                       "hit_ratio": 1 / 3, "errors": 0, "size": 0}
+
+
+def test_invalidate_drops_every_page_and_in_flight_reads():
+    """
+    Test that a write invalidates every page, and that a page read before the
+    write is not stored.
+    """
+    async def scenario():
+        cache = PageCache(ttl=5)
+        for key in ("skip=0", "skip=10"):
+            await cache.set(key, b"page", (await cache.get(key))[1])
+        _, in_flight = await cache.get("skip=20")
+
+        await cache.invalidate()
+        await cache.set("skip=20", b"stale", in_flight)
+
+        return [(await cache.get(key))[0] for key in ("skip=0", "skip=10", "skip=20")]
+
+    assert asyncio.run(scenario()) == [None, None, None]
+
+
+def test_lru_eviction():
+    """
+    Test that the least recently used page is evicted first.
+    """
+    async def scenario():
+        cache = PageCache(ttl=5, max_entries=2)
+        for key in ("a", "b"):
+            await cache.set(key, key.encode(), (await cache.get(key))[1])
+        await cache.get("a")
+        await cache.set("c", b"c", (await cache.get("c"))[1])
+        return [(await cache.get(key))[0] for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [b"a", None, b"c"]
+
+
+def test_key_ignores_parameter_order():
+    """
+    Test that the same parameters in another order share a cache entry.
+    """
+    assert PageCache.key(QueryParams("limit=10&skip=20")) == \
+        PageCache.key(QueryParams("skip=20&limit=10"))
+    assert PageCache.key(QueryParams("skip=20")) != PageCache.key(QueryParams("skip=10"))
+
+
+def test_shared_cache_between_workers():
+    """
+    Test that two workers sharing a Redis server share their pages and their
+    invalidations, including the pages they keep in memory.
+    """
+    async def scenario():
+        server = fakeredis.FakeServer()
+        worker1 = PageCache(ttl=5, redis=fakeredis.FakeAsyncRedis(server=server))
+        worker2 = PageCache(ttl=5, redis=fakeredis.FakeAsyncRedis(server=server))
+
+        await worker1.set("limit=10", b"page", (await worker1.get("limit=10"))[1])
+        shared = (await worker2.get("limit=10"))[0]
+        local = (await worker2.get("limit=10"))[0]
+        await worker1.invalidate()
+        after_write = (await worker2.get("limit=10"))[0]
+        return shared, local, after_write, worker2.stats()
+
+    shared, local, after_write, stats = asyncio.run(scenario())
+
+    assert shared == local == b"page"
+    assert after_write is None
+    assert (stats["shared_hits"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_unreachable_shared_server_is_a_miss():
+    """
+    Test that a failing Redis server turns lookups into misses, without caching.
+    """
+    class BrokenRedis:  # pylint: disable=too-few-public-methods
+        """
+        A Redis client whose server is down.
+        """
+
+        async def get(self, _key):
+            raise RedisConnectionError("down")
+
+        set = incr = get
+
+    async def scenario():
+        cache = PageCache(ttl=5, redis=BrokenRedis())
+        page, generation = await cache.get("limit=10")
+        await cache.set("limit=10", b"page", generation)
+        await cache.invalidate()
+        return page, (await cache.get("limit=10"))[0], cache.stats()
+
+    page, again, stats = asyncio.run(scenario())
+
+    assert page is None and again is None
+    assert stats["errors"] == 3
+    assert stats["size"] == 0
@@ -0,0 +1,47 @@
+"""
+Unit tests for the engine settings and the timed connection pool.
+"""
+import pytest
+from sqlalchemy import exc
+from database.database import create_db_engine, get_engine_settings
+from database.pool import pool_stats
+
+
+def test_get_engine_settings(monkeypatch):
+    """
+    Test that the engine settings are read from the environment, with echo off by default.
+    """
+    monkeypatch.setenv("DB_POOL_SIZE", "4")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    settings = get_engine_settings()
+
+    assert settings["pool_size"] == 4
+    assert settings["max_overflow"] == 2
+    assert settings["pool_pre_ping"] is False
+    assert settings["echo"] is False
+    assert settings["pool_recycle"] == 1800
+
+
+def test_pool_stats(tmp_path):
+    """
+    Test that the pool reports its checked out connections, checkouts and timeouts.
+    """
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}", {
+        "pool_size": 1, "max_overflow": 0, "pool_timeout": 0.05,
+        "pool_recycle": -1, "pool_pre_ping": True, "echo": False})
+
+    with engine.connect():
+        stats = pool_stats(engine)
+        assert stats["checked_out"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 0
+    assert stats["checked_in"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["wait_time_total"] >= 0
+    engine.dispose()
@@ -0,0 +1,82 @@
+"""
+Unit tests for the HTTP byte range helpers.
+"""
+import pytest
+from storage.ranges import (RangeNotSatisfiable, content_range, multipart_byteranges,
+                            parse_range_header)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", [(0, 99)]),
+    ("bytes=100-", [(100, 999)]),
+    ("bytes=-10", [(990, 999)]),
+    ("bytes=-5000", [(0, 999)]),
+    ("bytes=900-5000", [(900, 999)]),
+    ("bytes=0-9, 20-29", [(0, 9), (20, 29)]),
+    ("bytes=20-29,0-9", [(0, 9), (20, 29)]),
+    ("bytes=0-9,5-19,20-29", [(0, 29)]),
+    ("bytes=0-9,5000-6000", [(0, 9)]),
+])
+def test_parse_range_header(header, expected):
+    """
+    Test parsing valid `Range` headers against a 1000 bytes object.
+
+    Asserts:
+        - Ranges are clamped to the object, and multiple ranges are coalesced.
+    """
+    assert parse_range_header(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", [
+    "items=0-9", "bytes=", "bytes=abc", "bytes=9-0", "bytes=-", "bytes=1-x",
+    "bytes=\u00b2-5", "bytes=0-\u00b9", "bytes=-\u0663", "bytes=+1-5",
+    "bytes=" + ",".join(["0-1"] * 100),
+])
+def test_parse_range_header_ignored(header):
+    """
+    Test that malformed or unsupported `Range` headers are ignored.
+
+    Asserts:
+        - None is returned so that the full object is served.
+    """
+    assert parse_range_header(header, 1000) is None
+
+
+@pytest.mark.parametrize("header, size", [
+    ("bytes=1000-", 1000), ("bytes=-0", 1000), ("bytes=0-9", 0),
+])
+def test_parse_range_header_not_satisfiable(header, size):
+    """
+    Test `Range` headers that do not overlap the object.
+
+    Asserts:
+        - RangeNotSatisfiable is raised.
+    """
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range_header(header, size)
+
+
+def test_multipart_byteranges():
+    """
+    Test building a `multipart/byteranges` body.
+
+    Asserts:
+        - Each part carries its `Content-Range` and content.
+        - The announced length matches the body length.
+    """
+    content = b"0123456789abcdefghij"
+
+    media_type, length, body = multipart_byteranges(
+        [(0, 3), (10, 12)], len(content), "text/plain",
+        lambda start, end: iter([content[start:end + 1]]))
+    payload = b"".join(body)
+    boundary = media_type.split("boundary=")[1]
+
+    assert media_type.startswith("multipart/byteranges; ")
+    assert length == len(payload)
+    assert payload == (
+        f"--{boundary}\r\nContent-Type: text/plain\r\n"
+        f"Content-Range: {content_range(0, 3, 20)}\r\n\r\n0123\r\n"
+        f"--{boundary}\r\nContent-Type: text/plain\r\n"
+        f"Content-Range: {content_range(10, 12, 20)}\r\n\r\nabc\r\n"
+        f"--{boundary}--\r\n").encode()
@@ -0,0 +1,187 @@
+# pylint: disable=redefined-outer-name
+"""
+Unit tests for the routing of queries between the primary and the read replicas.
+"""
+from unittest.mock import patch
+import pytest
+from sqlalchemy import create_engine, exc, insert
+from sqlalchemy.orm import sessionmaker
+from fastapi.testclient import TestClient
+import main
+from database import crud, database, models, schemas
+from database.database import Base, get_replica_urls
+from database.routing import PRIMARY_COOKIE, ReadYourWritesMiddleware, ReplicaSet, RoutingSession
+
+
+def make_database(path, labels):
+    """
+    Create a SQLite database holding one todo item per label.
+
+    Returns:
+        Engine: The engine of the database.
+    """
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(models.Todo), [
+            {"label": label, "quantity": 1} for label in labels])
+    return engine
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """
+    Fixture creating a primary and two replicas, told apart by their todo labels.
+
+    Yields:
+        Tuple[Engine, List[Engine]]: The primary and the replicas.
+    """
+    primary = make_database(tmp_path / "primary.db", ["primary"])
+    replicas = [make_database(tmp_path / f"replica{i}.db", [f"replica{i}"]) for i in (1, 2)]
+    yield primary, replicas
+    for engine in [primary, *replicas]:
+        engine.dispose()
+
+
+def labels(db):
+    """
+    Return the labels of the todo items read through `crud.get_todo_rows`.
+    """
+    _, rows = crud.get_todo_rows(db=db, include_total=False)
+    return [row.label for row in rows]
+
+
+def test_reads_round_robin_over_replicas(engines):
+    """
+    Test that transactions alternate between the replicas, each one reading
+    from a single replica, and that writes, including the refresh of
+    `create_todo`, go to the primary.
+    """
+    primary, replicas = engines
+    db = RoutingSession(bind=primary, replicas=ReplicaSet(replicas))
+
+    assert labels(db) == ["replica1"]
+    assert labels(db) == ["replica1"]
+    db.rollback()
+    assert labels(db) == ["replica2"]
+    db.close()
+    assert labels(db) == ["replica1"]
+
+    todo = crud.create_todo(db=db, todo=schemas.TodoCreate(label="new", quantity=2))
+    assert todo.label == "new"
+    assert crud.delete_todos(db=db, label="primary") == 1
+    db.close()
+
+    with sessionmaker(bind=primary)() as primary_db:
+        assert labels(primary_db) == ["new"]
+
+
+def test_read_your_writes_pins_session_to_primary(engines):
+    """
+    Test that with read-your-writes, a session reads from the primary after its first write.
+    """
+    primary, replicas = engines
+    db = RoutingSession(bind=primary, replicas=ReplicaSet(replicas), read_your_writes=True)
+
+    assert labels(db) == ["replica1"]
+    crud.create_todos(db=db, todos=[{"label": "new", "quantity": 2}])
+
+    assert labels(db) == ["primary", "new"]
+    db.close()
+
+
+def test_read_your_writes_across_requests(engines, monkeypatch):
+    """
+    Test that after a write request, the following requests of the client 
+    read from the primary until the replication lag budget ends, then from 
+    the (lagging) replica again, while other clients read from the replica.
+    """
+    primary, replicas = engines
+    now = [1000.0]
+    factory = sessionmaker(class_=RoutingSession, bind=primary,
+                           replicas=ReplicaSet(replicas[:1]))
+    monkeypatch.setattr(main, "get_session_factory", lambda: factory)
+    monkeypatch.delitem(main.app.dependency_overrides, main.get_db, raising=False)
+    app = ReadYourWritesMiddleware(main.app, lag_budget=5, clock=lambda: now[0])
+    client, other_client = TestClient(app), TestClient(app)
+    forged_client = TestClient(app, cookies={PRIMARY_COOKIE: "9999999999"})
+
+    with patch("database.versioning.get_version", return_value=1):
+        assert client.get("/todos/1").json()["label"] == "replica1"
+        created = client.post("/todos", json={"label": "new", "quantity": 2})
+        cookie = created.cookies[PRIMARY_COOKIE]
+        read = client.get("/todos/2")
+        other_read = other_client.get("/todos/2")
+        now[0] += 6
+        expired_read = client.get("/todos/2")
+        forged_read = forged_client.get("/todos/2")
+
+    assert float(cookie) == 1005
+    assert read.status_code == 200 and read.json()["label"] == "new"
+    assert other_read.status_code == 404
+    assert expired_read.status_code == 404
+    assert forged_read.status_code == 404
+
+
+def test_without_replicas_reads_go_to_primary(engines):
+    """
+    Test that a session without replicas behaves like a regular session.
+    """
+    primary, _ = engines
+    db = RoutingSession(bind=primary, replicas=ReplicaSet([]))
+
+    assert labels(db) == ["primary"]
+    db.close()
+
+
+def test_failing_replica_is_ejected(engines, tmp_path):
+    """
+    Test that a replica that cannot be reached is skipped once it failed, until
+    its ejection expires.
+    """
+    primary, replicas = engines
+    now = [0.0]
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replica_set = ReplicaSet([broken, replicas[0]], eject_seconds=30, clock=lambda: now[0])
+    db = RoutingSession(bind=primary, replicas=replica_set)
+
+    with pytest.raises(exc.OperationalError):
+        labels(db)
+    db.rollback()
+    assert [replica["ejected"] for replica in replica_set.stats()] == [True, False]
+
+    assert labels(db) == ["replica1"]
+    assert labels(db) == ["replica1"]
+
+    now[0] = 31
+    assert replica_set.choose() is broken
+    db.close()
+
+
+def test_all_replicas_ejected_falls_back_to_primary(engines):
+    """
+    Test that reads go to the primary when every replica is ejected.
+    """
+    primary, replicas = engines
+    replica_set = ReplicaSet(replicas)
+    for replica in replicas:
+        replica_set.eject(replica)
+    db = RoutingSession(bind=primary, replicas=replica_set)
+
+    assert replica_set.choose() is None
+    assert labels(db) == ["primary"]
+    db.close()
+
+
+def test_get_replica_urls(monkeypatch):
+    """
+    Test that replica URLs reuse the primary credentials, database and port.
+    """
+    monkeypatch.setattr(database, "MYSQL_REPLICA_HOSTS", "replica1, replica2:3307,")
+    monkeypatch.setattr(database, "MYSQL_PORT", "3306")
+
+    urls = get_replica_urls("aiomysql")
+
+    assert [url.split("@")[1] for url in urls] == [
+        f"replica1:3306/{database.MYSQL_DB}", f"replica2:3307/{database.MYSQL_DB}"]
+    assert all(url.startswith("mysql+aiomysql://") for url in urls)
@@ -2,10 +2,13 @@
 """
 Unit tests for the S3 actions.
 """
+import io
 import pytest
 import boto3
 from moto import mock_aws
-from storage.actions import list_objects, put_object, delete_object, get_object
+from storage.actions import (reset_backend, list_objects, put_object, upload_object,
+                             delete_object, delete_objects, get_object, stream_object, stream_object_range,
+                             stat_object, get_cache_stats, get_cached_object, S3_MIN_PART_SIZE)
 
 BUCKET_NAME = 'test-bucket'
 
@@ -38,6 +41,7 @@ def s3_client(monkeypatch):
         monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
         monkeypatch.setenv('OBJECT_BUCKET', BUCKET_NAME)
         monkeypatch.setenv('OBJECT_BUCKET_TYPE', "S3")
+        reset_backend()
         s3 = boto3.resource('s3')
         s3.create_bucket(Bucket=BUCKET_NAME)
         yield s3
@@ -59,7 +63,7 @@ def test_list_objects_with_data(s3_client):
     s3_client.Bucket(BUCKET_NAME).put_object(
         Key="testfile2.txt", Body=b"Test file 2 content")
 
-    objects = list_objects()
+    objects, next_cursor = list_objects()
 
     expected_objects = [
         {"name": "testfile1.txt", "path": "s3://test-bucket/testfile1.txt"},
@@ -67,6 +71,7 @@ def test_list_objects_with_data(s3_client):
     ]
 
     assert objects == expected_objects
+    assert next_cursor is None
 
 
 def test_list_objects_with_no_data():
@@ -76,8 +81,33 @@ def test_list_objects_with_no_data():
     This test verifies that the list_objects function returns an empty list 
     when there are no objects in the mocked S3 bucket.
     """
-    objects = list_objects()
+    objects, next_cursor = list_objects()
     assert objects == []
+    assert next_cursor is None
+
+
+def test_list_objects_paginated(s3_client):
+    """
+    Test listing the S3 bucket page by page, filtered by prefix.
+
+    Args:
+        s3_client (boto3.resource): The mocked S3 resource provided by the 
+        s3_client fixture.
+
+    Asserts:
+        - Each page holds at most `limit` objects matching the prefix.
+        - Following the cursor lists every object exactly once.
+    """
+    for name in ["logs/a.txt", "logs/b.txt", "logs/c.txt", "other.txt"]:
+        s3_client.Bucket(BUCKET_NAME).put_object(Key=name, Body=b"content")
+
+    first_page, cursor = list_objects(prefix="logs/", limit=2)
+    second_page, last_cursor = list_objects(prefix="logs/", limit=2, cursor=cursor)
+
+    assert [obj["name"] for obj in first_page] == ["logs/a.txt", "logs/b.txt"]
+    assert cursor is not None
+    assert [obj["name"] for obj in second_page] == ["logs/c.txt"]
+    assert last_cursor is None
 
 
 def test_put_object():
@@ -98,7 +128,7 @@ def test_put_object():
 
     s3_path = put_object(object_name, content)
 
-    uploaded_objects = list_objects()
+    uploaded_objects, _ = list_objects()
     assert len(uploaded_objects) == 1
     assert uploaded_objects[0]["name"] == object_name
     assert uploaded_objects[0]["path"] == s3_path
@@ -126,7 +156,7 @@ def test_delete_object(s3_client):
 
     s3_path = delete_object("testfile.txt")
 
-    uploaded_objects = list_objects()
+    uploaded_objects, _ = list_objects()
     assert len(uploaded_objects) == 0
     assert s3_path == "s3://test-bucket/testfile.txt"
 
@@ -152,3 +182,238 @@ def test_get_object(s3_client):
     downloaded_content = get_object("testfile.txt")
 
     assert downloaded_content == b"Test file 1 content"
+
+
+def test_upload_object_small_file():
+    """
+    Test streaming an object smaller than one part into the S3 bucket.
+
+    Asserts:
+        - The object is stored with a single request and its content is intact.
+    """
+    content = b"Hello, this is a small streamed file."
+
+    s3_path = upload_object("small.txt", io.BytesIO(content))
+
+    assert s3_path == "s3://test-bucket/small.txt"
+    assert get_object("small.txt") == content
+
+
+def test_upload_object_multipart(s3_client):
+    """
+    Test streaming an object larger than one part into the S3 bucket.
+
+    The content spans three parts uploaded by two threads.
+
+    Args:
+        s3_client (boto3.resource): The mocked S3 resource provided by the 
+        s3_client fixture.
+
+    Asserts:
+        - The object content is reassembled in the right order.
+        - No multipart upload is left open.
+    """
+    content = bytes(range(256)) * (S3_MIN_PART_SIZE * 2 // 256 + 1000)
+
+    s3_path = upload_object("big.bin", io.BytesIO(content),
+                            part_size=S3_MIN_PART_SIZE, concurrency=2)
+
+    assert s3_path == "s3://test-bucket/big.bin"
+    assert get_object("big.bin") == content
+    uploads = s3_client.meta.client.list_multipart_uploads(Bucket=BUCKET_NAME)
+    assert "Uploads" not in uploads
+
+
+def test_upload_object_multipart_aborted_on_failure(s3_client):
+    """
+    Test that a failing multipart upload is aborted.
+
+    The file-like object raises an error after the first part has been read.
+
+    Args:
+        s3_client (boto3.resource): The mocked S3 resource provided by the 
+        s3_client fixture.
+
+    Asserts:
+        - The error is propagated.
+        - No multipart upload nor object is left in the bucket.
+    """
+    class FailingReader(io.BytesIO):
+        """A reader that fails once its first part has been consumed."""
+
+        def read(self, size=-1):
+            if self.tell() >= S3_MIN_PART_SIZE:
+                raise IOError("connection reset")
+            return super().read(size)
+
+    content = b"x" * (S3_MIN_PART_SIZE * 2)
+
+    with pytest.raises(IOError):
+        upload_object("broken.bin", FailingReader(content),
+                      part_size=S3_MIN_PART_SIZE, concurrency=2)
+
+    uploads = s3_client.meta.client.list_multipart_uploads(Bucket=BUCKET_NAME)
+    assert "Uploads" not in uploads
+    assert list_objects() == ([], None)
+
+
+def test_upload_object_content_type():
+    """
+    Test that the content type given to a streaming upload is stored with the object.
+
+    Asserts:
+        - The content type is returned with the object metadata.
+    """
+    upload_object("page.html", io.BytesIO(b"<p>Hello</p>"), content_type="text/html")
+
+    info, _ = stream_object("page.html")
+
+    assert info["content_type"] == "text/html"
+
+
+def test_stream_object(s3_client):
+    """
+    Test streaming an object from the S3 bucket chunk by chunk.
+
+    Args:
+        s3_client (boto3.resource): The mocked S3 resource provided by the 
+        s3_client fixture.
+
+    Asserts:
+        - The metadata matches the stored object.
+        - The content is returned in chunks of the requested size.
+    """
+    s3_client.Bucket(BUCKET_NAME).put_object(
+        Key="testfile.txt", Body=b"Test file 1 content", ContentType="text/plain")
+
+    info, chunks = stream_object("testfile.txt", chunk_size=8)
+
+    assert info == {"content_length": 19, "content_type": "text/plain",
+                    "etag": '"d0abcb7f43806dd60aabfde7a5242ad9"'}
+    assert list(chunks) == [b"Test fil", b"e 1 cont", b"ent"]
+
+
+def test_stream_object_range(s3_client):
+    """
+    Test streaming a byte range of an object from the S3 bucket.
+
+    Args:
+        s3_client (boto3.resource): The mocked S3 resource provided by the 
+        s3_client fixture.
+
+    Asserts:
+        - The object size is returned without downloading the content.
+        - Only the requested bytes are returned.
+    """
+    s3_client.Bucket(BUCKET_NAME).put_object(
+        Key="testfile.txt", Body=b"Test file 1 content")
+
+    info = stat_object("testfile.txt")
+    chunks = stream_object_range("testfile.txt", 5, 10, chunk_size=4)
+
+    assert info["content_length"] == 19
+    assert list(chunks) == [b"file", b" 1"]
+
+
+def test_delete_objects_by_name(s3_client, monkeypatch):
+    """
+    Test deleting several objects from the S3 bucket in bulk.
+
+    The batch size is lowered to 2 keys to exercise several `delete_objects` calls.
+
+    Args:
+        s3_client (boto3.resource): The mocked S3 resource provided by the 
+        s3_client fixture.
+
+    Asserts:
+        - Every key gets a result, in order, and the objects are gone.
+    """
+    monkeypatch.setattr("storage.backends.s3.S3_MAX_DELETE_KEYS", 2)
+    names = ["a.txt", "b.txt", "c.txt"]
+    for name in names + ["kept.txt"]:
+        s3_client.Bucket(BUCKET_NAME).put_object(Key=name, Body=b"content")
+
+    results = delete_objects(names=names)
+
+    assert results == [{"name": name, "deleted": True, "error": None} for name in names]
+    assert [obj["name"] for obj in list_objects()[0]] == ["kept.txt"]
+
+
+def test_delete_objects_by_prefix(s3_client):
+    """
+    Test deleting every object under a prefix from the S3 bucket.
+
+    Args:
+        s3_client (boto3.resource): The mocked S3 resource provided by the 
+        s3_client fixture.
+
+    Asserts:
+        - Only the objects under the prefix are deleted.
+    """
+    for name in ["tmp/a.txt", "tmp/b.txt", "keep/c.txt"]:
+        s3_client.Bucket(BUCKET_NAME).put_object(Key=name, Body=b"content")
+
+    results = delete_objects(prefix="tmp/")
+
+    assert [result["name"] for result in results] == ["tmp/a.txt", "tmp/b.txt"]
+    assert all(result["deleted"] for result in results)
+    assert [obj["name"] for obj in list_objects()[0]] == ["keep/c.txt"]
+
+
+def test_list_objects_cached(s3_client):
+    """
+    Test that repeated listings are served from the cache, and that writes 
+    made through the actions are visible immediately.
+    """
+    s3_client.Object(BUCKET_NAME, 'a.txt').put(Body=b'a')
+    assert [file['name'] for file in list_objects()[0]] == ['a.txt']
+
+    s3_client.Object(BUCKET_NAME, 'b.txt').put(Body=b'b')
+    assert [file['name'] for file in list_objects()[0]] == ['a.txt']
+    assert get_cache_stats()['list_cache']['hits'] == 1
+
+    put_object('c.txt', b'c')
+    assert [file['name'] for file in list_objects()[0]] == ['a.txt', 'b.txt', 'c.txt']
+
+    delete_objects(prefix='b')
+    assert [file['name'] for file in list_objects()[0]] == ['a.txt', 'c.txt']
+
+
+def test_list_objects_cache_disabled(s3_client, monkeypatch):
+    """
+    Test that a zero TTL disables the listing cache.
+    """
+    monkeypatch.setenv('OBJECT_LIST_CACHE_TTL', '0')
+    reset_backend()
+    assert list_objects()[0] == []
+
+    s3_client.Object(BUCKET_NAME, 'a.txt').put(Body=b'a')
+    assert [file['name'] for file in list_objects()[0]] == ['a.txt']
+
+
+def test_object_disk_cache(s3_client, monkeypatch, tmp_path):
+    """
+    Test that downloads fill the disk cache, that hits are revalidated against 
+    the ETag, and that writes made through the actions invalidate them.
+    """
+    monkeypatch.setenv('OBJECT_CACHE_DIR', str(tmp_path))
+    reset_backend()
+    s3_client.Object(BUCKET_NAME, 'hot.txt').put(Body=b'version 1')
+
+    assert get_cached_object('hot.txt') is None
+    assert get_object('hot.txt') == b'version 1'
+    info, chunks = get_cached_object('hot.txt')
+    assert info['content_length'] == 9
+    assert b''.join(chunks) == b'version 1'
+
+    s3_client.Object(BUCKET_NAME, 'hot.txt').put(Body=b'version 2')
+    assert get_cached_object('hot.txt') is None
+    assert get_object('hot.txt') == b'version 2'
+    assert get_object('hot.txt') == b'version 2'
+
+    put_object('hot.txt', b'version 3')
+    assert get_cached_object('hot.txt') is None
+    assert get_cache_stats()['object_cache']['hits'] == 2
+
+    reset_backend()
+    assert not list(tmp_path.iterdir())
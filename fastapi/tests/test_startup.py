@@ -0,0 +1,58 @@
+"""
+Tests of the cold start of the API process, each in a new interpreter (the
+modules imported by the other tests would hide what the application loads).
+"""
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_MODULES = ["boto3", "botocore", "google.cloud.storage"]
+
+STARTUP_SCRIPT = """
+import json, sys
+from fastapi.testclient import TestClient
+import main
+from database import database
+imported = {"import": [name for name in %(modules)r if name in sys.modules],
+            "engine": database._engine is not None}
+with TestClient(main.app) as client:
+    assert client.get("/").status_code == 200
+imported["startup"] = [name for name in %(modules)r if name in sys.modules]
+print(json.dumps(imported))
+""" % {"modules": BACKEND_MODULES}
+
+
+def start_app(tmp_path, bucket_type):
+    """
+    Import and start the application in a new interpreter.
+
+    Returns:
+        dict: The backend modules loaded by the import ("import") and by the
+        startup ("startup"), and whether the import built the engine ("engine").
+    """
+    (tmp_path / "bucket").mkdir()
+    env = {**os.environ, "TESTING": "true", "OBJECT_BUCKET_TYPE": bucket_type,
+           "OBJECT_BUCKET": "bucket", "OBJECT_LOCAL_ROOT": str(tmp_path),
+           "AWS_DEFAULT_REGION": "us-east-1", "AWS_ACCESS_KEY_ID": "testing",
+           "AWS_SECRET_ACCESS_KEY": "testing"}
+    result = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=APP_DIR, env=env,
+                            capture_output=True, text=True, check=True, timeout=120)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize("bucket_type,started", [
+    ("LOCAL", []),
+    ("S3", ["boto3", "botocore"]),
+])
+def test_startup_imports_selected_backend_only(tmp_path, bucket_type, started):
+    """
+    Test that importing the application loads no storage client library and
+    builds no database engine, and that the startup only loads the client
+    library of the selected backend.
+    """
+    imported = start_app(tmp_path, bucket_type)
+
+    assert imported == {"import": [], "engine": False, "startup": started}
@@ -0,0 +1,98 @@
+# pylint: disable=redefined-outer-name
+"""
+Unit tests for the asyncio storage API.
+"""
+import asyncio
+import threading
+from unittest.mock import patch
+import pytest
+from storage import aio
+
+
+@pytest.fixture(autouse=True)
+def executor(monkeypatch):
+    """
+    Fixture that gives each test a fresh storage thread pool of 2 threads.
+
+    Yields:
+        ThreadPoolExecutor: The storage thread pool.
+    """
+    monkeypatch.setenv("OBJECT_IO_THREADS", "2")
+    aio.shutdown()
+    yield aio.get_executor()
+    aio.shutdown()
+
+
+def test_run_on_storage_pool(executor):
+    """
+    Test that blocking calls run on the dedicated storage thread pool.
+
+    Asserts:
+        - The call runs on a "storage-io" thread, not the event loop thread.
+        - The pool size comes from "OBJECT_IO_THREADS".
+    """
+    thread_name = asyncio.run(aio.run(lambda: threading.current_thread().name))
+
+    assert thread_name.startswith("storage-io")
+    assert executor._max_workers == 2  # pylint: disable=protected-access
+
+
+def test_stream_object_does_not_block_event_loop():
+    """
+    Test that a slow download does not stall other coroutines.
+
+    Asserts:
+        - A coroutine keeps running while the chunks are read, and the
+          content is yielded in order.
+    """
+    release = threading.Event()
+
+    def slow_chunks():
+        release.wait(timeout=5)
+        yield b"first"
+        yield b"second"
+
+    async def scenario():
+        with patch("storage.actions.stream_object",
+                   return_value=({"content_length": 11}, slow_chunks())):
+            _, chunks = await aio.stream_object(name="myfile.txt")
+            download = asyncio.create_task(_collect(chunks))
+            await asyncio.sleep(0.01)
+            assert not download.done()
+            release.set()
+            return await download
+
+    assert asyncio.run(scenario()) == [b"first", b"second"]
+
+
+def test_iterate_closes_iterator_on_early_exit():
+    """
+    Test that the blocking iterator is closed when the consumer stops early.
+
+    Asserts:
+        - The generator `finally` block runs (e.g. releasing the connection).
+    """
+    closed = threading.Event()
+
+    def chunks():
+        try:
+            yield b"first"
+            yield b"second"
+        finally:
+            closed.set()
+
+    async def scenario():
+        iterator = aio.iterate(chunks())
+        first = await anext(iterator)
+        await iterator.aclose()
+        return first
+
+    assert asyncio.run(scenario()) == b"first"
+    assert closed.is_set()
+
+
+async def _collect(chunks):
+    """
+    Collect the chunks of an async iterator in a list.
+    """
+    return [chunk async for chunk in chunks]
@@ -0,0 +1,218 @@
+"""
+Unit tests for the listing and disk caches.
+"""
+import os
+import pytest
+from storage.cache import DiskCache, ListingCache
+
+
+class FakeClock:
+    """
+    A manually advanced clock, to test expiry without sleeping.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_miss_then_hit():
+    """
+    Test that a stored page is served until it expires, and counted.
+    """
+    clock = FakeClock()
+    cache = ListingCache(ttl=5, clock=clock)
+    key = ("bucket", "", 1000, None)
+
+    page, generation = cache.get(key)
+    assert page is None
+    cache.set(key, (["a"], None), generation)
+
+    assert cache.get(key)[0] == (["a"], None)
+    clock.now = 5
+    assert cache.get(key)[0] is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "hit_ratio": 1 / 3, "size": 0}
+
+
+def test_invalidate_by_name():
+    """
+    Test that a write drops the pages whose prefix matches the key, only in its bucket.
+    """
+    cache = ListingCache(ttl=5)
+    keys = [("bucket", "", 10, None), ("bucket", "logs/", 10, "cursor"),
+            ("bucket", "images/", 10, None), ("other", "", 10, None)]
+    for key in keys:
+        cache.set(key, ([], None), cache.get(key)[1])
+
+    cache.invalidate("bucket", name="logs/today.txt")
+
+    assert [cache.get(key)[0] is not None for key in keys] == [False, False, True, True]
+
+
+def test_invalidate_by_prefix():
+    """
+    Test that a bulk deletion drops the pages overlapping its prefix.
+    """
+    cache = ListingCache(ttl=5)
+    keys = [("bucket", "", 10, None), ("bucket", "logs/2024/", 10, None),
+            ("bucket", "images/", 10, None)]
+    for key in keys:
+        cache.set(key, ([], None), cache.get(key)[1])
+
+    cache.invalidate("bucket", prefix="logs/")
+
+    assert [cache.get(key)[0] is not None for key in keys] == [False, False, True]
+
+
+def test_set_after_invalidation_is_dropped():
+    """
+    Test that a page fetched before a concurrent write is not stored.
+    """
+    cache = ListingCache(ttl=5)
+    key = ("bucket", "", 10, None)
+
+    _, generation = cache.get(key)
+    cache.invalidate("bucket", name="new.txt")
+    cache.set(key, (["stale"], None), generation)
+
+    assert cache.get(key)[0] is None
+
+
+def test_max_entries_evicts_oldest():
+    """
+    Test that the cache holds at most `max_entries` pages.
+    """
+    cache = ListingCache(ttl=5, max_entries=2)
+    for cursor in ("a", "b", "c"):
+        key = ("bucket", "", 10, cursor)
+        cache.set(key, ([], None), cache.get(key)[1])
+
+    assert cache.stats()["size"] == 2
+    assert cache.get(("bucket", "", 10, "a"))[0] is None
+
+
+def fill(cache, name, content, etag="v1"):
+    """
+    Download `content` through the disk cache, as `actions.stream_object` does.
+    """
+    info = {"content_length": len(content), "content_type": "text/plain", "etag": etag}
+    return b"".join(cache.fill(name, info, iter([content[:2], content[2:]])))
+
+
+def test_disk_cache_fill_and_lookup(tmp_path):
+    """
+    Test that a fully read download is cached and served after an ETag check.
+    """
+    cache = DiskCache(str(tmp_path), max_bytes=100)
+
+    assert cache.lookup("a.txt", stat=None) is None
+    assert fill(cache, "a.txt", b"hello") == b"hello"
+
+    info, file = cache.lookup("a.txt", stat=lambda name: {"etag": "v1"})
+    assert info["etag"] == "v1"
+    with file:
+        assert file.read() == b"hello"
+    file_path = file.name
+
+    assert cache.lookup("a.txt", stat=lambda name: {"etag": "v2"}) is None
+    assert not os.path.exists(file_path)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_disk_cache_revalidate_after(tmp_path):
+    """
+    Test that recently validated entries are served without calling `stat`.
+    """
+    clock = FakeClock()
+    cache = DiskCache(str(tmp_path), max_bytes=100, revalidate_after=10, clock=clock)
+    fill(cache, "a.txt", b"hello")
+
+    def stat(name):
+        raise AssertionError(f"{name} should not be revalidated")
+
+    cache.lookup("a.txt", stat=stat)[1].close()
+    clock.now = 10
+    with pytest.raises(AssertionError):
+        cache.lookup("a.txt", stat=stat)
+    assert cache.stats()["size"] == 0
+
+
+def test_disk_cache_lru_eviction(tmp_path):
+    """
+    Test that the least recently used entries are evicted to stay within the budget.
+    """
+    cache = DiskCache(str(tmp_path), max_bytes=10)
+    fill(cache, "a.txt", b"aaaa")
+    fill(cache, "b.txt", b"bbbb")
+    cache.lookup("a.txt", stat=lambda name: {"etag": "v1"})[1].close()
+    fill(cache, "c.txt", b"cccc")
+
+    assert cache.lookup("b.txt", stat=None) is None
+    cache.lookup("a.txt", stat=lambda name: {"etag": "v1"})[1].close()
+    stats = cache.stats()
+    assert stats["bytes"] == 8 and stats["evictions"] == 1
+
+
+def test_disk_cache_hit_survives_eviction(tmp_path):
+    """
+    Test that a hit stays readable when its entry is evicted or invalidated
+    before it is read.
+    """
+    cache = DiskCache(str(tmp_path), max_bytes=8)
+    fill(cache, "a.txt", b"aaaa")
+    _, evicted = cache.lookup("a.txt", stat=lambda name: {"etag": "v1"})
+    fill(cache, "b.txt", b"bbbb")
+    _, invalidated = cache.lookup("b.txt", stat=lambda name: {"etag": "v1"})
+    fill(cache, "c.txt", b"cccccccc")
+    cache.invalidate(name="b.txt")
+
+    assert not os.path.exists(evicted.name) and not os.path.exists(invalidated.name)
+    with evicted, invalidated:
+        assert (evicted.read(), invalidated.read()) == (b"aaaa", b"bbbb")
+
+
+def test_disk_cache_skips_partial_and_oversized(tmp_path):
+    """
+    Test that aborted downloads and objects over the budget are not cached.
+    """
+    cache = DiskCache(str(tmp_path), max_bytes=4)
+    fill(cache, "big.txt", b"too large")
+
+    info = {"content_length": 4, "content_type": "text/plain", "etag": "v1"}
+    chunks = cache.fill("partial.txt", info, iter([b"ab", b"cd"]))
+    next(chunks)
+    chunks.close()
+
+    assert cache.stats()["size"] == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_disk_cache_invalidate_during_fill(tmp_path):
+    """
+    Test that a write made while the object is downloaded discards the copy.
+    """
+    cache = DiskCache(str(tmp_path), max_bytes=100)
+    info = {"content_length": 4, "content_type": "text/plain", "etag": "v1"}
+    chunks = cache.fill("a.txt", info, iter([b"ab", b"cd"]))
+    next(chunks)
+    cache.invalidate(name="a.txt")
+    list(chunks)
+
+    assert cache.lookup("a.txt", stat=None) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_disk_cache_invalidate_prefix(tmp_path):
+    """
+    Test that a bulk deletion drops every entry under its prefix.
+    """
+    cache = DiskCache(str(tmp_path), max_bytes=100)
+    for name in ("logs/a", "logs/b", "data/c"):
+        fill(cache, name, b"data")
+
+    cache.invalidate(prefix="logs/")
+
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["bytes"] == 4